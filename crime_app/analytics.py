@@ -0,0 +1,98 @@
+import time
+
+import numpy as np
+
+from .snapshot import INCIDENT_TYPE_CODES, PRIORITY_CODES, STATUS_CODES, load_snapshot, read_manifest
+
+DAY = 86400
+CATEGORY_CODES = {
+    'status': STATUS_CODES,
+    'priority': PRIORITY_CODES,
+    'incident_type': INCIDENT_TYPE_CODES,
+}
+RESOLVED = STATUS_CODES.index('Resolved')
+
+
+def _window(snapshot, since=None, until=None):
+    """Boolean mask of rows reported in [since, until) (epoch seconds)"""
+    mask = np.ones(len(snapshot['id']), dtype=bool)
+    if since is not None:
+        mask &= snapshot['reported_at'] >= since
+    if until is not None:
+        mask &= snapshot['reported_at'] < until
+    return mask
+
+
+def counts_by(snapshot, column, since=None, until=None):
+    """Report counts per status, priority, incident_type or department_id"""
+    values = snapshot[column][_window(snapshot, since, until)]
+    if column in CATEGORY_CODES:
+        codes = CATEGORY_CODES[column]
+        totals = np.bincount(values[values >= 0], minlength=len(codes))
+        return {code: int(total) for code, total in zip(codes, totals)}
+    keys, totals = np.unique(values, return_counts=True)
+    return {int(key): int(total) for key, total in zip(keys, totals)}
+
+
+def resolution_times(snapshot, since=None, until=None, bins=(1, 6, 24, 72, 168, 720)):
+    """
+    Distribution of hours from report to resolution for resolved reports.
+    Resolution time is the report's last update, when it was marked Resolved.
+    """
+    mask = _window(snapshot, since, until) & (snapshot['status'] == RESOLVED)
+    hours = (snapshot['updated_at'][mask] - snapshot['reported_at'][mask]) / 3600.0
+    if not hours.size:
+        return {'count': 0}
+    edges = np.concatenate(([0], bins, [np.inf]))
+    histogram, _ = np.histogram(hours, bins=edges)
+    p50, p90, p99 = np.percentile(hours, [50, 90, 99])
+    return {
+        'count': int(hours.size),
+        'mean_hours': float(hours.mean()),
+        'p50_hours': float(p50),
+        'p90_hours': float(p90),
+        'p99_hours': float(p99),
+        'histogram': [
+            {'up_to_hours': None if np.isinf(upper) else float(upper), 'count': int(count)}
+            for upper, count in zip(edges[1:], histogram)
+        ],
+    }
+
+
+def department_trends(snapshot, days=30, now=None):
+    """
+    Daily report counts per department over the last `days` days, as
+    {'days': [epoch day starts...], 'departments': {id: [counts...]}}.
+    Department 0 collects unassigned reports.
+    """
+    now = int(now if now is not None else time.time())
+    end = (now // DAY + 1) * DAY
+    start = end - days * DAY
+    mask = _window(snapshot, start, end)
+    day_index = (snapshot['reported_at'][mask] - start) // DAY
+    departments, department_index = np.unique(snapshot['department_id'][mask], return_inverse=True)
+    # One bincount over (department, day) pairs builds the whole matrix
+    matrix = np.bincount(
+        department_index * days + day_index, minlength=len(departments) * days
+    ).reshape(len(departments), days)
+    return {
+        'days': list(range(start, end, DAY)),
+        'departments': {int(d): row.tolist() for d, row in zip(departments, matrix)},
+    }
+
+
+def summary(days=30):
+    """Everything the analytics dashboard shows, computed from the snapshot alone"""
+    snapshot = load_snapshot()
+    if snapshot is None:
+        return None
+    return {
+        'built_at': read_manifest()['built_at'],
+        'reports': int(len(snapshot['id'])),
+        'by_status': counts_by(snapshot, 'status'),
+        'by_priority': counts_by(snapshot, 'priority'),
+        'by_incident_type': counts_by(snapshot, 'incident_type'),
+        'by_department': counts_by(snapshot, 'department_id'),
+        'resolution_times': resolution_times(snapshot),
+        'department_trends': department_trends(snapshot, days=days),
+    }
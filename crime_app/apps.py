@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CrimeAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'crime_app'
+
+    def ready(self):
+        # Register signal handlers that keep derived data in sync
+        from . import blobs, counters, dedup, heatmap, history, search, thumbnails  # noqa: F401
@@ -0,0 +1,135 @@
+import heapq
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Exists, F, OuterRef, Q, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .blobs import EVIDENCE_FIELDS, reference_evidence
+from .inbox import citizen_recent_key, unread_q
+from .models import (
+    ArchivedCitizenNotification,
+    ArchivedCrimeReport,
+    ArchivedReportReminder,
+    CitizenNotification,
+    CrimeReport,
+    ReportReminder,
+    ReportSignatureBand,
+    User,
+)
+
+CLOSED_STATUSES = ('Resolved', 'Dismissed')
+# Closed reports nobody has touched for this many days move to the archive
+ARCHIVE_AFTER_DAYS = getattr(settings, 'ARCHIVE_AFTER_DAYS', 180)
+BATCH_SIZE = 500
+
+# Both tables share these columns, so rows copy across as value dicts
+REPORT_COLUMNS = [f.attname for f in ArchivedCrimeReport._meta.concrete_fields if f.name != 'archived_at']
+NOTIFICATION_COLUMNS = [f.attname for f in ArchivedCitizenNotification._meta.concrete_fields]
+REMINDER_COLUMNS = [f.attname for f in ArchivedReportReminder._meta.concrete_fields]
+
+
+# ===================== Moving =====================
+def archivable(days=ARCHIVE_AFTER_DAYS):
+    """
+    Reports that can be archived: closed, unchanged for `days`, not a
+    duplicate themselves, and with every duplicate filed against them just
+    as closed. A duplicate cluster moves as one (see archive_batch), so
+    duplicate_of never points from one table into the other.
+    """
+    closed = Q(status__in=CLOSED_STATUSES, date_updated__lt=timezone.now() - timedelta(days=days))
+    open_duplicates = CrimeReport.objects.filter(duplicate_of=OuterRef('pk')).exclude(closed)
+    return CrimeReport.objects.filter(closed, duplicate_of__isnull=True).exclude(Exists(open_duplicates))
+
+
+def _unread_by_user(notifications):
+    """How many of these citizen notifications each user still counts as unread"""
+    unread = unread_q(F('user__notification_watermark__citizen_read_at')) | Q(
+        is_read=False, user__notification_watermark__citizen_read_at__isnull=True
+    )
+    return dict(
+        notifications.filter(unread).values_list('user_id').annotate(count=Count('pk')).order_by()
+    )
+
+
+@transaction.atomic
+def archive_batch(ids):
+    """
+    Moves the given reports and their duplicates, with the citizen
+    notifications and reminders about them, into the archive tables in one
+    transaction. Status history stays where it is. Duplicate-detection
+    bands are deleted, not moved: candidate_reports only searches
+    CrimeReport, so an archived report is never matched again. Returns
+    (reports, notifications) moved.
+    """
+    ids = set(ids)
+    ids.update(CrimeReport.objects.filter(duplicate_of_id__in=ids).values_list('pk', flat=True))
+    rows = list(CrimeReport.objects.filter(pk__in=ids).values(*REPORT_COLUMNS))
+    if not rows:
+        return 0, 0
+    ArchivedCrimeReport.objects.bulk_create([ArchivedCrimeReport(**row) for row in rows])
+    # Deleting the reports releases their evidence, which the archive rows now hold
+    reference_evidence([[row[field] or '' for field in EVIDENCE_FIELDS] for row in rows])
+
+    notifications = CitizenNotification.objects.filter(related_report_id__in=ids)
+    for user_id, count in _unread_by_user(notifications).items():
+        User.objects.filter(pk=user_id).update(
+            unread_notifications=Greatest(F('unread_notifications') - count, Value(0))
+        )
+    moved = list(notifications.values(*NOTIFICATION_COLUMNS))
+    ArchivedCitizenNotification.objects.bulk_create([ArchivedCitizenNotification(**row) for row in moved])
+    keys = [citizen_recent_key(user_id) for user_id in {row['user_id'] for row in moved}]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+    reminders = ReportReminder.objects.filter(report_id__in=ids).values(*REMINDER_COLUMNS)
+    ArchivedReportReminder.objects.bulk_create([ArchivedReportReminder(**row) for row in reminders])
+    ReportSignatureBand.objects.filter(report_id__in=ids).delete()
+
+    # Cascades to the notifications and reminders, both copied above, and
+    # to nothing else; the usual signal handlers take the reports out of
+    # the counters, the search index and the heatmap
+    CrimeReport.objects.filter(pk__in=ids).delete()
+    return len(rows), len(moved)
+
+
+# ===================== Querying =====================
+def report_querysets(include_archived=False):
+    """The report tables to read: CrimeReport, then the archive when asked"""
+    if include_archived:
+        return [CrimeReport.objects.all(), ArchivedCrimeReport.objects.all()]
+    return [CrimeReport.objects.all()]
+
+
+def find_report(pk, include_archived=True):
+    """The report with this id from either table, or None"""
+    for queryset in report_querysets(include_archived):
+        report = queryset.filter(pk=pk).first()
+        if report is not None:
+            return report
+    return None
+
+
+def reports_for(include_archived=False, **filters):
+    """
+    Reports matching filters (any lookup valid on both tables), newest
+    first, as one list merged from the hot table and optionally the archive.
+    Each row has is_archived set accordingly.
+    """
+    querysets = [
+        queryset.filter(**filters).select_related('department').order_by('-date_reported', '-id')
+        for queryset in report_querysets(include_archived)
+    ]
+    return list(heapq.merge(*querysets, key=lambda report: (report.date_reported, report.pk), reverse=True))
+
+
+def archived_counts(**filters):
+    """Archived report counts by status, plus 'total'"""
+    counts = Counter(dict(
+        ArchivedCrimeReport.objects.filter(**filters).values_list('status').annotate(count=Count('pk')).order_by()
+    ))
+    counts['total'] = sum(counts.values())
+    return counts
@@ -0,0 +1,186 @@
+import os
+import time
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import ArchivedCrimeReport, CrimeReport, EvidenceBlob
+from .storage import BLOB_DIR, BLOB_NAME, evidence_storage, is_blob_name
+
+EVIDENCE_FIELDS = ('evidence_image', 'evidence_video', 'evidence_audio')
+# A blob saved this recently may belong to a report whose transaction hasn't committed yet
+GC_GRACE_SECONDS = 24 * 3600
+
+
+def _blob_names(names):
+    return Counter(name for name in names if is_blob_name(name))
+
+
+def _current_names(report):
+    return [getattr(report, field).name or '' for field in EVIDENCE_FIELDS]
+
+
+# ===================== Reference Counting =====================
+def adjust_references(name, delta):
+    if EvidenceBlob.objects.filter(name=name).update(references=F('references') + delta):
+        return
+    try:
+        with transaction.atomic():
+            EvidenceBlob.objects.create(name=name, references=delta)
+    except IntegrityError:
+        # Another writer created the row first
+        EvidenceBlob.objects.filter(name=name).update(references=F('references') + delta)
+
+
+@receiver(pre_save, sender=CrimeReport)
+def crime_report_load_evidence(sender, instance, raw=False, update_fields=None, **kwargs):
+    if update_fields is not None and not set(update_fields) & set(EVIDENCE_FIELDS):
+        instance._evidence_names = None
+    elif raw or instance._state.adding:
+        instance._evidence_names = ()
+    else:
+        instance._evidence_names = (
+            CrimeReport.objects.filter(pk=instance.pk).values_list(*EVIDENCE_FIELDS).first() or ()
+        )
+
+
+@receiver(post_save, sender=CrimeReport)
+def crime_report_count_evidence(sender, instance, raw=False, **kwargs):
+    previous = getattr(instance, '_evidence_names', None)
+    if previous is None:
+        return
+    before, after = _blob_names(previous), _blob_names(_current_names(instance))
+    for name in before.keys() | after.keys():
+        delta = after[name] - before[name]
+        if delta:
+            adjust_references(name, delta)
+    instance._evidence_names = None
+
+
+def reference_evidence(rows, delta=1):
+    """Adds delta references for every blob named in rows of EVIDENCE_FIELDS values"""
+    counts = Counter()
+    for names in rows:
+        counts.update(_blob_names(names))
+    for name, count in counts.items():
+        adjust_references(name, delta * count)
+
+
+@receiver(post_delete, sender=CrimeReport)
+@receiver(post_delete, sender=ArchivedCrimeReport)
+def crime_report_release_evidence(sender, instance, **kwargs):
+    reference_evidence([_current_names(instance)], delta=-1)
+
+
+@transaction.atomic
+def recount_references():
+    """
+    Rewrites every reference count from the reports and archive tables.
+    Returns the number of blobs whose count had drifted.
+    """
+    expected = Counter()
+    for model in (CrimeReport, ArchivedCrimeReport):
+        for names in model.objects.values_list(*EVIDENCE_FIELDS).iterator(chunk_size=2000):
+            expected.update(_blob_names(names))
+    drifted = 0
+    for blob in EvidenceBlob.objects.select_for_update():
+        count = expected.pop(blob.name, 0)
+        if blob.references != count:
+            blob.references = count
+            blob.save(update_fields=['references'])
+            drifted += 1
+    EvidenceBlob.objects.bulk_create(
+        [EvidenceBlob(name=name, references=count) for name, count in expected.items()],
+        batch_size=500,
+    )
+    return drifted + len(expected)
+
+
+# ===================== Garbage Collection =====================
+def _remove_with_derivatives(storage, name):
+    path = storage.path(name)
+    directory, filename = os.path.split(path)
+    for other in os.listdir(directory):
+        if other.startswith(filename + '.'):
+            os.unlink(os.path.join(directory, other))
+    os.unlink(path)
+
+
+def collect_garbage(grace_seconds=GC_GRACE_SECONDS, dry_run=False):
+    """
+    Deletes blobs no report references, along with their thumbnails, once
+    they are older than the grace period. Saving a duplicate refreshes a
+    blob's mtime, so a blob about to gain a reference is never collected.
+    Returns (blobs removed, bytes freed).
+    """
+    storage = evidence_storage()
+    root = storage.path(BLOB_DIR)
+    referenced = set(EvidenceBlob.objects.filter(references__gt=0).values_list('name', flat=True))
+    cutoff = time.time() - grace_seconds
+    removed, freed, collected = 0, 0, []
+
+    for directory, _, files in os.walk(root):
+        for filename in files:
+            path = os.path.join(directory, filename)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                # A thumbnail already removed with its blob
+                continue
+            if stat.st_mtime >= cutoff:
+                continue
+            if filename.endswith('.part') and directory == root:
+                # Spool file left behind by a crashed save
+                freed += stat.st_size
+                if not dry_run:
+                    os.unlink(path)
+                continue
+            if not BLOB_NAME.match(filename):
+                continue
+            name = os.path.relpath(path, storage.location).replace(os.sep, '/')
+            if name in referenced:
+                continue
+            removed += 1
+            freed += stat.st_size
+            collected.append(name)
+            if dry_run:
+                continue
+            _remove_with_derivatives(storage, name)
+
+    if not dry_run:
+        for start in range(0, len(collected), 500):
+            EvidenceBlob.objects.filter(name__in=collected[start:start + 500], references__lte=0).delete()
+    return removed, freed
+
+
+def migrate_legacy_evidence():
+    """
+    Moves evidence saved under its upload_to path into the blob store, so
+    copies made before content addressing share one file too.
+    Returns the number of files moved.
+    """
+    storage = evidence_storage()
+    migrated = {}
+    reports = CrimeReport.objects.only('pk', *EVIDENCE_FIELDS).order_by('pk')
+    for report in reports.iterator(chunk_size=500):
+        replaced = []
+        for field in EVIDENCE_FIELDS:
+            name = getattr(report, field).name
+            if name in migrated:
+                setattr(report, field, migrated[name])
+            elif name and not is_blob_name(name) and storage.exists(name):
+                with storage.open(name) as f:
+                    migrated[name] = storage.save(name, f)
+                setattr(report, field, migrated[name])
+            else:
+                continue
+            replaced.append(field)
+        if replaced:
+            with transaction.atomic():
+                report.save(update_fields=replaced)
+    for name in migrated:
+        _remove_with_derivatives(storage, name)
+    return len(migrated)
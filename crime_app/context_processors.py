@@ -1,18 +1,33 @@
-from .models import Notification
+from django.core.handlers.asgi import ASGIRequest
+
+from .inbox import recent_officer_notifications
+
+def principal(request):
+    """
+    Make the request's resolved principal (user, officer, department) available to templates.
+    """
+    return {'principal': getattr(request, 'principal', None)}
+
 
 def officer_notifications(request):
     """
     Make notification data available on all officer pages.
+    Counts are denormalized on the officer/user rows and the recent list is
+    cached, so this normally runs no SQL.
     """
-    if request.user.is_authenticated and hasattr(request.user, 'officer'):
-        officer = request.user.officer
-        unread_count = officer.notifications.filter(is_read=False).count()
-        recent_notifications = officer.notifications.order_by('-created_at')[:5]
-    else:
-        unread_count = 0
-        recent_notifications = []
+    principal = getattr(request, 'principal', None)
+    unread_count = 0
+    recent_notifications = []
+    # The officer or user row can be gone while the session still names it
+    if principal is not None and principal.is_officer and principal.officer is not None:
+        unread_count = principal.officer.unread_notifications
+        recent_notifications = recent_officer_notifications(principal.officer)
+    elif principal is not None and principal.is_authenticated and principal.user is not None:
+        unread_count = principal.user.unread_notifications
 
     return {
         'unread_count': unread_count,
         'recent_notifications': recent_notifications,
+        # The SSE stream only works when served over ASGI (see notification_stream)
+        'live_notifications': isinstance(request, ASGIRequest),
     }
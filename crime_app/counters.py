@@ -0,0 +1,165 @@
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import CrimeReport, ReportCounter
+
+ALL = ReportCounter.ALL
+NONE = ReportCounter.NONE
+
+
+def _key(value):
+    """Maps a model instance, pk or None onto a counter key"""
+    if value is None:
+        return NONE
+    return getattr(value, 'pk', value)
+
+
+def _grains(department_id, reporter_id):
+    """Every (department_key, reporter_key) row a single report contributes to"""
+    department_key, reporter_key = _key(department_id), _key(reporter_id)
+    return {
+        (department_key, reporter_key),
+        (department_key, ALL),
+        (ALL, reporter_key),
+        (ALL, ALL),
+    }
+
+
+# ===================== Maintenance =====================
+def apply_delta(counter_key, delta):
+    """Adds delta to every counter row covering counter_key"""
+    department_id, reporter_id, status, priority = counter_key
+    for department_key, reporter_key in _grains(department_id, reporter_id):
+        lookup = {
+            'department_key': department_key,
+            'reporter_key': reporter_key,
+            'status': status,
+            'priority': priority,
+        }
+        if ReportCounter.objects.filter(**lookup).update(count=F('count') + delta):
+            continue
+        try:
+            with transaction.atomic():
+                ReportCounter.objects.create(count=delta, **lookup)
+        except IntegrityError:
+            # Another writer created the row first
+            ReportCounter.objects.filter(**lookup).update(count=F('count') + delta)
+
+
+@receiver(pre_save, sender=CrimeReport)
+def crime_report_load_counted_state(sender, instance, raw=False, **kwargs):
+    # Instances loaded with counted fields deferred don't know what they were counted as
+    if raw or instance._state.adding or getattr(instance, '_counter_key', None):
+        return
+    instance._counter_key = (
+        CrimeReport.objects.filter(pk=instance.pk)
+        .values_list(*CrimeReport.COUNTER_FIELDS)
+        .first()
+    )
+
+
+@receiver(post_save, sender=CrimeReport)
+def crime_report_counted(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    new_key = instance.get_counter_key()
+    if created:
+        apply_delta(new_key, 1)
+    else:
+        old_key = getattr(instance, '_counter_key', None)
+        if old_key is None:
+            apply_delta(new_key, 1)
+        elif old_key != new_key:
+            apply_delta(old_key, -1)
+            apply_delta(new_key, 1)
+    instance._counter_key = new_key
+
+
+@receiver(post_delete, sender=CrimeReport)
+def crime_report_uncounted(sender, instance, **kwargs):
+    apply_delta(getattr(instance, '_counter_key', None) or instance.get_counter_key(), -1)
+
+
+def expected_counts():
+    """Recomputes every counter row from the reports table"""
+    expected = Counter()
+    rows = (
+        CrimeReport.objects.order_by()
+        .values('department_id', 'reporter_id', 'status', 'priority')
+        .annotate(total=Count('id'))
+    )
+    for row in rows:
+        for department_key, reporter_key in _grains(row['department_id'], row['reporter_id']):
+            expected[(department_key, reporter_key, row['status'], row['priority'])] += row['total']
+    return expected
+
+
+@transaction.atomic
+def reconcile_counters():
+    """
+    Rewrites counter rows that drifted from the reports table.
+    Returns the number of rows that were created, changed or removed.
+    """
+    expected = expected_counts()
+    current = {
+        (c.department_key, c.reporter_key, c.status, c.priority): c
+        for c in ReportCounter.objects.select_for_update()
+    }
+
+    stale = [c for key, c in current.items() if key not in expected]
+    changed = []
+    missing = []
+    for key, total in expected.items():
+        counter = current.get(key)
+        if counter is None:
+            department_key, reporter_key, status, priority = key
+            missing.append(ReportCounter(
+                department_key=department_key, reporter_key=reporter_key,
+                status=status, priority=priority, count=total,
+            ))
+        elif counter.count != total:
+            counter.count = total
+            changed.append(counter)
+
+    ReportCounter.objects.filter(pk__in=[c.pk for c in stale]).delete()
+    ReportCounter.objects.bulk_update(changed, ['count'], batch_size=500)
+    ReportCounter.objects.bulk_create(missing, batch_size=500)
+    # Rows that were already zero are just tidied away, not counted as drift
+    drifted = [c for c in stale if c.count]
+    return len(drifted) + len(changed) + len(missing)
+
+
+# ===================== Lookups =====================
+def report_counts(department=ALL, reporter=ALL):
+    """
+    Returns report counts by status plus a 'total', read from the counter table.
+    Pass a department and/or reporter (or None for unassigned) to narrow the scope.
+    """
+    department_key = department if department == ALL else _key(department)
+    reporter_key = reporter if reporter == ALL else _key(reporter)
+    counts = dict.fromkeys((status for status, _ in CrimeReport.STATUS_CHOICES), 0)
+    rows = (
+        ReportCounter.objects.filter(department_key=department_key, reporter_key=reporter_key)
+        .values('status')
+        .annotate(total=Sum('count'))
+        .order_by()
+    )
+    for row in rows:
+        counts[row['status']] = row['total']
+    counts['total'] = sum(counts.values())
+    return counts
+
+
+def active_department_count():
+    """Number of departments that have at least one report"""
+    return (
+        ReportCounter.objects.filter(reporter_key=ALL, count__gt=0)
+        .exclude(department_key__in=[ALL, NONE])
+        .values('department_key')
+        .distinct()
+        .count()
+    )
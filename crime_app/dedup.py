@@ -0,0 +1,99 @@
+from datetime import timedelta
+
+from django.db.models import Q
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from . import minhash
+from .models import CrimeReport, ReportSignatureBand
+
+DUPLICATE_RADIUS_M = 500
+DUPLICATE_WINDOW = timedelta(hours=6)
+DUPLICATE_SIMILARITY = 0.5
+
+
+def report_text(report):
+    return f"{report.title} {report.description}"
+
+
+def index_signature(report, sig):
+    """Stores the report's signature and its LSH band buckets"""
+    ReportSignatureBand.objects.filter(report=report).delete()
+    ReportSignatureBand.objects.bulk_create([
+        ReportSignatureBand(report=report, band=band, bucket=bucket)
+        for band, bucket in enumerate(minhash.band_buckets(sig))
+    ])
+    CrimeReport.objects.filter(pk=report.pk).update(text_signature=minhash.to_bytes(sig))
+    report.text_signature = minhash.to_bytes(sig)
+
+
+def candidate_reports(report, sig):
+    """
+    Canonical reports of the same incident type and department, filed close
+    in space and time, that share at least one LSH band with this signature.
+    The department must match: officers are notified of canonical reports
+    only, so a duplicate linked across departments would never reach its own.
+    """
+    bands = Q()
+    for band, bucket in enumerate(minhash.band_buckets(sig)):
+        bands |= Q(band=band, bucket=bucket)
+    sharing_band = ReportSignatureBand.objects.filter(bands).values('report_id')
+
+    if report.latitude is not None and report.longitude is not None:
+        reports = CrimeReport.objects.nearby(report.latitude, report.longitude, DUPLICATE_RADIUS_M).filter(
+            department_id=report.department_id
+        )
+    elif report.department_id:
+        # Without coordinates the described location stands in for distance
+        reports = CrimeReport.objects.filter(department_id=report.department_id, location__iexact=report.location)
+    else:
+        return CrimeReport.objects.none()
+
+    since = report.date_reported - DUPLICATE_WINDOW
+    return (
+        reports.filter(
+            incident_type=report.incident_type,
+            date_reported__gte=since,
+            duplicate_of__isnull=True,
+            pk__in=sharing_band,
+        )
+        .exclude(pk=report.pk)
+        .only('id', 'report_id', 'title', 'text_signature')
+    )
+
+
+def find_canonical(report, sig):
+    """The best matching canonical report and its similarity, or (None, 0.0)"""
+    candidates = [c for c in candidate_reports(report, sig) if c.text_signature]
+    if not candidates:
+        return None, 0.0
+    scores = minhash.similarity(sig, [minhash.from_bytes(c.text_signature) for c in candidates])
+    best = int(scores.argmax())
+    if scores[best] < DUPLICATE_SIMILARITY:
+        return None, 0.0
+    return candidates[best], float(scores[best])
+
+
+def check_duplicate(report):
+    """
+    Signs a newly saved report and links it to a canonical report if it
+    looks like another filing of the same incident. Returns the canonical
+    report or None.
+    """
+    sig = minhash.signature(report_text(report))
+    if sig is None:
+        return None
+    canonical, score = find_canonical(report, sig)
+    index_signature(report, sig)
+    if canonical is None:
+        return None
+    CrimeReport.objects.filter(pk=report.pk).update(duplicate_of=canonical, duplicate_score=score)
+    report.duplicate_of = canonical
+    report.duplicate_score = score
+    return canonical
+
+
+@receiver(post_save, sender=CrimeReport)
+def crime_report_dedup(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        check_duplicate(instance)
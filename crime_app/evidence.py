@@ -0,0 +1,180 @@
+import mimetypes
+import os
+import re
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+from .storage import is_blob_name
+
+FIELDS = {
+    'image': 'evidence_image',
+    'video': 'evidence_video',
+    'audio': 'evidence_audio',
+}
+# None serves through Django. 'x-accel-redirect' (nginx) or 'x-sendfile'
+# (Apache mod_xsendfile, lighttpd) hands the file to the front server,
+# which then does ranges and conditional requests itself; prefer it in
+# production, as Django ties up a worker thread (WSGI) or a thread hop per
+# block (ASGI) for every file it streams.
+SENDFILE = getattr(settings, 'EVIDENCE_SENDFILE', None)
+# Internal nginx location aliased to MEDIA_ROOT, used with x-accel-redirect
+ACCEL_PREFIX = getattr(settings, 'EVIDENCE_ACCEL_PREFIX', '/protected-media/')
+BLOCK_SIZE = 64 * 1024
+RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class BoundedFile:
+    """
+    Reads at most `length` bytes from an open file. It has no fileno(), so
+    servers stream it instead of sendfile()-ing to the end of the file.
+    """
+
+    def __init__(self, file, length):
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+async def aiter_blocks(file):
+    """
+    Reads the file a block at a time in a worker thread. Under ASGI Django
+    drains a sync iterator such as FileResponse's into a list before
+    sending, so serving through it would load whole videos into memory.
+    """
+    read = sync_to_async(file.read, thread_sensitive=False)
+    try:
+        while True:
+            block = await read(BLOCK_SIZE)
+            if not block:
+                break
+            yield block
+    finally:
+        file.close()
+
+
+def etag_for(fieldfile, stat):
+    name = os.path.basename(fieldfile.name)
+    if is_blob_name(fieldfile.name):
+        # Blob names are the SHA-256 of the contents: the strongest possible validator
+        return quote_etag(name.split('.', 1)[0])
+    return quote_etag(f"{stat.st_size:x}-{int(stat.st_mtime):x}")
+
+
+def parse_range(header, size):
+    """
+    Returns the (start, end) byte positions, end inclusive, of a single
+    range, None to serve the whole file, or False if it can't be satisfied.
+    Multi-range requests get the whole file, which RFC 9110 allows.
+    """
+    match = RANGE.match((header or '').replace(' ', ''))
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if not length:
+            return False
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _if_range_matches(request, etag, last_modified):
+    value = request.headers.get('If-Range')
+    if not value:
+        return True
+    if value.startswith('"') or value.startswith('W/'):
+        # Weak validators never match for If-Range
+        return value == etag and not etag.startswith('W/')
+    date = parse_http_date_safe(value)
+    return date is not None and int(last_modified) == date
+
+
+def _offload(fieldfile, path, content_type):
+    response = HttpResponse(content_type=content_type)
+    if SENDFILE == 'x-accel-redirect':
+        response['X-Accel-Redirect'] = ACCEL_PREFIX.rstrip('/') + '/' + fieldfile.name
+    else:
+        response['X-Sendfile'] = path
+    return response
+
+
+def serve_evidence(request, fieldfile, filename, as_attachment=False):
+    """
+    Streams one evidence file, honouring Range, If-Range and the usual
+    conditional headers. Access must already have been checked.
+    """
+    path = fieldfile.path
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    content_type = mimetypes.guess_type(fieldfile.name)[0] or 'application/octet-stream'
+
+    if SENDFILE:
+        response = _offload(fieldfile, path, content_type)
+    else:
+        etag = etag_for(fieldfile, stat)
+        response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+        if response is not None:
+            return response
+
+        size = stat.st_size
+        byte_range = parse_range(request.headers.get('Range'), size) if size else None
+        if byte_range is not None and not _if_range_matches(request, etag, stat.st_mtime):
+            byte_range = None
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f"bytes */{size}"
+            return response
+
+        f = open(path, 'rb')
+        if byte_range is None:
+            status, body, length = 200, f, size
+        else:
+            start, end = byte_range
+            f.seek(start)
+            # A range running to the end of the file keeps the real file, so
+            # the WSGI server can still sendfile() it without copying
+            status, length = 206, end - start + 1
+            body = f if end == size - 1 else BoundedFile(f, length)
+        if isinstance(request, ASGIRequest):
+            response = StreamingHttpResponse(aiter_blocks(body), status=status, content_type=content_type)
+        else:
+            response = FileResponse(body, status=status, content_type=content_type)
+            response.block_size = BLOCK_SIZE
+        if byte_range is not None:
+            response['Content-Range'] = f"bytes {start}-{end}/{size}"
+        response['Content-Length'] = length
+        response['Accept-Ranges'] = 'bytes'
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(stat.st_mtime)
+
+    disposition = 'attachment' if as_attachment else 'inline'
+    response['Content-Disposition'] = f'{disposition}; filename="{filename}"'
+    response['X-Content-Type-Options'] = 'nosniff'
+    # Evidence is access-controlled: browsers may reuse it, shared caches may not
+    patch_cache_control(response, private=True, max_age=3600)
+    return response
@@ -0,0 +1,140 @@
+import csv
+import json
+from datetime import datetime, time
+
+from asgiref.sync import sync_to_async
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .models import ArchivedCrimeReport, CrimeReport
+
+CHUNK_SIZE = 2000
+
+# (column, lookup) pairs; values_list() keeps rows as tuples, never model instances
+EXPORT_COLUMNS = (
+    ('report_id', 'report_id'),
+    ('title', 'title'),
+    ('description', 'description'),
+    ('location', 'location'),
+    ('latitude', 'latitude'),
+    ('longitude', 'longitude'),
+    ('incident_type', 'incident_type'),
+    ('priority', 'priority'),
+    ('status', 'status'),
+    ('date_reported', 'date_reported'),
+    ('date_updated', 'date_updated'),
+    ('department_id', 'department_id'),
+    ('department', 'department__name'),
+    ('reporter_email', 'reporter__email'),
+    ('reporter_first_name', 'reporter__first_name'),
+    ('reporter_last_name', 'reporter__last_name'),
+    ('reporter_phone', 'reporter__phone'),
+    ('duplicate_of', 'duplicate_of__report_id'),
+)
+HEADER = [column for column, _ in EXPORT_COLUMNS]
+LOOKUPS = [lookup for _, lookup in EXPORT_COLUMNS]
+
+
+def _day_bound(value, end=False):
+    day = parse_date(value)
+    if day is None:
+        raise ValueError(f"Invalid date '{value}', expected YYYY-MM-DD")
+    return timezone.make_aware(datetime.combine(day, time.max if end else time.min))
+
+
+def export_querysets(date_from=None, date_to=None, status=None, department=None, include_archived=False):
+    """
+    Reports to export as querysets of value tuples in HEADER order: the live
+    reports, then the archived ones when include_archived. Dates are
+    YYYY-MM-DD and inclusive. Raises ValueError for malformed filters.
+    """
+    filters = _export_filters(date_from, date_to, status, department)
+    models = (CrimeReport, ArchivedCrimeReport) if include_archived else (CrimeReport,)
+    # The archive has the same columns and relations, so the lookups apply to both
+    return [
+        model.objects.filter(**filters).order_by('id').values_list(*LOOKUPS)
+        for model in models
+    ]
+
+
+def _export_filters(date_from, date_to, status, department):
+    filters = {}
+    if date_from:
+        filters['date_reported__gte'] = _day_bound(date_from)
+    if date_to:
+        filters['date_reported__lte'] = _day_bound(date_to, end=True)
+    if status:
+        if status not in dict(CrimeReport.STATUS_CHOICES):
+            raise ValueError(f"Invalid status '{status}'")
+        filters['status'] = status
+    if department:
+        try:
+            filters['department_id'] = int(department)
+        except ValueError:
+            raise ValueError(f"Invalid department '{department}'")
+    return filters
+
+
+class _Echo:
+    """File-like object whose write() hands the line back to the caller"""
+
+    def write(self, value):
+        return value
+
+
+def _json_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def export_rows(querysets):
+    for rows in querysets:
+        yield from rows.iterator(chunk_size=CHUNK_SIZE)
+
+
+def csv_lines(rows, header=True):
+    writer = csv.writer(_Echo())
+    if header:
+        yield writer.writerow(HEADER)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def ndjson_lines(rows, header=True):
+    for row in rows:
+        yield json.dumps(dict(zip(HEADER, map(_json_value, row))), ensure_ascii=False) + '\n'
+
+
+def _fetch_chunk(queryset, after):
+    """The next CHUNK_SIZE rows with an id above `after`, each led by its id"""
+    return list(queryset.filter(pk__gt=after).values_list('id', *LOOKUPS)[:CHUNK_SIZE])
+
+
+async def aiter_lines(lines, querysets):
+    """
+    Async form of lines(export_rows(querysets)) for ASGI servers. Django
+    drains a sync iterator into a list before sending under ASGI, so a large
+    export would sit in memory whole. Here each CHUNK_SIZE rows are read by
+    a keyset query in a worker thread (no cursor stays open between awaits)
+    and sent as one piece.
+    """
+    fetch = sync_to_async(_fetch_chunk)
+    header = True
+    for queryset in querysets:
+        after = 0
+        while True:
+            chunk = await fetch(queryset, after)
+            if not chunk:
+                break
+            after = chunk[-1][0]
+            yield ''.join(lines((row[1:] for row in chunk), header=header))
+            header = False
+            if len(chunk) < CHUNK_SIZE:
+                break
+    if header:
+        yield ''.join(lines((), header=True))
+
+
+FORMATS = {
+    'csv': (csv_lines, 'text/csv'),
+    'ndjson': (ndjson_lines, 'application/x-ndjson'),
+}
@@ -71,7 +71,7 @@ class UserRegistrationForm(UserCreationForm):
         })
 
     def clean_email(self):
-        email = self.cleaned_data.get('email')
+        email = User.normalize_login_email(self.cleaned_data.get('email'))
         if User.objects.filter(email=email).exists():
             raise forms.ValidationError("A user with this email already exists.")
         return email
@@ -113,22 +113,22 @@ class LoginForm(forms.Form):
         })
     )
 
+    def __init__(self, *args, request=None, **kwargs):
+        self.request = request
+        super().__init__(*args, **kwargs)
+
     def clean(self):
         cleaned_data = super().clean()
         email = cleaned_data.get('email')
         password = cleaned_data.get('password')
 
         if email and password:
-            # Authenticate using email instead of username
-            try:
-                user = User.objects.get(email=email)
-                user = authenticate(username=user.username, password=password)
-                if user is None:
-                    raise forms.ValidationError("Invalid email or password.")
-                cleaned_data['user'] = user
-            except User.DoesNotExist:
+            # The only authentication a login does: see EmailBackend
+            user = authenticate(self.request, email=email, password=password)
+            if user is None:
                 raise forms.ValidationError("Invalid email or password.")
-        
+            cleaned_data['user'] = user
+
         return cleaned_data
 
 
@@ -0,0 +1,90 @@
+import math
+
+GEOHASH_PRECISION = 7  # ~153m x 153m cells
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+EARTH_RADIUS_M = 6371008.8
+
+# Cap on how many cells a query may expand to before it coarsens the prefix
+MAX_QUERY_CELLS = 32
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Standard base32 geohash of a point"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        rng, value = (lng_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            rng[0] = mid
+        else:
+            bits <<= 1
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = bit_count = 0
+    return ''.join(chars)
+
+
+def cell_size(precision):
+    """(lat_degrees, lng_degrees) covered by one geohash cell of this precision"""
+    lng_bits = math.ceil(precision * 5 / 2)
+    lat_bits = precision * 5 // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lng_bits
+
+
+def bbox_around(latitude, longitude, radius_m):
+    """(south, west, north, east) box enclosing a circle of radius_m metres"""
+    lat_delta = math.degrees(radius_m / EARTH_RADIUS_M)
+    cos_lat = math.cos(math.radians(latitude))
+    lng_delta = 180.0 if cos_lat < 1e-6 else min(180.0, lat_delta / cos_lat)
+    return (
+        max(-90.0, latitude - lat_delta),
+        max(-180.0, longitude - lng_delta),
+        min(90.0, latitude + lat_delta),
+        min(180.0, longitude + lng_delta),
+    )
+
+
+def cells_for_bbox(south, west, north, east):
+    """
+    Geohash prefixes whose cells together cover the box. Starts at the
+    stored precision and coarsens until at most MAX_QUERY_CELLS are needed.
+    Returns (precision, prefixes).
+    """
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_step, lng_step = cell_size(precision)
+        rows = math.floor(north / lat_step) - math.floor(south / lat_step) + 1
+        cols = math.floor(east / lng_step) - math.floor(west / lng_step) + 1
+        if rows * cols <= MAX_QUERY_CELLS or precision == 1:
+            break
+
+    prefixes = set()
+    lat = south
+    while True:
+        lng = west
+        while True:
+            prefixes.add(encode_geohash(min(lat, 90.0), min(lng, 180.0), precision))
+            if lng >= east:
+                break
+            lng = min(lng + lng_step, east)
+        if lat >= north:
+            break
+        lat = min(lat + lat_step, north)
+    return precision, sorted(prefixes)
+
+
+def haversine_m(lat1, lng1, lat2, lng2):
+    """Great-circle distance in metres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
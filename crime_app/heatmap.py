@@ -0,0 +1,181 @@
+import io
+import math
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+from PIL import Image
+
+from .models import CrimeReport
+
+WINDOWS = {
+    '24h': timedelta(hours=24),
+    '7d': timedelta(days=7),
+    '30d': timedelta(days=30),
+    'all': None,
+}
+ALL_TYPES = 'all'
+ALL_DEPARTMENTS = 'all'
+
+GRID_SIZE = getattr(settings, 'HEATMAP_GRID_SIZE', 64)
+MAX_ZOOM = getattr(settings, 'HEATMAP_MAX_ZOOM', 18)
+TILE_TIMEOUT = getattr(settings, 'HEATMAP_TILE_TIMEOUT', 60 * 10)
+PNG_SIZE = 256
+
+# Web mercator cannot represent the poles
+MAX_LATITUDE = 85.05112878
+
+
+# ===================== Tile Geometry =====================
+def tile_for(latitude, longitude, zoom):
+    """Slippy-map (x, y) of the tile containing a point"""
+    n = 2 ** zoom
+    fx, fy = _mercator(np.array([latitude]), np.array([longitude]), n)
+    return min(int(fx[0]), n - 1), min(int(fy[0]), n - 1)
+
+
+def tile_bounds(zoom, x, y):
+    """(south, west, north, east) of a tile in degrees"""
+    n = 2 ** zoom
+
+    def lat(row):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / n))))
+
+    return lat(y + 1), x / n * 360.0 - 180.0, lat(y), (x + 1) / n * 360.0 - 180.0
+
+
+def _mercator(latitudes, longitudes, n):
+    """Vectorized projection onto fractional tile coordinates at a zoom with n tiles per side"""
+    lat = np.radians(np.clip(latitudes, -MAX_LATITUDE, MAX_LATITUDE))
+    fx = (longitudes + 180.0) / 360.0 * n
+    fy = (1.0 - np.arcsinh(np.tan(lat)) / math.pi) / 2.0 * n
+    return fx, fy
+
+
+# ===================== Binning =====================
+def tile_key(window, incident_type, department, zoom, x, y):
+    return f"heatmap:{GRID_SIZE}:{department}:{window}:{incident_type}:{zoom}:{x}:{y}"
+
+
+def compute_tile(window, incident_type, department, zoom, x, y):
+    """Counts reports per grid cell of one tile. Rows run north to south."""
+    south, west, north, east = tile_bounds(zoom, x, y)
+    reports = CrimeReport.objects.within_bbox(south, west, north, east)
+    if WINDOWS[window] is not None:
+        reports = reports.filter(date_reported__gte=timezone.now() - WINDOWS[window])
+    if incident_type != ALL_TYPES:
+        reports = reports.filter(incident_type=incident_type)
+    if department != ALL_DEPARTMENTS:
+        reports = reports.filter(department_id=department)
+
+    points = np.array(list(reports.values_list('latitude', 'longitude')), dtype=np.float64).reshape(-1, 2)
+    fx, fy = _mercator(points[:, 0], points[:, 1], 2 ** zoom)
+    counts, _, _ = np.histogram2d(
+        (fy - y) * GRID_SIZE, (fx - x) * GRID_SIZE,
+        bins=GRID_SIZE, range=[[0, GRID_SIZE], [0, GRID_SIZE]],
+    )
+    return counts.astype(np.uint32)
+
+
+def get_tile(window, incident_type, department, zoom, x, y):
+    """Binned counts for a tile, from cache when possible"""
+    key = tile_key(window, incident_type, department, zoom, x, y)
+    counts = cache.get(key)
+    if counts is None:
+        counts = compute_tile(window, incident_type, department, zoom, x, y)
+        cache.set(key, counts, TILE_TIMEOUT)
+    return counts
+
+
+def tile_json(counts):
+    """Sparse form: only non-empty cells, as [row, col, count] triples"""
+    rows, cols = np.nonzero(counts)
+    return {
+        'grid': GRID_SIZE,
+        'max': int(counts.max()) if counts.size else 0,
+        'total': int(counts.sum()),
+        'cells': np.column_stack((rows, cols, counts[rows, cols])).tolist(),
+    }
+
+
+def tile_png(counts):
+    """Renders counts as a transparent yellow-to-red overlay"""
+    peak = counts.max()
+    intensity = np.sqrt(counts / peak) if peak else np.zeros(counts.shape)
+    rgba = np.zeros(counts.shape + (4,), dtype=np.uint8)
+    rgba[..., 0] = 255
+    rgba[..., 1] = (220 * (1 - intensity)).astype(np.uint8)
+    rgba[..., 3] = np.where(counts > 0, 80 + 175 * intensity, 0).astype(np.uint8)
+    image = Image.fromarray(rgba, 'RGBA').resize((PNG_SIZE, PNG_SIZE), Image.NEAREST)
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG', optimize=True)
+    return buffer.getvalue()
+
+
+# ===================== Invalidation =====================
+def keys_covering(latitude, longitude, incident_type, department_id):
+    """Every cached tile key whose counts include a report at this point"""
+    keys = []
+    departments = [ALL_DEPARTMENTS] if department_id is None else [ALL_DEPARTMENTS, department_id]
+    for zoom in range(MAX_ZOOM + 1):
+        x, y = tile_for(latitude, longitude, zoom)
+        for window in WINDOWS:
+            for kind in (ALL_TYPES, incident_type):
+                for department in departments:
+                    keys.append(tile_key(window, kind, department, zoom, x, y))
+    return keys
+
+
+def invalidate_point(latitude, longitude, incident_type, department_id):
+    if latitude is None or longitude is None:
+        return
+    keys = keys_covering(latitude, longitude, incident_type, department_id)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def _moves_point(update_fields):
+    """Whether a save of these fields (None: all of them) can move a report on the heatmap"""
+    if update_fields is None:
+        return True
+    attnames = {CrimeReport._meta.get_field(name).attname for name in update_fields}
+    return bool(attnames & set(CrimeReport.HEATMAP_FIELDS))
+
+
+@receiver(pre_save, sender=CrimeReport)
+def crime_report_load_heatmap_point(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Instances loaded with these fields deferred don't know where they were drawn
+    if raw or instance._state.adding or not _moves_point(update_fields):
+        return
+    if getattr(instance, '_heatmap_point', None):
+        return
+    instance._heatmap_point = (
+        CrimeReport.objects.filter(pk=instance.pk)
+        .values_list(*CrimeReport.HEATMAP_FIELDS)
+        .first()
+    )
+
+
+@receiver(post_save, sender=CrimeReport)
+def crime_report_heatmap_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    # Only new reports and moves between points, types or departments change
+    # tile counts; status and other edits leave the cache alone. Rolling
+    # windows catch up with report ageing through TILE_TIMEOUT.
+    if raw or not (created or _moves_point(update_fields)):
+        return
+    old_point = None if created else getattr(instance, '_heatmap_point', None)
+    new_point = instance.get_heatmap_point()
+    if old_point != new_point:
+        if old_point is not None:
+            invalidate_point(*old_point)
+        invalidate_point(*new_point)
+    instance._heatmap_point = new_point
+
+
+@receiver(post_delete, sender=CrimeReport)
+def crime_report_heatmap_deleted(sender, instance, **kwargs):
+    invalidate_point(*(getattr(instance, '_heatmap_point', None) or instance.get_heatmap_point()))
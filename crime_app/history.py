@@ -0,0 +1,169 @@
+import numpy as np
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import ArchivedCrimeReport, CrimeReport, ReportStatusChange
+
+STATUS_INDEX = CrimeReport.COUNTER_FIELDS.index('status')
+
+
+# ===================== Logging =====================
+@receiver(pre_save, sender=CrimeReport)
+def crime_report_remember_status(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding:
+        instance._previous_status = None
+        return
+    counted = getattr(instance, '_counter_key', None)
+    if counted:
+        instance._previous_status = counted[STATUS_INDEX]
+    else:
+        instance._previous_status = (
+            CrimeReport.objects.filter(pk=instance.pk).values_list('status', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=CrimeReport)
+def crime_report_log_status(sender, instance, created, raw=False, **kwargs):
+    # Runs inside CrimeReport.save()'s transaction, so the log can't miss a change
+    if raw:
+        return
+    previous = getattr(instance, '_previous_status', None)
+    if created or previous != instance.status:
+        record_transition(instance, '' if created else previous or '')
+
+
+@receiver(post_delete, sender=CrimeReport)
+def crime_report_drop_history(sender, instance, **kwargs):
+    # Archiving moves the report but its history stays for SLA figures
+    if not ArchivedCrimeReport.objects.filter(pk=instance.pk).exists():
+        ReportStatusChange.objects.filter(report_id=instance.pk).delete()
+
+
+@receiver(post_delete, sender=ArchivedCrimeReport)
+def archived_report_drop_history(sender, instance, **kwargs):
+    ReportStatusChange.objects.filter(report_id=instance.pk).delete()
+
+
+def record_transition(report, from_status):
+    """
+    Appends one transition. Set report._status_changed_by before saving to
+    record who made the change.
+    """
+    now = timezone.now()
+    seconds_in_previous = None
+    if from_status:
+        entered = (
+            ReportStatusChange.objects.filter(report=report)
+            .order_by('-at', '-id')
+            .values_list('at', flat=True)
+            .first()
+        ) or report.date_reported
+        seconds_in_previous = int((now - entered).total_seconds())
+    changed_by = getattr(report, '_status_changed_by', None)
+    ReportStatusChange.objects.create(
+        report=report,
+        department_id=report.department_id,
+        incident_type=report.incident_type,
+        from_status=from_status,
+        to_status=report.status,
+        changed_by=changed_by if getattr(changed_by, 'is_authenticated', False) else None,
+        at=now,
+        seconds_in_previous=seconds_in_previous,
+        seconds_since_reported=max(0, int((now - report.date_reported).total_seconds())),
+    )
+
+
+def record_imported(reports):
+    """
+    History for bulk-imported reports, which sent no post_save: filed as
+    Pending at date_reported, then moved to their current status at
+    date_updated, the best record a legacy row has of when that happened.
+    """
+    changes = []
+    for report in reports:
+        common = {'report_id': report.pk, 'department_id': report.department_id, 'incident_type': report.incident_type}
+        changes.append(ReportStatusChange(**common, from_status='', to_status='Pending', at=report.date_reported))
+        if report.status != 'Pending':
+            seconds = max(0, int((report.date_updated - report.date_reported).total_seconds()))
+            changes.append(ReportStatusChange(
+                **common, from_status='Pending', to_status=report.status, at=report.date_updated,
+                seconds_in_previous=seconds, seconds_since_reported=seconds,
+            ))
+    ReportStatusChange.objects.bulk_create(changes, batch_size=500)
+    return len(changes)
+
+
+# ===================== SLA Queries =====================
+def _grouped_stats(keys, seconds):
+    """
+    Mean and p90 (nearest rank) per key, vectorized: one sort puts every
+    group's values in order, then each group's p90 is a single index.
+    """
+    if not len(seconds):
+        return []
+    unique, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    order = np.lexsort((seconds, inverse))
+    ordered = seconds[order]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    p90 = ordered[starts + np.ceil(counts * 0.9).astype(np.int64) - 1]
+    means = np.bincount(inverse, weights=seconds) / counts
+    return [
+        (key, int(count), float(mean) / 3600.0, float(p) / 3600.0)
+        for key, count, mean, p in zip(unique.tolist(), counts, means, p90)
+    ]
+
+
+def _changes(since=None, until=None, department=None):
+    changes = ReportStatusChange.objects.all()
+    if department is not None:
+        changes = changes.filter(department=department)
+    if since is not None:
+        changes = changes.filter(at__gte=since)
+    if until is not None:
+        changes = changes.filter(at__lt=until)
+    return changes
+
+
+def resolution_stats(since=None, until=None, department=None):
+    """
+    Mean and p90 hours from filing to resolution, per department and
+    incident type, over reports resolved in [since, until).
+    """
+    rows = list(
+        _changes(since, until, department)
+        .filter(to_status='Resolved')
+        .values_list('department_id', 'incident_type', 'seconds_since_reported')
+    )
+    if not rows:
+        return []
+    departments, types, seconds = zip(*rows)
+    keys = np.array([f"{d or 0}|{t}" for d, t in zip(departments, types)])
+    stats = []
+    for key, count, mean, p90 in _grouped_stats(keys, np.array(seconds, dtype=np.float64)):
+        department_id, incident_type = key.split('|', 1)
+        stats.append({
+            'department_id': int(department_id) or None,
+            'incident_type': incident_type,
+            'resolved': count,
+            'mean_hours': round(mean, 2),
+            'p90_hours': round(p90, 2),
+        })
+    return stats
+
+
+def time_in_status(since=None, until=None, department=None):
+    """Mean and p90 hours reports spent in each status before moving on"""
+    rows = list(
+        _changes(since, until, department)
+        .exclude(from_status='')
+        .filter(seconds_in_previous__isnull=False)
+        .values_list('from_status', 'seconds_in_previous')
+    )
+    if not rows:
+        return {}
+    statuses, seconds = zip(*rows)
+    return {
+        status: {'transitions': count, 'mean_hours': round(mean, 2), 'p90_hours': round(p90, 2)}
+        for status, count, mean, p90 in _grouped_stats(np.array(statuses), np.array(seconds, dtype=np.float64))
+    }
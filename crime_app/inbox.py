@@ -0,0 +1,188 @@
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import BooleanField, Count, ExpressionWrapper, F, Q, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .live import citizen_channel, officer_channel, publish_many
+from .models import CitizenNotification, NotificationWatermark, Officer, User
+
+RECENT_LIMIT = 5
+RECENT_TIMEOUT = 60 * 10
+
+
+def officer_recent_key(officer_id):
+    return f"inbox:officer:{officer_id}:recent"
+
+
+def citizen_recent_key(user_id):
+    return f"inbox:citizen:{user_id}:recent"
+
+
+def _invalidate(keys):
+    keys = list(keys)
+    # Drop cached lists only once the write is visible to other requests
+    transaction.on_commit(lambda: cache.delete_many(keys), robust=True)
+
+
+def _publish_on_commit(channels, event_type, **data):
+    """
+    Pushes a live event to connected SSE clients once the write commits.
+    robust: by then the write has succeeded, so a failed push is only
+    logged rather than raised into the caller (or a whole coalesced batch).
+    """
+    channels = list(channels)
+    transaction.on_commit(lambda: publish_many(channels, event_type, **data), robust=True)
+
+
+# ===================== Watermarks =====================
+def get_watermark(user):
+    """The user's watermark row, or None. EmailBackend.get_user joins it in."""
+    try:
+        return user.notification_watermark
+    except NotificationWatermark.DoesNotExist:
+        return None
+
+
+def read_at(user, inbox):
+    """When the user last marked their 'officer' or 'citizen' inbox all read"""
+    watermark = get_watermark(user)
+    return getattr(watermark, f'{inbox}_read_at') if watermark else None
+
+
+def unread_q(watermark_at, prefix=''):
+    """Filter for unread notifications given an inbox watermark"""
+    q = Q(**{f'{prefix}is_read': False})
+    if watermark_at is not None:
+        q &= Q(**{f'{prefix}created_at__gt': watermark_at})
+    return q
+
+
+def with_read_state(queryset, watermark_at):
+    """Annotates each notification with `seen`: its flag or the watermark marks it read"""
+    seen = ~unread_q(watermark_at)
+    return queryset.annotate(seen=ExpressionWrapper(seen, output_field=BooleanField()))
+
+
+def is_unread(notification, watermark_at):
+    if notification.is_read:
+        return False
+    return watermark_at is None or notification.created_at > watermark_at
+
+
+def _move_watermark(user, inbox, now):
+    """Single-row upsert of the user's watermark for one inbox"""
+    field = f'{inbox}_read_at'
+    if NotificationWatermark.objects.filter(user=user).update(**{field: now}):
+        return
+    try:
+        with transaction.atomic():
+            NotificationWatermark.objects.create(user=user, **{field: now})
+    except IntegrityError:
+        NotificationWatermark.objects.filter(user=user).update(**{field: now})
+
+
+# ===================== Recent Lists =====================
+def recent_officer_notifications(officer):
+    """The officer's five newest notifications, served from cache when possible"""
+    key = officer_recent_key(officer.pk)
+    recent = cache.get(key)
+    if recent is None:
+        notifications = officer.notifications.order_by('-created_at')
+        recent = list(with_read_state(notifications, read_at(officer.user, 'officer'))[:RECENT_LIMIT])
+        cache.set(key, recent, RECENT_TIMEOUT)
+    return recent
+
+
+def recent_citizen_notifications(user):
+    key = citizen_recent_key(user.pk)
+    recent = cache.get(key)
+    if recent is None:
+        notifications = CitizenNotification.objects.filter(user=user).order_by('-created_at')
+        recent = list(with_read_state(notifications, read_at(user, 'citizen'))[:RECENT_LIMIT])
+        cache.set(key, recent, RECENT_TIMEOUT)
+    return recent
+
+
+# ===================== Writes =====================
+def officers_notified(officer_ids, message=''):
+    """Bumps unread counters after new Notification rows were created for these officers"""
+    officer_ids = list(officer_ids)
+    if not officer_ids:
+        return
+    Officer.objects.filter(pk__in=officer_ids).update(unread_notifications=F('unread_notifications') + 1)
+    _invalidate(officer_recent_key(pk) for pk in officer_ids)
+    _publish_on_commit(
+        (officer_channel(pk) for pk in officer_ids),
+        'notification', message=message, created_at=timezone.now(),
+    )
+
+
+def citizen_notified(user_id, title='', message=''):
+    User.objects.filter(pk=user_id).update(unread_notifications=F('unread_notifications') + 1)
+    _invalidate([citizen_recent_key(user_id)])
+    _publish_on_commit(
+        [citizen_channel(user_id)],
+        'notification', title=title, message=message, created_at=timezone.now(),
+    )
+
+
+def mark_officer_notifications_read(officer):
+    """Marks the whole inbox read by moving the watermark; cost does not depend on backlog size"""
+    with transaction.atomic():
+        _move_watermark(officer.user, 'officer', timezone.now())
+        Officer.objects.filter(pk=officer.pk).update(unread_notifications=0)
+        _invalidate([officer_recent_key(officer.pk)])
+        _publish_on_commit([officer_channel(officer.pk)], 'unread', count=0)
+    officer.unread_notifications = 0
+
+
+def mark_citizen_notification_read(user, notification_id):
+    """Marks one notification read. Returns False if it does not belong to the user."""
+    with transaction.atomic():
+        notification = CitizenNotification.objects.filter(id=notification_id, user=user).first()
+        if notification is None:
+            return False
+        if is_unread(notification, read_at(user, 'citizen')):
+            CitizenNotification.objects.filter(pk=notification.pk).update(is_read=True)
+            User.objects.filter(pk=user.pk).update(
+                unread_notifications=Greatest(F('unread_notifications') - 1, Value(0))
+            )
+            _invalidate([citizen_recent_key(user.pk)])
+            _publish_on_commit([citizen_channel(user.pk)], 'read', id=notification.pk)
+    return True
+
+
+def mark_all_citizen_notifications_read(user):
+    with transaction.atomic():
+        _move_watermark(user, 'citizen', timezone.now())
+        User.objects.filter(pk=user.pk).update(unread_notifications=0)
+        _invalidate([citizen_recent_key(user.pk)])
+        _publish_on_commit([citizen_channel(user.pk)], 'unread', count=0)
+    user.unread_notifications = 0
+
+
+# ===================== Repair =====================
+def reconcile_unread_counts():
+    """Recomputes every unread counter from the notification tables. Returns rows fixed."""
+    fixed = 0
+    officers = Officer.objects.annotate(
+        actual=Count('notifications', filter=unread_q(
+            F('user__notification_watermark__officer_read_at'), prefix='notifications__'
+        ) | Q(notifications__is_read=False, user__notification_watermark__officer_read_at__isnull=True))
+    ).exclude(unread_notifications=F('actual'))
+    for officer in officers:
+        Officer.objects.filter(pk=officer.pk).update(unread_notifications=officer.actual)
+        cache.delete(officer_recent_key(officer.pk))
+        fixed += 1
+
+    users = User.objects.annotate(
+        actual=Count('notifications', filter=unread_q(
+            F('notification_watermark__citizen_read_at'), prefix='notifications__'
+        ) | Q(notifications__is_read=False, notification_watermark__citizen_read_at__isnull=True))
+    ).exclude(unread_notifications=F('actual'))
+    for user in users:
+        User.objects.filter(pk=user.pk).update(unread_notifications=user.actual)
+        cache.delete(citizen_recent_key(user.pk))
+        fixed += 1
+    return fixed
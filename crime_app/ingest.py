@@ -0,0 +1,359 @@
+import csv
+import io
+import json
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .counters import apply_delta
+from .dedup import check_duplicate
+from .heatmap import invalidate_point
+from .history import record_imported
+from .models import ArchivedCrimeReport, CrimeReport, Department, User
+from .search import index_reports
+
+CHUNK_SIZE = getattr(settings, 'IMPORT_CHUNK_SIZE', 1000)
+# Largest batch the import endpoint accepts in one request. The body must
+# also fit DATA_UPLOAD_MAX_MEMORY_SIZE (2.5 MB by default), which at a
+# couple of KB per report with a long description is about this many rows;
+# bigger loads go through the import_reports command.
+MAX_API_ROWS = getattr(settings, 'IMPORT_MAX_API_ROWS', 1000)
+# Imported reports filed this recently get what a new filing gets: duplicate
+# detection and heatmap invalidation. Older rows only reach cached heatmap
+# tiles once they expire (HEATMAP_TILE_TIMEOUT).
+LIVE_WINDOW = timedelta(days=30)
+
+# Same column names export_reports writes, so an export can be imported elsewhere
+TEXT_FIELDS = {'title': 200, 'description': None, 'location': 255, 'report_id': 12}
+REQUIRED_FIELDS = ('title', 'description', 'location', 'incident_type')
+
+
+def _choice_map(choices):
+    """Accepts a choice by its code or its label, in any case"""
+    lookup = {}
+    for code, label in choices:
+        lookup[label.upper()] = code
+        lookup[code.upper()] = code
+    return lookup
+
+
+INCIDENT_TYPES = _choice_map(CrimeReport.INCIDENT_TYPES)
+PRIORITIES = _choice_map(CrimeReport.PRIORITY_CHOICES)
+STATUSES = _choice_map(CrimeReport.STATUS_CHOICES)
+
+
+# ===================== Reading =====================
+def read_csv(file):
+    return csv.DictReader(file)
+
+
+def read_ndjson(file):
+    for line in file:
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # Validation reports it against the right row number
+                yield None
+
+
+READERS = {
+    'csv': read_csv,
+    'ndjson': read_ndjson,
+}
+
+
+def read_body(body, content_type):
+    """Rows from a request body: a JSON list (or {"reports": [...]}), CSV or NDJSON"""
+    if content_type == 'text/csv':
+        return list(read_csv(io.StringIO(body.decode('utf-8-sig'))))
+    if content_type == 'application/x-ndjson':
+        return list(read_ndjson(io.StringIO(body.decode('utf-8'))))
+    data = json.loads(body)
+    if isinstance(data, dict):
+        data = data.get('reports')
+    if not isinstance(data, list):
+        raise ValueError("Expected a list of reports or {\"reports\": [...]}")
+    return data
+
+
+# ===================== Validation =====================
+@dataclass
+class ImportResult:
+    imported: int = 0
+    # Rows whose report_id is already on file, e.g. from an interrupted run
+    skipped: int = 0
+    errors: list = field(default_factory=list)
+
+    @property
+    def failed(self):
+        return len(self.errors)
+
+    def add(self, other):
+        self.imported += other.imported
+        self.skipped += other.skipped
+        self.errors.extend(other.errors)
+
+
+def _column(rows, name):
+    return np.array([str(row.get(name) or '').strip() for row in rows], dtype=object)
+
+
+def _floats(values):
+    """Parses a column of strings; blanks become NaN. Returns (values, unparsable mask)."""
+    parsed = np.full(len(values), np.nan)
+    bad = np.zeros(len(values), dtype=bool)
+    for i, value in enumerate(values):
+        if value:
+            try:
+                parsed[i] = float(value)
+            except ValueError:
+                bad[i] = True
+    bad |= np.isinf(parsed)
+    return parsed, bad
+
+
+def _datetimes(values):
+    """Parses ISO dates and datetimes; naive ones are in the current time zone"""
+    parsed = np.full(len(values), None, dtype=object)
+    bad = np.zeros(len(values), dtype=bool)
+    for i, value in enumerate(values):
+        if not value:
+            continue
+        try:
+            moment = parse_datetime(value)
+            if moment is None:
+                day = parse_date(value)
+                moment = day and datetime.combine(day, time.min)
+        except ValueError:
+            moment = None
+        if moment is None:
+            bad[i] = True
+            continue
+        parsed[i] = timezone.make_aware(moment) if timezone.is_naive(moment) else moment
+    return parsed, bad
+
+
+def _lookup(values, mapping, default=None):
+    """Maps a column through a dict; blanks take the default, unknown values None"""
+    return np.array(
+        [mapping.get(value.upper()) if value else default for value in values], dtype=object
+    )
+
+
+class Importer:
+    """
+    Validates and writes reports a chunk at a time. Departments are loaded
+    into memory once and reporters are looked up by email once per distinct
+    address, so a chunk costs a fixed handful of queries however many rows
+    it has.
+    """
+
+    def __init__(self, dry_run=False):
+        self.dry_run = dry_run
+        departments = list(Department.objects.values_list('pk', 'name'))
+        self.department_ids = {pk for pk, _ in departments}
+        self.departments_by_name = {name.strip().upper(): pk for pk, name in departments}
+        self.reporters = {}
+
+    def _resolve_reporters(self, emails):
+        unseen = {email for email in emails if email and email not in self.reporters}
+        if unseen:
+            self.reporters.update(dict.fromkeys(unseen))
+            # Lowest id wins for duplicate addresses, as in EmailBackend
+            for pk, email in User.objects.filter(email__in=unseen).order_by('-pk').values_list('pk', 'email'):
+                self.reporters[email] = pk
+        return np.array([self.reporters.get(email) for email in emails], dtype=object)
+
+    def _resolve_departments(self, ids, names):
+        resolved = np.full(len(ids), None, dtype=object)
+        bad = np.zeros(len(ids), dtype=bool)
+        for i, (department_id, name) in enumerate(zip(ids, names)):
+            if department_id:
+                pk = int(department_id) if department_id.isdigit() else None
+                resolved[i] = pk if pk in self.department_ids else None
+            elif name:
+                resolved[i] = self.departments_by_name.get(name.upper())
+            bad[i] = bool(department_id or name) and resolved[i] is None
+        return resolved, bad
+
+    def validate(self, rows):
+        """
+        Checks a chunk column by column. Returns (columns, errors), where
+        errors holds the first problem found with each row, or None.
+        """
+        n = len(rows)
+        errors = np.full(n, None, dtype=object)
+
+        def flag(mask, message):
+            errors[mask & np.equal(errors, None)] = message
+
+        flag(np.array([not isinstance(row, dict) for row in rows], dtype=bool), "Not a report object")
+        rows = [row if isinstance(row, dict) else {} for row in rows]
+
+        columns = {name: _column(rows, name) for name in (*TEXT_FIELDS, 'incident_type', 'reporter_email')}
+        for name in REQUIRED_FIELDS:
+            flag(columns[name] == '', f"{name} is required")
+        for name, max_length in TEXT_FIELDS.items():
+            if max_length:
+                lengths = np.fromiter(map(len, columns[name]), dtype=np.int64, count=n)
+                flag(lengths > max_length, f"{name} is longer than {max_length} characters")
+
+        columns['incident_type'] = _lookup(columns['incident_type'], INCIDENT_TYPES)
+        flag(np.equal(columns['incident_type'], None), "Unknown incident_type")
+        columns['priority'] = _lookup(_column(rows, 'priority'), PRIORITIES, default='Medium')
+        flag(np.equal(columns['priority'], None), "Unknown priority")
+        columns['status'] = _lookup(_column(rows, 'status'), STATUSES, default='Pending')
+        flag(np.equal(columns['status'], None), "Unknown status")
+
+        latitude, bad_latitude = _floats(_column(rows, 'latitude'))
+        longitude, bad_longitude = _floats(_column(rows, 'longitude'))
+        flag(bad_latitude | bad_longitude, "latitude and longitude must be numbers")
+        flag(np.abs(latitude) > 90, "latitude is out of range")
+        flag(np.abs(longitude) > 180, "longitude is out of range")
+        flag(np.isnan(latitude) != np.isnan(longitude), "latitude and longitude go together")
+        columns['latitude'], columns['longitude'] = latitude, longitude
+
+        now = timezone.now()
+        reported, bad_reported = _datetimes(_column(rows, 'date_reported'))
+        updated, bad_updated = _datetimes(_column(rows, 'date_updated'))
+        flag(bad_reported | bad_updated, "Dates must be YYYY-MM-DD or ISO 8601")
+        reported[np.equal(reported, None)] = now
+        missing_updated = np.equal(updated, None)
+        updated[missing_updated] = reported[missing_updated]
+        flag(reported > now, "date_reported is in the future")
+        flag(updated < reported, "date_updated is before date_reported")
+        columns['date_reported'], columns['date_updated'] = reported, updated
+
+        columns['department_id'], bad_department = self._resolve_departments(
+            _column(rows, 'department_id'), _column(rows, 'department'),
+        )
+        flag(bad_department, "Unknown department")
+        emails = np.array([User.normalize_login_email(email) for email in columns.pop('reporter_email')], dtype=object)
+        columns['reporter_id'] = self._resolve_reporters(emails)
+        # A blank email imports the report without a reporter; a wrong one is a mistake
+        flag((emails != '') & np.equal(columns['reporter_id'], None), "Unknown reporter_email")
+
+        report_ids = columns['report_id']
+        given = report_ids != ''
+        _, first = np.unique(report_ids, return_index=True)
+        repeated = given.copy()
+        repeated[first] = False
+        flag(repeated, "report_id appears twice in the batch")
+        return columns, errors
+
+    # ===================== Writing =====================
+    def _existing_report_ids(self, report_ids):
+        report_ids = list(report_ids)
+        return set(
+            CrimeReport.objects.filter(report_id__in=report_ids).values_list('report_id', flat=True)
+        ) | set(
+            ArchivedCrimeReport.objects.filter(report_id__in=report_ids).values_list('report_id', flat=True)
+        )
+
+    def _new_report_ids(self, count, reserved):
+        """
+        `count` fresh report ids, checked against the database in one query
+        per round instead of one per row. A second round only happens on
+        a collision.
+        """
+        assigned = set()
+        while len(assigned) < count:
+            candidates = {CrimeReport.generate_report_id() for _ in range(count - len(assigned))}
+            candidates -= reserved | assigned
+            assigned |= candidates - self._existing_report_ids(candidates)
+        return list(assigned)
+
+    def import_chunk(self, rows, first_row=1):
+        """
+        Validates one chunk and writes its valid rows in a single
+        transaction. Rows are numbered from first_row in the errors.
+        """
+        columns, errors = self.validate(rows)
+        result = ImportResult()
+        report_ids = columns['report_id']
+        existing = self._existing_report_ids(set(report_ids[(report_ids != '') & np.equal(errors, None)]))
+        skip = np.array([report_id in existing for report_id in report_ids], dtype=bool)
+        result.skipped = int((skip & np.equal(errors, None)).sum())
+        valid = np.equal(errors, None) & ~skip
+        result.errors = [(first_row + int(i), errors[i]) for i in np.flatnonzero(~np.equal(errors, None))]
+
+        indexes = np.flatnonzero(valid)
+        if self.dry_run:
+            # What would have been imported
+            result.imported = len(indexes)
+            return result
+        if not len(indexes):
+            return result
+
+        fresh = iter(self._new_report_ids(int((report_ids[indexes] == '').sum()), set(report_ids)))
+        reports = []
+        for i in indexes:
+            latitude, longitude = columns['latitude'][i], columns['longitude'][i]
+            report = CrimeReport(
+                report_id=report_ids[i] or next(fresh),
+                reporter_id=columns['reporter_id'][i],
+                department_id=columns['department_id'][i],
+                title=columns['title'][i],
+                description=columns['description'][i],
+                location=columns['location'][i],
+                latitude=None if np.isnan(latitude) else float(latitude),
+                longitude=None if np.isnan(longitude) else float(longitude),
+                incident_type=columns['incident_type'][i],
+                priority=columns['priority'][i],
+                status=columns['status'][i],
+            )
+            report.geohash = report.compute_geohash()
+            reports.append(report)
+
+        with transaction.atomic():
+            CrimeReport.objects.bulk_create(reports, batch_size=500)
+            for report, i in zip(reports, indexes):
+                report.date_reported = columns['date_reported'][i]
+                report.date_updated = columns['date_updated'][i]
+            self._restore_dates(reports)
+            self._derive(reports)
+        result.imported = len(reports)
+        return result
+
+    def _restore_dates(self, reports):
+        """
+        bulk_create stamps both dates with now (auto_now_add, auto_now). One
+        prepared UPDATE puts the real ones back; bulk_update's CASE per row
+        costs more than the insert did.
+        """
+        adapt = connection.ops.adapt_datetimefield_value
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"UPDATE {CrimeReport._meta.db_table} SET date_reported = %s, date_updated = %s WHERE id = %s",
+                [(adapt(report.date_reported), adapt(report.date_updated), report.pk) for report in reports],
+            )
+
+    def _derive(self, reports):
+        """What CrimeReport's post_save handlers would have done, in bulk"""
+        for counter_key, count in Counter(report.get_counter_key() for report in reports).items():
+            apply_delta(counter_key, count)
+        record_imported(reports)
+        index_reports(reports)
+        since = timezone.now() - LIVE_WINDOW
+        for report in reports:
+            if report.date_reported >= since:
+                check_duplicate(report)
+                invalidate_point(report.latitude, report.longitude, report.incident_type, report.department_id)
+
+
+def chunked(rows, size=CHUNK_SIZE):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
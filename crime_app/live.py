@@ -0,0 +1,205 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import LiveEvent
+
+logger = logging.getLogger(__name__)
+
+QUEUE_SIZE = 50
+# How often each serving process looks for events published elsewhere
+POLL_SECONDS = getattr(settings, 'LIVE_POLL_SECONDS', 0.5)
+# Published events older than this are deleted; a client that was away
+# longer catches up from the unread count it gets on reconnect
+EVENT_TTL = timedelta(minutes=5)
+
+
+class InProcessBroker:
+    """
+    Fans events out to SSE connections served by this process.
+
+    Publishing is safe from any thread (sync views run in worker threads
+    under ASGI); delivery hops onto each subscriber's event loop. Events
+    published in another process (e.g. a separate run_outbox worker) are not
+    seen, so this only suits a single process that both writes and serves
+    the stream; the default is DatabaseBroker.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        subscriber = (loop, queue)
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(subscriber)
+        try:
+            yield queue
+        finally:
+            with self._lock:
+                subscribers = self._subscribers.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscriber)
+                    if not subscribers:
+                        del self._subscribers[channel]
+
+    def publish(self, channel, event):
+        self._fan_out(channel, event)
+
+    def publish_many(self, channels, event):
+        for channel in channels:
+            self.publish(channel, event)
+
+    def _fan_out(self, channel, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(_offer, queue, event)
+            except RuntimeError:
+                # Subscriber's loop already closed; it unsubscribes on its own
+                pass
+
+    def subscriber_count(self, channel=None):
+        with self._lock:
+            if channel is not None:
+                return len(self._subscribers.get(channel, ()))
+            return sum(len(s) for s in self._subscribers.values())
+
+
+class DatabaseBroker(InProcessBroker):
+    """
+    Carries events between processes through the LiveEvent table, so an
+    event published by run_outbox or import_reports reaches streams served
+    by any web process. publish() inserts a row; in each process with open
+    streams a single poller thread reads the rows past its last id and fans
+    them out to that process's subscribers, so the polling cost grows with
+    processes, not connections.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._poller = None
+        self._pruned_at = 0
+
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        async with super().subscribe(channel) as queue:
+            self._ensure_poller()
+            yield queue
+
+    def publish(self, channel, event):
+        self.publish_many([channel], event)
+
+    def publish_many(self, channels, event):
+        """One INSERT for the whole fan-out, however many channels"""
+        LiveEvent.objects.bulk_create([LiveEvent(channel=channel, payload=event) for channel in channels])
+        if time.monotonic() - self._pruned_at > EVENT_TTL.total_seconds() / 5:
+            self._pruned_at = time.monotonic()
+            LiveEvent.objects.filter(created_at__lt=timezone.now() - EVENT_TTL).delete()
+
+    def _ensure_poller(self):
+        with self._lock:
+            if self._poller is None:
+                self._poller = threading.Thread(target=self._poll, name='live-events', daemon=True)
+                self._poller.start()
+
+    def _poll(self):
+        last_id = None
+        try:
+            while True:
+                with self._lock:
+                    # Decided under the lock so a new subscriber either sees
+                    # this poller still running or starts the next one
+                    if not self._subscribers:
+                        self._poller = None
+                        return
+                try:
+                    if last_id is None:
+                        last_id = LiveEvent.objects.aggregate(last=Max('pk'))['last'] or 0
+                    events = LiveEvent.objects.filter(pk__gt=last_id).order_by('pk')
+                    for pk, channel, payload in events.values_list('pk', 'channel', 'payload'):
+                        last_id = pk
+                        self._fan_out(channel, payload)
+                except DatabaseError:
+                    logger.exception("Polling live events failed")
+                    connection.close()
+                time.sleep(POLL_SECONDS)
+        finally:
+            with self._lock:
+                if self._poller is threading.current_thread():
+                    self._poller = None
+            connection.close()
+
+
+def _offer(queue, event):
+    """Enqueue without blocking; a slow client loses its oldest events, not the newest"""
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(event)
+
+
+_broker = None
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        _broker = import_string(getattr(settings, 'LIVE_BROKER', 'crime_app.live.DatabaseBroker'))()
+    return _broker
+
+
+def officer_channel(officer_id):
+    return f"officer:{officer_id}"
+
+
+def citizen_channel(user_id):
+    return f"citizen:{user_id}"
+
+
+def publish(channel, event_type, **data):
+    get_broker().publish(channel, {'type': event_type, **data})
+
+
+def publish_many(channels, event_type, **data):
+    """Sends the same event to several channels, e.g. every officer of a department"""
+    get_broker().publish_many(channels, {'type': event_type, **data})
+
+
+def format_sse(event):
+    """Serializes one event in text/event-stream framing"""
+    return f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+HEARTBEAT_SECONDS = 20
+
+
+async def event_stream(channel, initial_events=()):
+    """
+    Async generator feeding a StreamingHttpResponse. Each idle connection is
+    just a suspended coroutine waiting on its queue, so thousands stay cheap.
+    """
+    async with get_broker().subscribe(channel) as queue:
+        yield "retry: 5000\n\n"
+        for event in initial_events:
+            yield format_sse(event)
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield format_sse(event)
@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from crime_app.archive import ARCHIVE_AFTER_DAYS, BATCH_SIZE, archivable, archive_batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Move Resolved and Dismissed reports untouched for --days into the archive tables, "
+        "with their citizen notifications, in small transactions"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=ARCHIVE_AFTER_DAYS)
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            '--pause', type=float, default=0.05,
+            help="Seconds to sleep between batches, letting other writers in",
+        )
+        parser.add_argument('--dry-run', action='store_true', help="Only count the reports that would move")
+
+    def handle(self, *args, **options):
+        if options['days'] < 0:
+            raise CommandError("--days must not be negative")
+        if options['dry_run']:
+            count = archivable(options['days']).count()
+            self.stdout.write(f"{count} reports (plus their duplicates) would be archived.")
+            return
+
+        batch_size = max(1, options['batch_size'])
+        reports = notifications = 0
+        while True:
+            # Each batch commits on its own, so an interrupted run can simply be restarted
+            ids = list(archivable(options['days']).order_by('pk').values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                break
+            moved, moved_notifications = archive_batch(ids)
+            reports += moved
+            notifications += moved_notifications
+            self.stdout.write(f"Archived {reports} reports so far")
+            if len(ids) < batch_size:
+                break
+            time.sleep(options['pause'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {reports} reports and {notifications} citizen notifications."
+        ))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from crime_app.models import CrimeReport
+
+
+class Command(BaseCommand):
+    help = "Fill or repair the geohash cell of every crime report from its coordinates"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        reports = CrimeReport.objects.only('latitude', 'longitude', 'geohash').order_by('pk')
+        # Written with bulk_update, so save() signals (counters, search index) are not re-run
+        updated = 0
+        last_pk = 0
+        while True:
+            batch = list(reports.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            stale = []
+            for report in batch:
+                geohash = report.compute_geohash()
+                if report.geohash != geohash:
+                    report.geohash = geohash
+                    stale.append(report)
+            CrimeReport.objects.bulk_update(stale, ['geohash'], batch_size=500)
+            updated += len(stale)
+        self.stdout.write(self.style.SUCCESS(f"Updated the geohash of {updated} crime reports."))
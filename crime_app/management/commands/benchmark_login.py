@@ -0,0 +1,68 @@
+import time
+import uuid
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from crime_app.models import User
+
+
+class Command(BaseCommand):
+    help = "Measure CPU time, password hashes and queries per login request"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=10, help="Logins per scenario")
+
+    def handle(self, *args, **options):
+        iterations = max(1, options['iterations'])
+        hasher = get_hasher()
+        hashes = [0]
+        encode = hasher.encode
+
+        def counting_encode(*args, **kwargs):
+            hashes[0] += 1
+            return encode(*args, **kwargs)
+
+        hosts = [h for h in settings.ALLOWED_HOSTS if h not in ('*', '') and not h.startswith('.')]
+        client = Client(HTTP_HOST=hosts[0] if hosts else 'localhost')
+        url = reverse('my-login')
+        email = f"benchmark-{uuid.uuid4().hex[:12]}@example.com"
+        password = uuid.uuid4().hex
+
+        self.stdout.write(f"Hasher: {hasher.algorithm}, {getattr(hasher, 'iterations', '-')} iterations")
+        self.stdout.write(f"{'scenario':<16}{'cpu ms':>10}{'wall ms':>10}{'hashes':>8}{'queries':>9}")
+        # Everything, including the throwaway user and its sessions, is rolled back
+        with transaction.atomic():
+            User.objects.create_user(username=email, email=email, password=password)
+            scenarios = (
+                ('success', email.upper(), password),
+                ('wrong password', email, 'not-' + password),
+                ('unknown email', 'nobody-' + email, password),
+            )
+            hasher.encode = counting_encode
+            try:
+                for label, login_email, login_password in scenarios:
+                    cpu = wall = 0.0
+                    hashes[0] = queries = 0
+                    for _ in range(iterations):
+                        client.cookies.clear()
+                        with CaptureQueriesContext(connection) as captured:
+                            started_cpu, started_wall = time.process_time(), time.perf_counter()
+                            response = client.post(url, {'email': login_email, 'password': login_password})
+                            cpu += time.process_time() - started_cpu
+                            wall += time.perf_counter() - started_wall
+                        queries += len(captured)
+                    if label == 'success' and response.status_code != 302:
+                        self.stderr.write(f"Login did not succeed (status {response.status_code})")
+                    self.stdout.write(
+                        f"{label:<16}{cpu / iterations * 1000:>10.1f}{wall / iterations * 1000:>10.1f}"
+                        f"{hashes[0] / iterations:>8.1f}{queries / iterations:>9.1f}"
+                    )
+            finally:
+                del hasher.encode
+            transaction.set_rollback(True)
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from crime_app.snapshot import build_snapshot
+
+
+class Command(BaseCommand):
+    help = "Append new and changed crime reports to the memory-mapped analytics snapshot"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help="Rebuild from scratch (drops deleted reports)")
+        parser.add_argument('--dir', help="Snapshot directory (default: settings.ANALYTICS_SNAPSHOT_DIR)")
+
+    def handle(self, *args, **options):
+        appended, refreshed = build_snapshot(options['dir'], full=options['full'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Snapshot updated: {appended} reports appended, {refreshed} refreshed."
+        ))
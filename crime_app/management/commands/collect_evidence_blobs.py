@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from crime_app.blobs import GC_GRACE_SECONDS, collect_garbage, recount_references
+
+
+class Command(BaseCommand):
+    help = "Recount evidence blob references and delete blobs no report uses any more"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hours', type=int, default=GC_GRACE_SECONDS // 3600,
+            help="Only delete unreferenced blobs older than this",
+        )
+        parser.add_argument('--dry-run', action='store_true', help="Report what would be deleted without deleting")
+
+    def handle(self, *args, **options):
+        # Counts are kept by signals; recounting first means drift can never delete a live blob
+        repaired = recount_references()
+        if repaired:
+            self.stdout.write(self.style.WARNING(f"Repaired {repaired} blob reference counts."))
+
+        removed, freed = collect_garbage(options['hours'] * 3600, dry_run=options['dry_run'])
+        verb = "Would delete" if options['dry_run'] else "Deleted"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {removed} unreferenced blobs ({freed / (1024 * 1024):.1f} MiB)."
+        ))
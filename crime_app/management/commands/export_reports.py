@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from crime_app.export import FORMATS, export_querysets, export_rows
+
+
+class Command(BaseCommand):
+    help = "Stream crime reports with reporter and department fields as CSV or NDJSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=sorted(FORMATS), default='csv')
+        parser.add_argument('--output', '-o', help="File to write (default: stdout)")
+        parser.add_argument('--from', dest='date_from', help="First reported date, YYYY-MM-DD")
+        parser.add_argument('--to', dest='date_to', help="Last reported date, YYYY-MM-DD")
+        parser.add_argument('--status')
+        parser.add_argument('--department', help="Department id")
+        parser.add_argument('--archived', action='store_true', help="Also export archived reports")
+
+    def handle(self, *args, **options):
+        try:
+            querysets = export_querysets(
+                date_from=options['date_from'],
+                date_to=options['date_to'],
+                status=options['status'],
+                department=options['department'],
+                include_archived=options['archived'],
+            )
+        except ValueError as e:
+            raise CommandError(e)
+
+        lines, _ = FORMATS[options['format']]
+        rows = export_rows(querysets)
+        if not options['output']:
+            for line in lines(rows):
+                self.stdout.write(line, ending='')
+            return
+        with open(options['output'], 'w', newline='', encoding='utf-8') as out:
+            out.writelines(lines(rows))
@@ -0,0 +1,38 @@
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from crime_app.models import CrimeReport, Officer
+from crime_app.thumbnails import get_pool, missing_targets, render_derivatives
+
+
+class Command(BaseCommand):
+    help = "Generate missing thumbnails for evidence images and officer photos"
+
+    def handle(self, *args, **options):
+        names = set(
+            CrimeReport.objects.exclude(evidence_image='').exclude(evidence_image__isnull=True)
+            .values_list('evidence_image', flat=True)
+        ) | set(
+            Officer.objects.exclude(profile_picture='').exclude(profile_picture__isnull=True)
+            .values_list('profile_picture', flat=True)
+        )
+        jobs = []
+        for name in sorted(names):
+            if not default_storage.exists(name):
+                continue
+            targets = missing_targets(name)
+            if targets:
+                jobs.append((default_storage.path(name), targets))
+
+        written = failed = 0
+        pool = get_pool()
+        futures = {pool.submit(render_derivatives, source, targets): source for source, targets in jobs}
+        for future, source in futures.items():
+            try:
+                written += len(future.result())
+            except Exception as e:
+                failed += 1
+                self.stderr.write(f"{source}: {e}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {written} thumbnails for {len(jobs) - failed} images ({failed} failed)."
+        ))
@@ -0,0 +1,108 @@
+import csv
+import itertools
+import json
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from crime_app.ingest import CHUNK_SIZE, READERS, Importer, ImportResult, chunked
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-load crime reports from a CSV or NDJSON file with the columns export_reports writes. "
+        "Each chunk is validated together and committed in its own transaction; progress is saved "
+        "after every chunk so an interrupted import can --resume."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=sorted(READERS), help="Default: from the file extension")
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+        parser.add_argument('--progress', help="Progress file (default: <path>.progress.json)")
+        parser.add_argument('--resume', action='store_true', help="Continue after the last committed chunk")
+        parser.add_argument('--restart', action='store_true', help="Ignore saved progress and start over")
+        parser.add_argument('--errors', help="Write rejected rows to this CSV file")
+        parser.add_argument('--dry-run', action='store_true', help="Validate only; write nothing")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or os.path.splitext(path)[1].lstrip('.').lower()
+        if fmt not in READERS:
+            raise CommandError(f"Cannot tell the format of {path}; pass --format")
+        chunk_size = max(1, options['chunk_size'])
+        progress_path = options['progress'] or f"{path}.progress.json"
+        dry_run = options['dry_run']
+
+        progress = self._load_progress(progress_path)
+        if progress and not (options['resume'] or options['restart'] or dry_run):
+            # Rows without a report_id would be imported twice
+            state = "a finished import" if progress['done'] else f"an unfinished import at row {progress['rows']}"
+            raise CommandError(
+                f"{progress_path} records {state}; pass --resume to continue or --restart to start over"
+            )
+        start = progress['rows'] if progress and options['resume'] else 0
+        total, rejected_before = ImportResult(), 0
+        if start:
+            total.imported, total.skipped = progress['imported'], progress['skipped']
+            rejected_before = progress['rejected']
+            self.stdout.write(f"Resuming after row {start}")
+
+        importer = Importer(dry_run=dry_run)
+        errors_file = None
+        if options['errors']:
+            errors_file = open(options['errors'], 'a' if start else 'w', newline='', encoding='utf-8')
+        try:
+            errors = csv.writer(errors_file) if errors_file else None
+            if errors and not start:
+                errors.writerow(['row', 'message'])
+            started = time.perf_counter()
+            with open(path, newline='', encoding='utf-8-sig') as source:
+                rows = itertools.islice(READERS[fmt](source), start, None)
+                done = start
+                for chunk in chunked(rows, chunk_size):
+                    result = importer.import_chunk(chunk, first_row=done + 1)
+                    done += len(chunk)
+                    total.add(result)
+                    rejected = rejected_before + total.failed
+                    if errors:
+                        errors.writerows(result.errors)
+                    if not dry_run:
+                        # The chunk has committed, so a restart can pick up after it
+                        self._save_progress(progress_path, done, total, rejected)
+                    elapsed = time.perf_counter() - started
+                    self.stdout.write(
+                        f"Row {done}: {total.imported} imported, {total.skipped} already present, "
+                        f"{rejected} rejected ({(done - start) / elapsed:.0f} rows/s)"
+                    )
+            if not dry_run:
+                self._save_progress(progress_path, done, total, rejected_before + total.failed, finished=True)
+        finally:
+            if errors_file:
+                errors_file.close()
+
+        if not errors_file:
+            for row, message in total.errors[:20]:
+                self.stderr.write(f"Row {row}: {message}")
+        rejected = rejected_before + total.failed
+        verb = "Would import" if dry_run else "Imported"
+        summary = f"{verb} {total.imported} reports; {total.skipped} already present, {rejected} rejected."
+        self.stdout.write(self.style.WARNING(summary) if rejected else self.style.SUCCESS(summary))
+
+    def _load_progress(self, path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _save_progress(self, path, rows, total, rejected, finished=False):
+        state = {
+            'rows': rows, 'imported': total.imported, 'skipped': total.skipped,
+            'rejected': rejected, 'done': finished,
+        }
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp, path)
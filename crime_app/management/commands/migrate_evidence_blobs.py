@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from crime_app.blobs import migrate_legacy_evidence
+
+
+class Command(BaseCommand):
+    help = "Move evidence files stored under dated upload paths into the content-addressed blob store"
+
+    def handle(self, *args, **options):
+        moved = migrate_legacy_evidence()
+        self.stdout.write(self.style.SUCCESS(f"Moved {moved} evidence files into the blob store."))
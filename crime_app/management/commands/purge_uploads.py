@@ -0,0 +1,16 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from crime_app.uploads import purge_stale_uploads
+
+
+class Command(BaseCommand):
+    help = "Abort chunked evidence uploads that were abandoned and delete their staged files"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=48, help="Idle time before an upload counts as abandoned")
+
+    def handle(self, *args, **options):
+        purged = purge_stale_uploads(timedelta(hours=options['hours']))
+        self.stdout.write(self.style.SUCCESS(f"Purged {purged} abandoned uploads."))
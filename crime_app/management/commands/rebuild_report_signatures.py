@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from crime_app import minhash
+from crime_app.dedup import index_signature, report_text
+from crime_app.models import CrimeReport
+
+
+class Command(BaseCommand):
+    help = "Compute duplicate-detection signatures for reports that do not have one yet"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help="Re-sign every report, not just unsigned ones")
+
+    def handle(self, *args, **options):
+        reports = CrimeReport.objects.only('id', 'title', 'description').order_by('pk')
+        if not options['all']:
+            reports = reports.filter(text_signature__isnull=True)
+        # Existing reports are only signed, never linked retroactively
+        signed = 0
+        for report in reports.iterator(chunk_size=500):
+            sig = minhash.signature(report_text(report))
+            if sig is not None:
+                index_signature(report, sig)
+                signed += 1
+        self.stdout.write(self.style.SUCCESS(f"Signed {signed} crime reports."))
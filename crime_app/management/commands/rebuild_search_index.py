@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from crime_app.search import fts_enabled, rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index for crime reports"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        if not fts_enabled():
+            raise CommandError("Full-text search requires the SQLite backend.")
+        total = rebuild_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} crime reports."))
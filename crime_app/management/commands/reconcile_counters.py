@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from crime_app.counters import reconcile_counters
+from crime_app.inbox import reconcile_unread_counts
+
+
+class Command(BaseCommand):
+    help = "Recompute the materialized report and unread-notification counters and repair any drift"
+
+    def handle(self, *args, **options):
+        repaired = reconcile_counters()
+        if repaired:
+            self.stdout.write(self.style.WARNING(f"Repaired {repaired} report counter rows."))
+        else:
+            self.stdout.write(self.style.SUCCESS("Report counters are in sync."))
+
+        repaired = reconcile_unread_counts()
+        if repaired:
+            self.stdout.write(self.style.WARNING(f"Repaired {repaired} unread notification counters."))
+        else:
+            self.stdout.write(self.style.SUCCESS("Unread notification counters are in sync."))
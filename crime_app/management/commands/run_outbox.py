@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from crime_app import outbox
+
+
+class Command(BaseCommand):
+    help = "Deliver queued notifications and other side effects from the outbox"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=outbox.BATCH_SIZE)
+        parser.add_argument('--sleep', type=float, default=1.0,
+                            help="Seconds to wait when the outbox is empty")
+        parser.add_argument('--once', action='store_true',
+                            help="Drain everything that is due, then exit")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        self.stdout.write("Outbox worker started.")
+        try:
+            while True:
+                delivered, failed = outbox.drain(batch_size)
+                if delivered or failed:
+                    self.stdout.write(f"Delivered {delivered}, failed {failed}.")
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS("Outbox worker stopped."))
@@ -0,0 +1,169 @@
+import multiprocessing
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections, transaction
+
+from crime_app.inbox import mark_all_citizen_notifications_read, reconcile_unread_counts
+from crime_app.models import CrimeReport, Department, Notification, OutboxMessage, User
+from crime_app.outbox import drain, queue_citizen_notification, queue_officer_notification
+from crime_app.writequeue import coalesced
+
+INCIDENT_TYPES = [code for code, _ in CrimeReport.INCIDENT_TYPES if code != 'CR-TEMP']
+WORDS = "broken window parked car stolen bag shouting late night alley shop entrance phone wallet bicycle".split()
+
+
+def submit_report(prefix, user, departments, i):
+    """
+    One citizen submission the way user_report makes it, plus a mark-read
+    write. Returns (seconds, error message or None, outbox message ids).
+    """
+    started = time.perf_counter()
+    try:
+        report = CrimeReport(
+            reporter=user,
+            department_id=random.choice(departments),
+            title=f"{prefix} report {i}",
+            description=' '.join(random.choices(WORDS, k=12)) + f" {uuid.uuid4().hex}",
+            location=f"Stress Street {i}",
+            latitude=6.5 + random.uniform(-0.2, 0.2),
+            longitude=3.4 + random.uniform(-0.2, 0.2),
+            incident_type=random.choice(INCIDENT_TYPES),
+        )
+        with transaction.atomic():
+            report.save()
+            messages = [
+                queue_officer_notification(report.department_id, f"{prefix} New report {report.id}"),
+                queue_citizen_notification(user, f"{prefix} Received", f"Report {report.id} received"),
+            ]
+        coalesced(mark_all_citizen_notifications_read, user)
+        return time.perf_counter() - started, None, [m.pk for m in messages if m is not None]
+    except Exception as e:
+        return time.perf_counter() - started, f"{type(e).__name__}: {e}", []
+    finally:
+        # Like a request, each submission opens and closes its own connection
+        connection.close()
+
+
+def run_share(prefix, user_id, departments, indexes, rate, threads):
+    """Submits reports `indexes` at `rate` per second from a pool of threads"""
+    user = User.objects.get(pk=user_id)
+    connection.close()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        futures = []
+        for n, i in enumerate(indexes):
+            delay = started + n / rate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            futures.append(pool.submit(submit_report, prefix, user, departments, i))
+        return [future.result() for future in futures]
+
+
+class Command(BaseCommand):
+    help = (
+        "Submit reports from several processes and threads at a target rate, with notification "
+        "fan-out and mark-read writes alongside, and fail if any write hits 'database is locked' "
+        "or the target rate is not reached. "
+        "Writes to the configured database and removes its rows afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rate', type=float, default=30, help="Report submissions per second, in total")
+        parser.add_argument('--duration', type=float, default=10, help="Seconds to keep submitting")
+        parser.add_argument(
+            '--processes', type=int, default=4,
+            help="Submitting processes, like web workers; SQLite locks are contended across processes",
+        )
+        parser.add_argument('--threads', type=int, default=8, help="Concurrent submissions per process")
+        parser.add_argument('--keep', action='store_true', help="Keep the reports and notifications it created")
+
+    def handle(self, *args, **options):
+        rate, duration = options['rate'], options['duration']
+        processes, threads = options['processes'], options['threads']
+        if rate <= 0 or duration <= 0 or processes < 1 or threads < 1:
+            raise CommandError("--rate, --duration, --processes and --threads must be positive")
+
+        run = uuid.uuid4().hex[:8]
+        prefix = f"[stress {run}]"
+        departments = list(Department.objects.values_list('pk', flat=True)) or [None]
+        user = User.objects.create_user(username=f"stress-{run}@example.com", email=f"stress-{run}@example.com")
+        total = int(rate * duration)
+        shares = [
+            (prefix, user.pk, departments, list(range(p, total, processes)), rate / processes, threads)
+            for p in range(processes)
+        ]
+
+        # Children must not inherit an open connection
+        connections.close_all()
+        stop = threading.Event()
+        outbox_errors = []
+        started = time.perf_counter()
+        if processes == 1:
+            outbox = self._start_outbox(stop, outbox_errors)
+            results = run_share(*shares[0])
+        else:
+            # Fork so children share this process's settings without re-reading them
+            with multiprocessing.get_context('fork').Pool(processes) as pool:
+                pending = pool.starmap_async(run_share, shares)
+                # Deliver notifications concurrently, the way the run_outbox worker does
+                outbox = self._start_outbox(stop, outbox_errors)
+                results = [result for share in pending.get() for result in share]
+        elapsed = time.perf_counter() - started
+        stop.set()
+        outbox.join()
+
+        latencies = sorted(seconds for seconds, _, _ in results)
+        errors = [error for _, error, _ in results if error] + outbox_errors
+        locked = [error for error in errors if 'locked' in error]
+        percentile = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+        self.stdout.write(
+            f"Submitted {total} reports in {elapsed:.1f}s ({total / elapsed:.1f}/s, target {rate:g}/s) "
+            f"from {processes} processes x {threads} threads"
+        )
+        self.stdout.write(
+            f"Latency ms: p50 {percentile(0.5):.1f}, p95 {percentile(0.95):.1f}, "
+            f"p99 {percentile(0.99):.1f}, max {latencies[-1] * 1000:.1f}"
+        )
+        self.stdout.write(f"Notifications delivered: {Notification.objects.filter(message__startswith=prefix).count()}")
+
+        if not options['keep']:
+            message_ids = [pk for _, _, ids in results for pk in ids]
+            CrimeReport.objects.filter(reporter=user).delete()
+            Notification.objects.filter(message__startswith=prefix).delete()
+            OutboxMessage.objects.filter(pk__in=message_ids).delete()
+            user.delete()
+            reconcile_unread_counts()
+
+        if locked:
+            raise CommandError(f"{len(locked)} writes failed with 'database is locked', e.g. {locked[0]}")
+        if errors:
+            raise CommandError(f"{len(errors)} writes failed, e.g. {errors[0]}")
+        if total / elapsed < rate * 0.9:
+            # Report saves are CPU-bound (signals, dedup), so the target may need more processes
+            raise CommandError(
+                f"Target rate not reached ({total / elapsed:.1f}/s of {rate:g}/s); add --processes or lower --rate"
+            )
+        self.stdout.write(self.style.SUCCESS("Target rate reached; no write failed with 'database is locked'."))
+
+    def _start_outbox(self, stop, errors):
+        def run():
+            try:
+                while True:
+                    delivered, _ = drain()
+                    if not delivered:
+                        if stop.is_set():
+                            return
+                        time.sleep(0.05)
+            except OperationalError as e:
+                errors.append(f"outbox: {e}")
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        return thread
@@ -0,0 +1,31 @@
+import sqlite3
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from crime_app.routers import REPLICA, replica_configured
+
+
+class Command(BaseCommand):
+    help = "Copy the primary SQLite database onto the local SQLite stand-in for the read replica"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, default=1024, help="Pages copied per step; writers get in between steps")
+
+    def handle(self, *args, **options):
+        if not replica_configured():
+            raise CommandError(f"No '{REPLICA}' database is configured.")
+        primary, replica = connections['default'], connections[REPLICA]
+        if primary.vendor != 'sqlite' or replica.vendor != 'sqlite':
+            raise CommandError("Only SQLite stand-ins can be synced; a real replica is kept current by its server.")
+
+        replica.close()
+        source = sqlite3.connect(primary.settings_dict['NAME'])
+        target = sqlite3.connect(replica.settings_dict['NAME'])
+        try:
+            # The online backup API copies a consistent snapshot without locking writers out for the whole copy
+            source.backup(target, pages=max(1, options['pages']))
+        finally:
+            target.close()
+            source.close()
+        self.stdout.write(self.style.SUCCESS(f"Copied the primary database to '{REPLICA}'."))
@@ -0,0 +1,138 @@
+import time
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject
+
+from .models import User
+
+PRINCIPAL_SESSION_KEY = '_principal'
+# How long a session trusts its cached role and department before re-reading them,
+# which bounds how long a demotion or department move takes to apply
+PRINCIPAL_TTL = getattr(settings, 'PRINCIPAL_SESSION_TTL', 300)
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    Who is making the request, resolved once per request. The role and ids
+    usually come from the session; the user, officer and department rows
+    are only loaded when something reads them.
+    """
+    user_id: Optional[int] = None
+    role: str = 'anonymous'
+    officer_id: Optional[int] = None
+    department_id: Optional[int] = None
+    load_user: Optional[Callable] = field(default=None, repr=False, compare=False)
+
+    @property
+    def is_authenticated(self):
+        return self.user_id is not None
+
+    @property
+    def is_admin(self):
+        return self.role == 'admin'
+
+    @property
+    def is_officer(self):
+        return self.officer_id is not None
+
+    @property
+    def is_citizen(self):
+        return self.role == 'citizen'
+
+    @cached_property
+    def user(self):
+        return self.load_user() if self.user_id is not None and self.load_user else None
+
+    @cached_property
+    def officer(self):
+        return getattr(self.user, 'officer', None) if self.officer_id is not None else None
+
+    @cached_property
+    def department(self):
+        return self.officer.department if self.officer else None
+
+
+def _role(user, officer):
+    if user.is_superuser or user.role == 'admin':
+        return 'admin'
+    if officer is not None:
+        return 'officer'
+    return 'citizen'
+
+
+def _user_loader(request):
+    def load():
+        user = request.user
+        if not user.is_authenticated:
+            return None
+        # EmailBackend.get_user already joins officer and department; sessions
+        # created through another backend get one joined reload instead of lazy lookups
+        if 'officer' not in user._state.fields_cache:
+            user = User.objects.select_related('officer__department', 'notification_watermark').get(pk=user.pk)
+            request.user = user
+        return user
+    return load
+
+
+def load_principal(request):
+    load_user = _user_loader(request)
+    session = getattr(request, 'session', None)
+    # Authentication itself is never cached: request.user re-checks that the
+    # user still exists, is active and has the same password hash
+    user = request.user
+    if not (user.is_authenticated and user.is_active):
+        if session is not None:
+            session.pop(PRINCIPAL_SESSION_KEY, None)
+        return Principal()
+
+    cached = session.get(PRINCIPAL_SESSION_KEY) if session is not None else None
+    if (
+        cached
+        and cached['user_id'] == user.pk
+        and time.time() - cached['at'] < PRINCIPAL_TTL
+    ):
+        return Principal(
+            user_id=cached['user_id'],
+            role=cached['role'],
+            officer_id=cached['officer_id'],
+            department_id=cached['department_id'],
+            load_user=load_user,
+        )
+
+    user = load_user()
+    officer = getattr(user, 'officer', None)
+    principal = Principal(
+        user_id=user.pk,
+        role=_role(user, officer),
+        officer_id=officer.pk if officer else None,
+        department_id=officer.department_id if officer else None,
+        load_user=load_user,
+    )
+    if session is not None:
+        session[PRINCIPAL_SESSION_KEY] = {
+            'user_id': principal.user_id,
+            'role': principal.role,
+            'officer_id': principal.officer_id,
+            'department_id': principal.department_id,
+            'at': int(time.time()),
+        }
+    return principal
+
+
+class PrincipalMiddleware:
+    """
+    Exposes request.principal. The user is authenticated on every request
+    as usual (EmailBackend.get_user joins the officer and department into
+    that one query); role and department ids are then answered from the
+    session (see PRINCIPAL_TTL). Must come after AuthenticationMiddleware.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.principal = SimpleLazyObject(lambda: load_principal(request))
+        return self.get_response(request)
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crime_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='crimereport',
+            index=models.Index(fields=['date_reported', 'id'], name='crime_app_c_date_re_9ad1c9_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+from django.db import migrations
+
+
+def create_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS crime_app_crimereport_fts USING fts5("
+        "report_id, title, description, location, incident_type, status, "
+        "department_id UNINDEXED, "
+        "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    )
+    schema_editor.execute(
+        "INSERT INTO crime_app_crimereport_fts "
+        "(rowid, report_id, title, description, location, incident_type, status, department_id) "
+        "SELECT id, report_id, title, description, location, incident_type, status, department_id "
+        "FROM crime_app_crimereport"
+    )
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS crime_app_crimereport_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crime_app', '0002_crimereport_date_reported_id_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:43
+
+from collections import Counter
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_counters(apps, schema_editor):
+    CrimeReport = apps.get_model('crime_app', 'CrimeReport')
+    ReportCounter = apps.get_model('crime_app', 'ReportCounter')
+    ALL, NONE = -1, 0
+
+    totals = Counter()
+    rows = (
+        CrimeReport.objects.order_by()
+        .values('department_id', 'reporter_id', 'status', 'priority')
+        .annotate(total=Count('id'))
+    )
+    for row in rows:
+        department_key = row['department_id'] or NONE
+        reporter_key = row['reporter_id'] or NONE
+        grains = {(department_key, reporter_key), (department_key, ALL), (ALL, reporter_key), (ALL, ALL)}
+        for grain in grains:
+            totals[grain + (row['status'], row['priority'])] += row['total']
+
+    ReportCounter.objects.bulk_create([
+        ReportCounter(department_key=d, reporter_key=r, status=s, priority=p, count=total)
+        for (d, r, s, p), total in totals.items()
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crime_app', '0003_crimereport_fts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('department_key', models.BigIntegerField()),
+                ('reporter_key', models.BigIntegerField()),
+                ('status', models.CharField(choices=[('Pending', 'Pending'), ('Investigating', 'Investigating'), ('Resolved', 'Resolved'), ('Dismissed', 'Dismissed')], max_length=20)),
+                ('priority', models.CharField(choices=[('Low', 'Low'), ('Medium', 'Medium'), ('High', 'High'), ('Emergency', 'Emergency')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('department_key', 'reporter_key', 'status', 'priority'), name='unique_report_counter')],
+            },
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:46
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_unread_counts(apps, schema_editor):
+    Officer = apps.get_model('crime_app', 'Officer')
+    User = apps.get_model('crime_app', 'User')
+    officers = Officer.objects.annotate(unread=Count('notifications', filter=Q(notifications__is_read=False)))
+    for officer in officers.filter(unread__gt=0):
+        Officer.objects.filter(pk=officer.pk).update(unread_notifications=officer.unread)
+    users = User.objects.annotate(unread=Count('notifications', filter=Q(notifications__is_read=False)))
+    for user in users.filter(unread__gt=0):
+        User.objects.filter(pk=user.pk).update(unread_notifications=user.unread)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crime_app', '0005_outboxmessage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='officer',
+            name='unread_notifications',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='unread_notifications',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_unread_counts, migrations.RunPython.noop),
+    ]
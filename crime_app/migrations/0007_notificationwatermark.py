@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:47
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crime_app', '0006_unread_notification_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('officer_read_at', models.DateTimeField(blank=True, null=True)),
+                ('citizen_read_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='citizennotification',
+            index=models.Index(fields=['user', 'created_at'], name='crime_app_c_user_id_a20984_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['officer', 'created_at'], name='crime_app_n_officer_c5c429_idx'),
+        ),
+        migrations.AddField(
+            model_name='notificationwatermark',
+            name='user',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='notification_watermark', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:51
+
+from django.db import migrations, models
+
+from crime_app.geo import encode_geohash
+
+
+def backfill_geohash(apps, schema_editor):
+    CrimeReport = apps.get_model('crime_app', 'CrimeReport')
+    reports = CrimeReport.objects.filter(latitude__isnull=False, longitude__isnull=False).only('latitude', 'longitude')
+    batch = []
+    for report in reports.iterator(chunk_size=2000):
+        report.geohash = encode_geohash(report.latitude, report.longitude)
+        batch.append(report)
+    CrimeReport.objects.bulk_update(batch, ['geohash'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crime_app', '0007_notificationwatermark'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='crimereport',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=12, null=True),
+        ),
+        migrations.RunPython(backfill_geohash, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crime_app', '0008_crimereport_geohash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='crimereport',
+            name='duplicate_of',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicates', to='crime_app.crimereport'),
+        ),
+        migrations.AddField(
+            model_name='crimereport',
+            name='duplicate_score',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='crimereport',
+            name='text_signature',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='ReportSignatureBand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField()),
+                ('bucket', models.BigIntegerField()),
+                ('report', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='signature_bands', to='crime_app.crimereport')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['band', 'bucket'], name='crime_app_r_band_78ef7b_idx')],
+            },
+        ),
+    ]
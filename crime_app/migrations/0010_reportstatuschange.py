@@ -0,0 +1,34 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:57
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crime_app', '0009_report_duplicates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportStatusChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('incident_type', models.CharField(choices=[('CR-TEMP', 'CR-TEMP'), ('ASSAULT', 'Assault'), ('BURGLARY', 'Burglary'), ('THEFT', 'Theft'), ('ROBBERY', 'Robbery'), ('VANDALISM', 'Vandalism'), ('FRAUD', 'Fraud'), ('CYBERCRIME', 'Cyber Crime'), ('DRUG_OFFENSE', 'Drug Offense'), ('TRAFFIC_ACCIDENT', 'Traffic Accident'), ('DOMESTIC_VIOLENCE', 'Domestic Violence'), ('HARASSMENT', 'Harassment'), ('OTHER', 'Other')], max_length=50)),
+                ('from_status', models.CharField(blank=True, choices=[('Pending', 'Pending'), ('Investigating', 'Investigating'), ('Resolved', 'Resolved'), ('Dismissed', 'Dismissed')], max_length=20)),
+                ('to_status', models.CharField(choices=[('Pending', 'Pending'), ('Investigating', 'Investigating'), ('Resolved', 'Resolved'), ('Dismissed', 'Dismissed')], max_length=20)),
+                ('at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('seconds_in_previous', models.BigIntegerField(blank=True, null=True)),
+                ('seconds_since_reported', models.BigIntegerField(default=0)),
+                ('changed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('department', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='crime_app.department')),
+                ('report', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_changes', to='crime_app.crimereport')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['department', 'to_status', 'at'], name='crime_app_r_departm_abf012_idx'), models.Index(fields=['report', 'at'], name='crime_app_r_report__9eb8f1_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.7 on 2026-10-18 13:03
+
+import crime_app.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crime_app', '0011_uploadsession'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EvidenceBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('references', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='crimereport',
+            name='evidence_audio',
+            field=models.FileField(blank=True, null=True, storage=crime_app.storage.evidence_storage, upload_to='evidence/audio/%Y/%m/%d/'),
+        ),
+        migrations.AlterField(
+            model_name='crimereport',
+            name='evidence_image',
+            field=models.ImageField(blank=True, null=True, storage=crime_app.storage.evidence_storage, upload_to='evidence/images/%Y/%m/%d/'),
+        ),
+        migrations.AlterField(
+            model_name='crimereport',
+            name='evidence_video',
+            field=models.FileField(blank=True, null=True, storage=crime_app.storage.evidence_storage, upload_to='evidence/videos/%Y/%m/%d/'),
+        ),
+    ]
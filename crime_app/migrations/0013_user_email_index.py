@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-18 13:06
+
+from django.db import migrations, models
+from django.db.models.functions import Lower, Trim
+
+
+def normalize_emails(apps, schema_editor):
+    User = apps.get_model('crime_app', 'User')
+    User.objects.update(email=Lower(Trim('email')))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crime_app', '0012_evidence_blobs'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='email',
+            field=models.EmailField(blank=True, db_index=True, max_length=254, verbose_name='email address'),
+        ),
+        migrations.RunPython(normalize_emails, migrations.RunPython.noop),
+    ]
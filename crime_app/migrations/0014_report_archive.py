@@ -0,0 +1,88 @@
+# Generated by Django 5.2.7 on 2026-10-18 13:17
+
+import crime_app.models
+import crime_app.storage
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crime_app', '0013_user_email_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='reportstatuschange',
+            name='report',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='status_changes', to='crime_app.crimereport'),
+        ),
+        migrations.CreateModel(
+            name='ArchivedCrimeReport',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('report_id', models.CharField(max_length=12, unique=True)),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField()),
+                ('location', models.CharField(max_length=255)),
+                ('latitude', models.FloatField(blank=True, null=True)),
+                ('longitude', models.FloatField(blank=True, null=True)),
+                ('geohash', models.CharField(blank=True, max_length=12, null=True)),
+                ('incident_type', models.CharField(choices=[('CR-TEMP', 'CR-TEMP'), ('ASSAULT', 'Assault'), ('BURGLARY', 'Burglary'), ('THEFT', 'Theft'), ('ROBBERY', 'Robbery'), ('VANDALISM', 'Vandalism'), ('FRAUD', 'Fraud'), ('CYBERCRIME', 'Cyber Crime'), ('DRUG_OFFENSE', 'Drug Offense'), ('TRAFFIC_ACCIDENT', 'Traffic Accident'), ('DOMESTIC_VIOLENCE', 'Domestic Violence'), ('HARASSMENT', 'Harassment'), ('OTHER', 'Other')], max_length=50)),
+                ('priority', models.CharField(choices=[('Low', 'Low'), ('Medium', 'Medium'), ('High', 'High'), ('Emergency', 'Emergency')], max_length=20)),
+                ('evidence_image', models.ImageField(blank=True, null=True, storage=crime_app.storage.evidence_storage, upload_to='evidence/images/%Y/%m/%d/')),
+                ('evidence_video', models.FileField(blank=True, null=True, storage=crime_app.storage.evidence_storage, upload_to='evidence/videos/%Y/%m/%d/')),
+                ('evidence_audio', models.FileField(blank=True, null=True, storage=crime_app.storage.evidence_storage, upload_to='evidence/audio/%Y/%m/%d/')),
+                ('date_reported', models.DateTimeField()),
+                ('date_updated', models.DateTimeField()),
+                ('status', models.CharField(choices=[('Pending', 'Pending'), ('Investigating', 'Investigating'), ('Resolved', 'Resolved'), ('Dismissed', 'Dismissed')], max_length=20)),
+                ('text_signature', models.BinaryField(blank=True, null=True)),
+                ('duplicate_score', models.FloatField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('department', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='crime_app.department')),
+                ('duplicate_of', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='duplicates', to='crime_app.archivedcrimereport')),
+                ('reporter', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_reports', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Archived Crime Report',
+                'verbose_name_plural': 'Archived Crime Reports',
+                'ordering': ['-date_reported'],
+            },
+            bases=(crime_app.models.ReportDisplayMixin, models.Model),
+        ),
+        migrations.CreateModel(
+            name='ArchivedCitizenNotification',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('notification_type', models.CharField(choices=[('status_update', 'Status Update'), ('reminder', 'Reminder'), ('general', 'General')], max_length=20)),
+                ('title', models.CharField(max_length=200)),
+                ('message', models.TextField()),
+                ('is_read', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField()),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_notifications', to=settings.AUTH_USER_MODEL)),
+                ('related_report', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to='crime_app.archivedcrimereport')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='archivedcrimereport',
+            index=models.Index(fields=['reporter', 'date_reported'], name='crime_app_a_reporte_751e02_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedcrimereport',
+            index=models.Index(fields=['department', 'date_reported'], name='crime_app_a_departm_8829c0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedcrimereport',
+            index=models.Index(fields=['date_reported', 'id'], name='crime_app_a_date_re_28ea54_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedcitizennotification',
+            index=models.Index(fields=['user', 'created_at'], name='crime_app_a_user_id_ebe0ce_idx'),
+        ),
+    ]
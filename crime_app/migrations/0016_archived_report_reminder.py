@@ -1,4 +1,4 @@
-# Generated by Django 5.2.7 on 2025-10-24 20:28
+# Generated by Django 5.2.7 on 2026-10-18 13:43
 
 import django.db.models.deletion
 from django.conf import settings
@@ -8,19 +8,19 @@ from django.db import migrations, models
 class Migration(migrations.Migration):
 
     dependencies = [
-        ('crime_app', '0010_citizennotification'),
+        ('crime_app', '0015_live_event'),
     ]
 
     operations = [
         migrations.CreateModel(
-            name='ReportReminder',
+            name='ArchivedReportReminder',
             fields=[
-                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
                 ('message', models.TextField(blank=True)),
-                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('created_at', models.DateTimeField()),
                 ('is_acknowledged', models.BooleanField(default=False)),
-                ('report', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to='crime_app.crimereport')),
-                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('report', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to='crime_app.archivedcrimereport')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_reminders', to=settings.AUTH_USER_MODEL)),
             ],
             options={
                 'ordering': ['-created_at'],
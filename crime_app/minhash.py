@@ -0,0 +1,62 @@
+import hashlib
+import re
+
+import numpy as np
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS  # 16 bands of 4 rows: pairs above ~0.5 similarity collide in some band
+SHINGLE_SIZE = 5
+
+# Universal hashing (a*x + b) mod P over 32-bit shingle hashes. The seed is
+# fixed so signatures stored in the database stay comparable across processes.
+PRIME = (1 << 32) - 5
+_rng = np.random.default_rng(0x5EED)
+_A = _rng.integers(1, 1 << 31, size=NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, PRIME, size=NUM_PERM, dtype=np.uint64)
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def shingles(text):
+    """Character 5-grams of the normalized text; robust to typos and word order tweaks"""
+    normalized = ' '.join(WORD_RE.findall(text.lower()))
+    if len(normalized) <= SHINGLE_SIZE:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+
+
+def _hash32(shingle):
+    return int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=4).digest(), 'little')
+
+
+def signature(text):
+    """MinHash signature as NUM_PERM uint32 values, or None for empty text"""
+    hashes = np.fromiter((_hash32(s) for s in shingles(text)), dtype=np.uint64)
+    if not hashes.size:
+        return None
+    permuted = (np.outer(_A, hashes) + _B[:, None]) % PRIME
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def to_bytes(sig):
+    return sig.astype('<u4').tobytes()
+
+
+def from_bytes(raw):
+    return np.frombuffer(bytes(raw), dtype='<u4')
+
+
+def band_buckets(sig):
+    """One signed 64-bit bucket id per band, suitable for a BigIntegerField"""
+    buckets = []
+    for band in range(BANDS):
+        rows = sig[band * ROWS:(band + 1) * ROWS].astype('<u4').tobytes()
+        digest = hashlib.blake2b(rows, digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, 'little', signed=True))
+    return buckets
+
+
+def similarity(sig, others):
+    """Estimated Jaccard similarity of sig against each row of others"""
+    return (np.asarray(others) == sig).mean(axis=-1)
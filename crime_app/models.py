@@ -1,8 +1,16 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Q
+from django.db.models.functions import ASin, Cos, Least, Power, Radians, Sin, Sqrt, Substr
 from django.contrib.auth.models import AbstractUser
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils import timezone
+import math
+from datetime import timedelta
 import uuid
 
+from .geo import EARTH_RADIUS_M, GEOHASH_PRECISION, bbox_around, cells_for_bbox, encode_geohash
+from .storage import evidence_storage
+
 
 # ===================== Custom User Model =======================
 class User(AbstractUser):
@@ -12,14 +20,26 @@ class User(AbstractUser):
         ('citizen', 'Citizen'),
     )
 
+    # Stored lowercased (see save) and indexed, so login is one exact lookup
+    email = models.EmailField('email address', blank=True, db_index=True)
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='citizen')
     phone = models.CharField(max_length=20, blank=True, null=True)
     address = models.TextField(blank=True, null=True)
     is_active = models.BooleanField(default=True)
+    # Denormalized count of unread CitizenNotification rows, kept by inbox.py
+    unread_notifications = models.PositiveIntegerField(default=0)
 
     def __str__(self):
         return f"{self.get_full_name()} ({self.role})"
 
+    @staticmethod
+    def normalize_login_email(email):
+        return (email or '').strip().lower()
+
+    def save(self, *args, **kwargs):
+        self.email = self.normalize_login_email(self.email)
+        super().save(*args, **kwargs)
+
 
 # ===================== Police Department =======================
 class Department(models.Model):
@@ -51,70 +71,62 @@ class Officer(models.Model):
     department = models.ForeignKey('Department', on_delete=models.SET_NULL, null=True, blank=True, related_name='officers')
     profile_picture = models.ImageField(upload_to='officers/', blank=True, null=True)
     on_duty = models.BooleanField(default=True)
+    # Denormalized count of unread Notification rows, kept by inbox.py
+    unread_notifications = models.PositiveIntegerField(default=0)
 
     def __str__(self):
         return f"{self.user.get_full_name()} - {self.rank}"
 
 # ===================== Crime Report =======================
-class CrimeReport(models.Model):
-    STATUS_CHOICES = (
-        ('Pending', 'Pending'),
-        ('Investigating', 'Investigating'),
-        ('Resolved', 'Resolved'),
-        ('Dismissed', 'Dismissed')
-    )
+class CrimeReportQuerySet(models.QuerySet):
+    def for_listing(self):
+        """Lean queryset for list pages: one joined query, no full descriptions"""
+        return (
+            self.select_related('reporter__officer', 'department')
+            .defer('description', 'text_signature')
+            .annotate(description_excerpt=Substr('description', 1, 160))
+        )
 
-    PRIORITY_CHOICES = (
-        ('Low', 'Low'),
-        ('Medium', 'Medium'),
-        ('High', 'High'),
-        ('Emergency', 'Emergency')
-    )
+    def in_cells(self, south, west, north, east):
+        """Coarse filter on the indexed geohash column; may include points just outside the box"""
+        precision, prefixes = cells_for_bbox(south, west, north, east)
+        if precision == GEOHASH_PRECISION:
+            return self.filter(geohash__in=prefixes)
+        cells = Q()
+        for prefix in prefixes:
+            # '{' sorts right after 'z', the last geohash character
+            cells |= Q(geohash__gte=prefix, geohash__lt=prefix + '{')
+        return self.filter(cells)
 
-    INCIDENT_TYPES = [
-        ('CR-TEMP', 'CR-TEMP'),
-        ('ASSAULT', 'Assault'),
-        ('BURGLARY', 'Burglary'),
-        ('THEFT', 'Theft'),
-        ('ROBBERY', 'Robbery'),
-        ('VANDALISM', 'Vandalism'),
-        ('FRAUD', 'Fraud'),
-        ('CYBERCRIME', 'Cyber Crime'),
-        ('DRUG_OFFENSE', 'Drug Offense'),
-        ('TRAFFIC_ACCIDENT', 'Traffic Accident'),
-        ('DOMESTIC_VIOLENCE', 'Domestic Violence'),
-        ('HARASSMENT', 'Harassment'),
-        ('OTHER', 'Other'),
-    ]
+    def within_bbox(self, south, west, north, east):
+        """Reports whose coordinates fall inside the box (degrees)"""
+        return self.in_cells(south, west, north, east).filter(
+            latitude__range=(south, north), longitude__range=(west, east),
+        )
 
-    report_id = models.CharField(max_length=12, unique=True, editable=False)
-    reporter = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='reports')
-    department = models.ForeignKey(Department, on_delete=models.SET_NULL, null=True, blank=True)
-    title = models.CharField(max_length=200)
-    description = models.TextField()
-    location = models.CharField(max_length=255)
-    
-    # GPS Coordinates
-    latitude = models.FloatField(null=True, blank=True)
-    longitude = models.FloatField(null=True, blank=True)
-    
-    incident_type = models.CharField(max_length=50, choices=INCIDENT_TYPES)
-    priority = models.CharField(max_length=20, choices=PRIORITY_CHOICES, default='Medium')
-    
-    # Evidence Files
-    evidence_image = models.ImageField(upload_to='evidence/images/%Y/%m/%d/', null=True, blank=True)
-    evidence_video = models.FileField(upload_to='evidence/videos/%Y/%m/%d/', null=True, blank=True)
-    evidence_audio = models.FileField(upload_to='evidence/audio/%Y/%m/%d/', null=True, blank=True)
-    
-    # Timestamps
-    date_reported = models.DateTimeField(auto_now_add=True)
-    date_updated = models.DateTimeField(auto_now=True)
-    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Pending')
+    def nearby(self, latitude, longitude, radius_m=500):
+        """
+        Reports within radius_m metres of a point, annotated with distance_m
+        and ordered nearest first. The geohash cells narrow the candidates,
+        then the exact haversine distance is applied to what is left.
+        """
+        south, west, north, east = bbox_around(latitude, longitude, radius_m)
+        lat, lng = Radians(F('latitude')), Radians(F('longitude'))
+        origin_lat = math.radians(latitude)
+        a = (
+            Power(Sin((lat - origin_lat) / 2), 2)
+            + math.cos(origin_lat) * Cos(lat) * Power(Sin((lng - math.radians(longitude)) / 2), 2)
+        )
+        return (
+            self.in_cells(south, west, north, east)
+            .annotate(distance_m=2 * EARTH_RADIUS_M * ASin(Least(Sqrt(a), 1.0)))
+            .filter(distance_m__lte=radius_m)
+            .order_by('distance_m')
+        )
 
-    def save(self, *args, **kwargs):
-        if not self.report_id:
-            self.report_id = f"CR-{uuid.uuid4().hex[:8].upper()}"
-        super().save(*args, **kwargs)
+
+class ReportDisplayMixin:
+    """Presentation and access helpers shared by CrimeReport and ArchivedCrimeReport"""
 
     def get_google_maps_url(self):
         """Generate Google Maps URL from coordinates"""
@@ -176,6 +188,134 @@ class CrimeReport(models.Model):
         """Calculate days since report was submitted"""
         return (timezone.now() - self.date_reported).days
 
+
+class CrimeReport(ReportDisplayMixin, models.Model):
+    STATUS_CHOICES = (
+        ('Pending', 'Pending'),
+        ('Investigating', 'Investigating'),
+        ('Resolved', 'Resolved'),
+        ('Dismissed', 'Dismissed')
+    )
+
+    PRIORITY_CHOICES = (
+        ('Low', 'Low'),
+        ('Medium', 'Medium'),
+        ('High', 'High'),
+        ('Emergency', 'Emergency')
+    )
+
+    INCIDENT_TYPES = [
+        ('CR-TEMP', 'CR-TEMP'),
+        ('ASSAULT', 'Assault'),
+        ('BURGLARY', 'Burglary'),
+        ('THEFT', 'Theft'),
+        ('ROBBERY', 'Robbery'),
+        ('VANDALISM', 'Vandalism'),
+        ('FRAUD', 'Fraud'),
+        ('CYBERCRIME', 'Cyber Crime'),
+        ('DRUG_OFFENSE', 'Drug Offense'),
+        ('TRAFFIC_ACCIDENT', 'Traffic Accident'),
+        ('DOMESTIC_VIOLENCE', 'Domestic Violence'),
+        ('HARASSMENT', 'Harassment'),
+        ('OTHER', 'Other'),
+    ]
+
+    report_id = models.CharField(max_length=12, unique=True, editable=False)
+    reporter = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='reports')
+    department = models.ForeignKey(Department, on_delete=models.SET_NULL, null=True, blank=True)
+    title = models.CharField(max_length=200)
+    description = models.TextField()
+    location = models.CharField(max_length=255)
+    
+    # GPS Coordinates
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    # Filled on save from the coordinates; indexed so nearby() can narrow by cell
+    geohash = models.CharField(max_length=12, null=True, blank=True, db_index=True, editable=False)
+    
+    incident_type = models.CharField(max_length=50, choices=INCIDENT_TYPES)
+    priority = models.CharField(max_length=20, choices=PRIORITY_CHOICES, default='Medium')
+    
+    # Evidence Files
+    evidence_image = models.ImageField(upload_to='evidence/images/%Y/%m/%d/', storage=evidence_storage, null=True, blank=True)
+    evidence_video = models.FileField(upload_to='evidence/videos/%Y/%m/%d/', storage=evidence_storage, null=True, blank=True)
+    evidence_audio = models.FileField(upload_to='evidence/audio/%Y/%m/%d/', storage=evidence_storage, null=True, blank=True)
+    
+    # Timestamps
+    date_reported = models.DateTimeField(auto_now_add=True)
+    date_updated = models.DateTimeField(auto_now=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='Pending')
+
+    # Near-duplicate detection (see dedup.py)
+    text_signature = models.BinaryField(null=True, blank=True, editable=False)
+    duplicate_of = models.ForeignKey(
+        'self', on_delete=models.SET_NULL, null=True, blank=True, related_name='duplicates'
+    )
+    duplicate_score = models.FloatField(null=True, blank=True)
+
+    objects = CrimeReportQuerySet.as_manager()
+
+    is_archived = False
+
+    COUNTER_FIELDS = ('department_id', 'reporter_id', 'status', 'priority')
+    # Fields that decide which cached heatmap tiles count a report
+    HEATMAP_FIELDS = ('latitude', 'longitude', 'incident_type', 'department_id')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the counted state so counter updates can compute a delta
+        if all(field in instance.__dict__ for field in cls.COUNTER_FIELDS):
+            instance._counter_key = instance.get_counter_key()
+        # and where the report sat on the heatmap, so only moves invalidate tiles
+        if all(field in instance.__dict__ for field in cls.HEATMAP_FIELDS):
+            instance._heatmap_point = instance.get_heatmap_point()
+        return instance
+
+    def get_counter_key(self):
+        return tuple(getattr(self, field) for field in self.COUNTER_FIELDS)
+
+    def get_heatmap_point(self):
+        return tuple(getattr(self, field) for field in self.HEATMAP_FIELDS)
+
+    @staticmethod
+    def generate_report_id():
+        return f"CR-{uuid.uuid4().hex[:8].upper()}"
+
+    def save(self, *args, **kwargs):
+        if not self.report_id:
+            self.report_id = self.generate_report_id()
+        # Views may assign raw form strings; the geohash needs real numbers
+        for field in ('latitude', 'longitude'):
+            setattr(self, field, self._meta.get_field(field).to_python(getattr(self, field)))
+        self.geohash = self.compute_geohash()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'geohash'}
+        # post_save handlers (search index, counters) commit or roll back with the row
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+
+    def compute_geohash(self):
+        if self.latitude is None or self.longitude is None:
+            return None
+        return encode_geohash(self.latitude, self.longitude)
+
+    def get_nearby_reports(self, radius_m=500, hours=24, limit=10, queryset=None):
+        """Other reports within radius_m of this one, reported in the last `hours`"""
+        if self.latitude is None or self.longitude is None:
+            return []
+        if queryset is None:
+            queryset = CrimeReport.objects.all()
+        since = timezone.now() - timedelta(hours=hours)
+        return list(
+            queryset.nearby(self.latitude, self.longitude, radius_m)
+            .filter(date_reported__gte=since)
+            .exclude(pk=self.pk)
+            .only('id', 'report_id', 'title', 'incident_type', 'status', 'date_reported', 'latitude', 'longitude')
+            [:limit]
+        )
+
     def __str__(self):
         return f"{self.title} ({self.report_id})"
 
@@ -185,11 +325,94 @@ class CrimeReport(models.Model):
             models.Index(fields=['status', 'date_reported']),
             models.Index(fields=['reporter', 'date_reported']),
             models.Index(fields=['department', 'date_reported']),
+            models.Index(fields=['date_reported', 'id']),
         ]
         verbose_name = "Crime Report"
         verbose_name_plural = "Crime Reports"
 
 
+# ===================== Status History =======================
+class ReportStatusChange(models.Model):
+    """
+    Append-only log of status transitions, written in the same transaction
+    as the report (see history.py). from_status is empty for the row written
+    when a report is created. Department and incident type are copied in so
+    SLA queries never need to join back to the report.
+
+    The report key has no database constraint so history outlives
+    archiving (see archive.py); history.py deletes it with the report.
+    """
+    report = models.ForeignKey(
+        CrimeReport, on_delete=models.DO_NOTHING, db_constraint=False, related_name='status_changes'
+    )
+    department = models.ForeignKey(Department, on_delete=models.SET_NULL, null=True, blank=True)
+    incident_type = models.CharField(max_length=50, choices=CrimeReport.INCIDENT_TYPES)
+    from_status = models.CharField(max_length=20, choices=CrimeReport.STATUS_CHOICES, blank=True)
+    to_status = models.CharField(max_length=20, choices=CrimeReport.STATUS_CHOICES)
+    changed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    at = models.DateTimeField(default=timezone.now)
+    # Time spent in from_status, and since the report was filed
+    seconds_in_previous = models.BigIntegerField(null=True, blank=True)
+    seconds_since_reported = models.BigIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['department', 'to_status', 'at']),
+            models.Index(fields=['report', 'at']),
+        ]
+
+    def __str__(self):
+        return f"{self.report_id}: {self.from_status or '-'} -> {self.to_status}"
+
+
+# ===================== Duplicate Detection =======================
+class ReportSignatureBand(models.Model):
+    """
+    LSH index over CrimeReport.text_signature: one row per band. Reports
+    sharing any (band, bucket) are candidate near-duplicates.
+    """
+    report = models.ForeignKey(CrimeReport, on_delete=models.CASCADE, related_name='signature_bands')
+    band = models.PositiveSmallIntegerField()
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['band', 'bucket']),
+        ]
+
+    def __str__(self):
+        return f"{self.report_id} band {self.band}"
+
+
+# ===================== Report Counters =======================
+class ReportCounter(models.Model):
+    """
+    Materialized report counts, maintained in the same transaction as
+    CrimeReport writes (see counters.py). Besides exact (department, reporter)
+    rows, rollups use ALL in either key so each dashboard figure is a single
+    unique-index lookup. NONE stands for an unassigned department or reporter.
+    """
+    ALL = -1
+    NONE = 0
+
+    department_key = models.BigIntegerField()
+    reporter_key = models.BigIntegerField()
+    status = models.CharField(max_length=20, choices=CrimeReport.STATUS_CHOICES)
+    priority = models.CharField(max_length=20, choices=CrimeReport.PRIORITY_CHOICES)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['department_key', 'reporter_key', 'status', 'priority'],
+                name='unique_report_counter',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.department_key}/{self.reporter_key} {self.status}/{self.priority}: {self.count}"
+
+
 class Notification(models.Model):
     officer = models.ForeignKey(
         'Officer',
@@ -200,6 +423,11 @@ class Notification(models.Model):
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(default=timezone.now)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['officer', 'created_at']),
+        ]
+
     def __str__(self):
         return f"{self.officer.user.username} - {self.message[:50]}"
     
@@ -222,11 +450,28 @@ class CitizenNotification(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'created_at']),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.user.get_full_name()}"
     
 
+class NotificationWatermark(models.Model):
+    """
+    Per-user "read up to" timestamps. A notification is read if it was
+    created at or before the watermark, or if its own is_read flag is set
+    (marking a single item read). "Mark all read" only moves the watermark.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='notification_watermark')
+    officer_read_at = models.DateTimeField(null=True, blank=True)
+    citizen_read_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Watermark for {self.user.username}"
+
+
 # models.py
 class ReportReminder(models.Model):
     report = models.ForeignKey('CrimeReport', on_delete=models.CASCADE, related_name='reminders')
@@ -239,4 +484,196 @@ class ReportReminder(models.Model):
         ordering = ['-created_at']
     
     def __str__(self):
-        return f"Reminder for {self.report.title} - {self.created_at}"
\ No newline at end of file
+        return f"Reminder for {self.report.title} - {self.created_at}"
+
+# ===================== Evidence Uploads =======================
+class UploadSession(models.Model):
+    """
+    A resumable, chunked evidence upload (see uploads.py). Bytes are staged
+    under MEDIA_ROOT and `received` is the offset of the last verified chunk,
+    so a client that lost its connection resumes from there.
+    """
+    FIELD_CHOICES = (
+        ('evidence_video', 'Video evidence'),
+        ('evidence_audio', 'Audio evidence'),
+    )
+    STATUS_CHOICES = (
+        ('uploading', 'Uploading'),
+        ('complete', 'Complete'),
+        ('attached', 'Attached'),
+        ('aborted', 'Aborted'),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='upload_sessions')
+    report = models.ForeignKey(CrimeReport, on_delete=models.SET_NULL, null=True, blank=True, related_name='upload_sessions')
+    field = models.CharField(max_length=20, choices=FIELD_CHOICES)
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100, blank=True)
+    size = models.BigIntegerField()
+    received = models.BigIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='uploading')
+    # Held while one request writes a chunk, so two retries can't interleave bytes
+    lease_until = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'updated_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.size})"
+
+
+class EvidenceBlob(models.Model):
+    """
+    Reference count of one content-addressed evidence file (see storage.py),
+    kept by the blobs module as reports gain, swap or lose evidence.
+    """
+    name = models.CharField(max_length=255, unique=True)
+    references = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name} ({self.references})"
+
+
+# ===================== Outbox =======================
+class OutboxMessage(models.Model):
+    """
+    A side effect (e.g. notification fan-out) recorded in the same
+    transaction as the request's writes and delivered later by the
+    `run_outbox` worker, at least once.
+    """
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    )
+
+    kind = models.CharField(max_length=50)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    claim_token = models.CharField(max_length=32, blank=True, default='')
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'available_at']),
+            models.Index(fields=['claim_token']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
+
+
+# ===================== Live events =======================
+class LiveEvent(models.Model):
+    """
+    A live (SSE) event on its way to subscribers in every serving process;
+    see live.DatabaseBroker. Rows live for minutes and are pruned as new
+    ones arrive.
+    """
+    channel = models.CharField(max_length=64)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"{self.channel} #{self.pk}"
+
+
+# ===================== Archive =======================
+class ArchivedCrimeReport(ReportDisplayMixin, models.Model):
+    """
+    Closed reports moved out of CrimeReport by `archive_reports` (see
+    archive.py), with the same columns. Rows keep their CrimeReport id, so
+    status history and links carrying the id still resolve. Nothing keeps
+    counters, the search index or duplicate bands for this table.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    report_id = models.CharField(max_length=12, unique=True)
+    reporter = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True, related_name='archived_reports'
+    )
+    department = models.ForeignKey(Department, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    title = models.CharField(max_length=200)
+    description = models.TextField()
+    location = models.CharField(max_length=255)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    geohash = models.CharField(max_length=12, null=True, blank=True)
+    incident_type = models.CharField(max_length=50, choices=CrimeReport.INCIDENT_TYPES)
+    priority = models.CharField(max_length=20, choices=CrimeReport.PRIORITY_CHOICES)
+    evidence_image = models.ImageField(upload_to='evidence/images/%Y/%m/%d/', storage=evidence_storage, null=True, blank=True)
+    evidence_video = models.FileField(upload_to='evidence/videos/%Y/%m/%d/', storage=evidence_storage, null=True, blank=True)
+    evidence_audio = models.FileField(upload_to='evidence/audio/%Y/%m/%d/', storage=evidence_storage, null=True, blank=True)
+    date_reported = models.DateTimeField()
+    date_updated = models.DateTimeField()
+    status = models.CharField(max_length=20, choices=CrimeReport.STATUS_CHOICES)
+    text_signature = models.BinaryField(null=True, blank=True)
+    # A duplicate cluster is archived together, so this points within the archive
+    duplicate_of = models.ForeignKey(
+        'self', on_delete=models.DO_NOTHING, db_constraint=False, null=True, blank=True, related_name='duplicates'
+    )
+    duplicate_score = models.FloatField(null=True, blank=True)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    is_archived = True
+
+    class Meta:
+        ordering = ['-date_reported']
+        indexes = [
+            models.Index(fields=['reporter', 'date_reported']),
+            models.Index(fields=['department', 'date_reported']),
+            models.Index(fields=['date_reported', 'id']),
+        ]
+        verbose_name = "Archived Crime Report"
+        verbose_name_plural = "Archived Crime Reports"
+
+    def __str__(self):
+        return f"{self.title} ({self.report_id}, archived)"
+
+
+class ArchivedCitizenNotification(models.Model):
+    """A CitizenNotification about a report that has been archived, keeping its id"""
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_notifications')
+    notification_type = models.CharField(max_length=20, choices=CitizenNotification.NOTIFICATION_TYPES)
+    title = models.CharField(max_length=200)
+    message = models.TextField()
+    related_report = models.ForeignKey(ArchivedCrimeReport, on_delete=models.CASCADE, related_name='notifications')
+    is_read = models.BooleanField(default=False)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.title} - {self.user.get_full_name()}"
+
+
+class ArchivedReportReminder(models.Model):
+    """A ReportReminder on a report that has been archived, keeping its id"""
+    id = models.BigIntegerField(primary_key=True)
+    report = models.ForeignKey(ArchivedCrimeReport, on_delete=models.CASCADE, related_name='reminders')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_reminders')
+    message = models.TextField(blank=True)
+    created_at = models.DateTimeField()
+    is_acknowledged = models.BooleanField(default=False)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Reminder for {self.report.title} - {self.created_at}"
@@ -0,0 +1,200 @@
+import logging
+import uuid
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import CitizenNotification, OutboxMessage
+from .inbox import citizen_notified
+from .utils import notify_department_officers
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 100
+MAX_ATTEMPTS = 8
+LEASE_SECONDS = 60
+
+HANDLERS = {}
+# Kinds whose handlers only write a few rows; drain delivers these many to a transaction
+BATCHED_KINDS = {'officer_notification', 'citizen_notification'}
+
+
+def handler(kind):
+    """Registers the function that delivers outbox messages of this kind"""
+    def register(func):
+        HANDLERS[kind] = func
+        return func
+    return register
+
+
+# ===================== Enqueueing =====================
+def enqueue(kind, **payload):
+    """
+    Records a side effect to run later. Call it inside the transaction that
+    makes the change, so the message exists only if the change commits.
+    """
+    return OutboxMessage.objects.create(kind=kind, payload=payload)
+
+
+def queue_officer_notification(department, message, exclude=None, on_duty_only=False):
+    if not department:
+        return None
+    return enqueue(
+        'officer_notification',
+        department_id=getattr(department, 'pk', department),
+        message=message,
+        exclude_officer_id=getattr(exclude, 'pk', exclude),
+        on_duty_only=on_duty_only,
+    )
+
+
+def queue_citizen_notification(user, title, message, notification_type='general', related_report=None):
+    if user is None:
+        return None
+    return enqueue(
+        'citizen_notification',
+        user_id=user.pk,
+        title=title,
+        message=message,
+        notification_type=notification_type,
+        related_report_id=getattr(related_report, 'pk', related_report),
+    )
+
+
+@handler('officer_notification')
+def deliver_officer_notification(payload):
+    notify_department_officers(
+        payload['department_id'],
+        payload['message'],
+        exclude=payload.get('exclude_officer_id'),
+        on_duty_only=payload.get('on_duty_only', False),
+    )
+
+
+@handler('citizen_notification')
+@transaction.atomic
+def deliver_citizen_notification(payload):
+    CitizenNotification.objects.create(
+        user_id=payload['user_id'],
+        title=payload['title'],
+        message=payload['message'],
+        notification_type=payload.get('notification_type', 'general'),
+        related_report_id=payload.get('related_report_id'),
+    )
+    citizen_notified(payload['user_id'], payload['title'], payload['message'])
+
+
+# ===================== Delivery =====================
+def retry_delay(attempts):
+    """Exponential backoff: 2s, 4s, 8s ... capped at 10 minutes"""
+    return timedelta(seconds=min(2 ** attempts, 600))
+
+
+def claim_batch(batch_size=BATCH_SIZE):
+    """
+    Leases up to batch_size due messages to this worker. Messages whose
+    lease expired (a worker died mid-batch) become claimable again, which
+    is what makes delivery at-least-once.
+    """
+    now = timezone.now()
+    claimable = (
+        Q(status='pending', available_at__lte=now) |
+        Q(status='processing', locked_until__lt=now)
+    )
+    candidate_ids = list(
+        OutboxMessage.objects.filter(claimable).order_by('id').values_list('pk', flat=True)[:batch_size]
+    )
+    if not candidate_ids:
+        return []
+
+    token = uuid.uuid4().hex
+    OutboxMessage.objects.filter(claimable, pk__in=candidate_ids).update(
+        status='processing',
+        claim_token=token,
+        locked_until=now + timedelta(seconds=LEASE_SECONDS),
+    )
+    return list(OutboxMessage.objects.filter(claim_token=token, status='processing').order_by('id'))
+
+
+def _record_failure(message, exc):
+    attempts = message.attempts + 1
+    logger.error("Outbox message %s failed (attempt %s)", message.pk, attempts, exc_info=exc)
+    OutboxMessage.objects.filter(pk=message.pk).update(
+        status='failed' if attempts >= MAX_ATTEMPTS else 'pending',
+        attempts=attempts,
+        available_at=timezone.now() + retry_delay(attempts),
+        locked_until=None,
+        last_error=f"{type(exc).__name__}: {exc}",
+    )
+
+
+def deliver(message):
+    """
+    Runs one message's handler and records the outcome. Returns True on success.
+
+    The handler runs outside any transaction, so a slow one (rendering
+    thumbnails) does not hold SQLite's write lock while it works; handlers
+    that write several rows wrap them in their own atomic(). The outcome is
+    then recorded by a single UPDATE. A crash in between redelivers the
+    message, which at-least-once delivery allows.
+    """
+    try:
+        HANDLERS[message.kind](message.payload)
+    except Exception as exc:
+        _record_failure(message, exc)
+        return False
+    OutboxMessage.objects.filter(pk=message.pk).update(
+        status='done', processed_at=timezone.now(), locked_until=None,
+    )
+    return True
+
+
+def deliver_batch(messages):
+    """
+    Delivers small messages in one transaction, each in its own savepoint,
+    so the worker takes SQLite's write lock once per batch instead of once
+    per message. Only for BATCHED_KINDS, whose handlers do nothing but
+    write a few rows; anything slower goes through deliver(). Returns
+    (delivered, failed).
+    """
+    failures = []
+    with transaction.atomic():
+        for message in messages:
+            try:
+                with transaction.atomic():
+                    HANDLERS[message.kind](message.payload)
+            except Exception as exc:
+                failures.append((message, exc))
+        failed_ids = {message.pk for message, _ in failures}
+        delivered = [message.pk for message in messages if message.pk not in failed_ids]
+        OutboxMessage.objects.filter(pk__in=delivered).update(
+            status='done', processed_at=timezone.now(), locked_until=None,
+        )
+    for message, exc in failures:
+        _record_failure(message, exc)
+    return len(delivered), len(failures)
+
+
+def drain(batch_size=BATCH_SIZE):
+    """Delivers one batch of due messages. Returns (delivered, failed)."""
+    messages = claim_batch(batch_size)
+    batched = [message for message in messages if message.kind in BATCHED_KINDS]
+    delivered = failed = 0
+    if batched:
+        try:
+            delivered, failed = deliver_batch(batched)
+        except Exception:
+            # The shared commit failed; fall back to delivering them one by one
+            logger.exception("Batched outbox delivery failed, delivering one by one")
+            batched = []
+    batched_ids = {message.pk for message in batched}
+    for message in messages:
+        if message.pk in batched_ids:
+            continue
+        if deliver(message):
+            delivered += 1
+        else:
+            failed += 1
+    return delivered, failed
@@ -0,0 +1,89 @@
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections
+
+REPLICA = getattr(settings, 'REPLICA_DATABASE', 'replica')
+# After a write, the session reads from the primary for this long, covering replication lag
+STICKY_SECONDS = getattr(settings, 'REPLICA_STICKY_SECONDS', 10)
+STICKY_SESSION_KEY = '_pin_primary_until'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_use_replica = ContextVar('use_replica', default=False)
+
+
+def replica_configured():
+    return REPLICA in connections.settings
+
+
+class ReplicaRouter:
+    """
+    Sends reads made inside a @read_replica view to the REPLICA_DATABASE
+    alias. Everything else, and every write, goes to 'default'. Without a
+    replica configured, everything goes to 'default' as before.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _use_replica.get() and replica_configured():
+            return REPLICA
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema from the primary (see sync_replica)
+        return db == 'default'
+
+
+# ===================== Read-your-writes =====================
+def pin_to_primary(request):
+    """Keeps this session's reads on the primary until the replica has caught up"""
+    session = getattr(request, 'session', None)
+    if session is not None and session.session_key:
+        session[STICKY_SESSION_KEY] = time.time() + STICKY_SECONDS
+
+
+def pinned_to_primary(request):
+    session = getattr(request, 'session', None)
+    return session is not None and session.get(STICKY_SESSION_KEY, 0) > time.time()
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Pins a session to the primary for REPLICA_STICKY_SECONDS after any
+    request that may have written, so the admin who just changed a report
+    sees the change on the next page. Must come after SessionMiddleware.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method not in SAFE_METHODS and replica_configured():
+            pin_to_primary(request)
+        return response
+
+
+def read_replica(view):
+    """
+    Runs a read-only view's queries against the replica, unless the request
+    could write or the session wrote recently. Querysets have to be
+    evaluated inside the view (render() does), not lazily in a streamed body.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in SAFE_METHODS or pinned_to_primary(request):
+            return view(request, *args, **kwargs)
+        token = _use_replica.set(True)
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _use_replica.reset(token)
+    return wrapper
@@ -0,0 +1,168 @@
+import re
+
+from django.db import connection, connections, router, transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import ArchivedCrimeReport, CrimeReport
+
+FTS_TABLE = 'crime_app_crimereport_fts'
+SEARCH_LIMIT = 200
+
+# bm25 column weights: report_id, title, description, location, incident_type, status
+RANK_WEIGHTS = (10.0, 5.0, 1.0, 3.0, 2.0, 2.0)
+
+# Sentinel so that department=None can still mean "unassigned reports only"
+ANY_DEPARTMENT = object()
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def fts_enabled():
+    return connection.vendor == 'sqlite'
+
+
+def build_match_query(query):
+    """
+    Turns free text into a safe FTS5 expression: every word must match,
+    and the last one also matches as a prefix so search-as-you-type works.
+    """
+    tokens = TOKEN_RE.findall(query.lower())
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+# ===================== Index Maintenance =====================
+def index_report(report):
+    """Insert or refresh a single report in the full-text index"""
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [report.pk])
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} "
+            "(rowid, report_id, title, description, location, incident_type, status, department_id) "
+            "VALUES (%s, %s, %s, %s, %s, %s, %s, %s)",
+            [
+                report.pk, report.report_id, report.title, report.description,
+                report.location, report.incident_type, report.status, report.department_id,
+            ],
+        )
+
+
+def index_reports(reports):
+    """Adds newly bulk-created reports, which sent no post_save, to the index"""
+    if not fts_enabled():
+        return 0
+    with connection.cursor() as cursor:
+        return _insert_rows(cursor, [
+            (
+                report.pk, report.report_id, report.title, report.description,
+                report.location, report.incident_type, report.status, report.department_id,
+            )
+            for report in reports
+        ])
+
+
+def unindex_report(pk):
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [pk])
+
+
+def rebuild_index(batch_size=2000):
+    """Repopulate the index from scratch. Returns the number of indexed reports."""
+    columns = ('id', 'report_id', 'title', 'description', 'location', 'incident_type', 'status', 'department_id')
+    total = 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        batch = []
+        for row in CrimeReport.objects.values_list(*columns).iterator(chunk_size=batch_size):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                total += _insert_rows(cursor, batch)
+                batch = []
+        total += _insert_rows(cursor, batch)
+    return total
+
+
+def _insert_rows(cursor, rows):
+    if rows:
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE} "
+            "(rowid, report_id, title, description, location, incident_type, status, department_id) "
+            "VALUES (%s, %s, %s, %s, %s, %s, %s, %s)",
+            rows,
+        )
+    return len(rows)
+
+
+@receiver(post_save, sender=CrimeReport)
+def crime_report_saved(sender, instance, raw=False, **kwargs):
+    if fts_enabled() and not raw:
+        index_report(instance)
+
+
+@receiver(post_delete, sender=CrimeReport)
+def crime_report_deleted(sender, instance, **kwargs):
+    if fts_enabled():
+        unindex_report(instance.pk)
+
+
+# ===================== Querying =====================
+def search_reports(query, department=ANY_DEPARTMENT, limit=SEARCH_LIMIT, include_archived=False):
+    """
+    Returns reports matching the query, best matches first.
+    When a department is given only that department's reports are searched.
+    With include_archived, archived matches follow the live ones; the
+    archive has no full-text index, so that part is a plain scan.
+    """
+    if fts_enabled():
+        results = _search_index(query, department, limit)
+    else:
+        results = _search_fallback(CrimeReport.objects.all(), query, department, limit)
+    if include_archived and len(results) < limit:
+        results += _search_fallback(ArchivedCrimeReport.objects.all(), query, department, limit - len(results))
+    return results
+
+
+def _search_index(query, department, limit):
+    match = build_match_query(query)
+    if match is None:
+        return []
+
+    sql = f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s"
+    params = [match]
+    if department is not ANY_DEPARTMENT:
+        if department is None:
+            sql += " AND department_id IS NULL"
+        else:
+            sql += " AND department_id = %s"
+            params.append(getattr(department, 'pk', department))
+    weights = ', '.join(str(w) for w in RANK_WEIGHTS)
+    sql += f" ORDER BY bm25({FTS_TABLE}, {weights}) LIMIT %s"
+    params.append(limit)
+
+    # Raw SQL bypasses the router, so pick the read database the way the ORM would
+    with connections[router.db_for_read(CrimeReport)].cursor() as cursor:
+        cursor.execute(sql, params)
+        ids = [row[0] for row in cursor.fetchall()]
+
+    reports = CrimeReport.objects.select_related('department').in_bulk(ids)
+    return [reports[pk] for pk in ids if pk in reports]
+
+
+def _search_fallback(reports, query, department, limit):
+    """Plain icontains search, for databases without FTS5 and for the archive"""
+    reports = reports.select_related('department').filter(
+        Q(report_id__icontains=query) |
+        Q(title__icontains=query) |
+        Q(description__icontains=query) |
+        Q(location__icontains=query) |
+        Q(incident_type__icontains=query) |
+        Q(status__icontains=query)
+    )
+    if department is not ANY_DEPARTMENT:
+        reports = reports.filter(department=department)
+    return list(reports[:limit])
@@ -0,0 +1,213 @@
+import heapq
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+
+from .models import ArchivedCrimeReport, CrimeReport
+
+MANIFEST = 'manifest.json'
+CHUNK_SIZE = 5000
+MIN_CAPACITY = 1024
+
+STATUS_CODES = [code for code, _ in CrimeReport.STATUS_CHOICES]
+PRIORITY_CODES = [code for code, _ in CrimeReport.PRIORITY_CHOICES]
+INCIDENT_TYPE_CODES = [code for code, _ in CrimeReport.INCIDENT_TYPES]
+
+# Column name -> dtype. Categories are stored as indexes into the *_CODES
+# lists (-1 if unknown), timestamps as epoch seconds, a missing department
+# as 0 and missing coordinates as NaN.
+COLUMNS = {
+    'id': np.int64,
+    'reported_at': np.int64,
+    'updated_at': np.int64,
+    'status': np.int8,
+    'priority': np.int8,
+    'incident_type': np.int8,
+    'department_id': np.int64,
+    'latitude': np.float64,
+    'longitude': np.float64,
+}
+SOURCE_FIELDS = (
+    'id', 'date_reported', 'date_updated', 'status', 'priority',
+    'incident_type', 'department_id', 'latitude', 'longitude',
+)
+
+
+def _lookup(codes):
+    index = {code: i for i, code in enumerate(codes)}
+    return lambda value: index.get(value, -1)
+
+
+def _to_columns(rows):
+    """Converts (SOURCE_FIELDS) tuples into one NumPy array per column"""
+    status, priority, incident_type = _lookup(STATUS_CODES), _lookup(PRIORITY_CODES), _lookup(INCIDENT_TYPE_CODES)
+    ids, reported, updated, statuses, priorities, types, departments, lats, lngs = zip(*rows)
+    nan = float('nan')
+    return {
+        'id': np.array(ids, dtype=np.int64),
+        'reported_at': np.array([int(d.timestamp()) for d in reported], dtype=np.int64),
+        'updated_at': np.array([int(d.timestamp()) for d in updated], dtype=np.int64),
+        'status': np.array([status(v) for v in statuses], dtype=np.int8),
+        'priority': np.array([priority(v) for v in priorities], dtype=np.int8),
+        'incident_type': np.array([incident_type(v) for v in types], dtype=np.int8),
+        'department_id': np.array([v or 0 for v in departments], dtype=np.int64),
+        'latitude': np.array([nan if v is None else v for v in lats], dtype=np.float64),
+        'longitude': np.array([nan if v is None else v for v in lngs], dtype=np.float64),
+    }
+
+
+def snapshot_dir():
+    """settings.ANALYTICS_SNAPSHOT_DIR, read per call so overridden settings apply"""
+    return Path(getattr(settings, 'ANALYTICS_SNAPSHOT_DIR', settings.BASE_DIR / 'analytics'))
+
+
+# ===================== Reading =====================
+def read_manifest(directory=None):
+    directory = directory or snapshot_dir()
+    try:
+        with open(Path(directory) / MANIFEST) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def load_snapshot(directory=None):
+    """
+    Memory-maps every column read-only, trimmed to the rows the manifest
+    says are complete. Returns None if no snapshot has been built yet.
+    """
+    directory = directory or snapshot_dir()
+    manifest = read_manifest(directory)
+    if manifest is None:
+        return None
+    rows = manifest['rows']
+    return {
+        name: np.load(Path(directory) / manifest['files'][name], mmap_mode='r')[:rows]
+        for name in COLUMNS
+    }
+
+
+# ===================== Building =====================
+def _column_file(directory, name, generation):
+    return Path(directory) / f"{name}.{generation}.npy"
+
+
+def _grow(directory, manifest, needed):
+    """
+    Copies every column into a new, larger generation of files. Columns are
+    allocated with spare capacity so appends only rarely pay for a copy.
+    """
+    capacity = max(MIN_CAPACITY, manifest['capacity'])
+    while capacity < needed:
+        capacity *= 2
+    generation = manifest['generation'] + 1
+    files = {}
+    for name, dtype in COLUMNS.items():
+        path = _column_file(directory, name, generation)
+        column = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=(capacity,))
+        if manifest['rows']:
+            old = np.load(Path(directory) / manifest['files'][name], mmap_mode='r')
+            column[:manifest['rows']] = old[:manifest['rows']]
+        column.flush()
+        files[name] = path.name
+    return {**manifest, 'capacity': capacity, 'generation': generation, 'files': files}
+
+
+def _write_manifest(directory, manifest):
+    # Readers see either the old or the new manifest, never a partial one
+    tmp = Path(directory) / f"{MANIFEST}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f)
+    os.replace(tmp, Path(directory) / MANIFEST)
+
+
+def _remove_stale_generations(directory, manifest):
+    keep = set(manifest['files'].values()) | {MANIFEST}
+    for path in Path(directory).glob('*.npy'):
+        if path.name not in keep:
+            path.unlink(missing_ok=True)
+
+
+def build_snapshot(directory=None, full=False):
+    """
+    Brings the snapshot up to date and returns (appended, refreshed).
+
+    Reports newer than the last snapshotted id are appended. Reports edited
+    since the last build (a status change, say) are patched in place. Deleted
+    reports stay until the next full rebuild; archived ones are kept.
+    """
+    directory = Path(directory or snapshot_dir())
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = read_manifest(directory)
+    started = timezone.now()
+    if manifest is None or full:
+        # Keep counting generations so a rebuild never truncates files a reader has mapped
+        generation = manifest['generation'] if manifest else 0
+        manifest = {'rows': 0, 'capacity': 0, 'generation': generation, 'last_id': 0, 'built_at': None, 'files': {}}
+
+    appended = refreshed = 0
+    if manifest['rows'] and manifest['built_at']:
+        refreshed = _refresh_changed(directory, manifest, manifest['built_at'])
+
+    # Rows must be appended in id order; archived reports share the id sequence
+    reports = heapq.merge(*(
+        model.objects.filter(id__gt=manifest['last_id'])
+        .order_by('id')
+        .values_list(*SOURCE_FIELDS)
+        .iterator(chunk_size=CHUNK_SIZE)
+        for model in (CrimeReport, ArchivedCrimeReport)
+    ), key=lambda row: row[0])
+    batch = []
+    for row in reports:
+        batch.append(row)
+        if len(batch) == CHUNK_SIZE:
+            manifest = _append(directory, manifest, batch)
+            appended += len(batch)
+            batch = []
+    if batch:
+        manifest = _append(directory, manifest, batch)
+        appended += len(batch)
+    if not manifest['files']:
+        manifest = _grow(directory, manifest, MIN_CAPACITY)
+
+    manifest['built_at'] = started.isoformat()
+    _write_manifest(directory, manifest)
+    _remove_stale_generations(directory, manifest)
+    return appended, refreshed
+
+
+def _append(directory, manifest, rows):
+    columns = _to_columns(rows)
+    start, end = manifest['rows'], manifest['rows'] + len(rows)
+    if end > manifest['capacity'] or not manifest['files']:
+        manifest = _grow(directory, manifest, end)
+    for name in COLUMNS:
+        column = np.load(directory / manifest['files'][name], mmap_mode='r+')
+        column[start:end] = columns[name]
+        column.flush()
+    return {**manifest, 'rows': end, 'last_id': int(columns['id'][-1])}
+
+
+def _refresh_changed(directory, manifest, since):
+    """Rewrites rows of already-snapshotted reports that changed after `since`"""
+    changed = list(
+        CrimeReport.objects.filter(id__lte=manifest['last_id'], date_updated__gt=since)
+        .order_by('id')
+        .values_list(*SOURCE_FIELDS)
+    )
+    if not changed:
+        return 0
+    columns = _to_columns(changed)
+    ids = np.load(directory / manifest['files']['id'], mmap_mode='r')[:manifest['rows']]
+    # ids are appended in ascending order, so rows can be found by binary search
+    positions = np.searchsorted(ids, columns['id'])
+    found = (positions < len(ids)) & (ids[np.minimum(positions, len(ids) - 1)] == columns['id'])
+    for name in COLUMNS:
+        column = np.load(directory / manifest['files'][name], mmap_mode='r+')
+        column[positions[found]] = columns[name][found]
+        column.flush()
+    return int(found.sum())
@@ -0,0 +1,131 @@
+// static/js/chunked-upload.js
+
+// Sends one evidence file through the resumable upload API in checksummed
+// chunks. A dropped connection only costs the chunk in flight: the upload
+// asks the server for its last good offset and carries on from there, and
+// re-selecting the same file after a reload resumes the same upload.
+class ChunkedUpload {
+  constructor(file, field, { csrfToken, startUrl = "/uploads/", onProgress = () => {} } = {}) {
+    this.file = file;
+    this.field = field;
+    this.csrfToken = csrfToken;
+    this.startUrl = startUrl;
+    this.onProgress = onProgress;
+    this.storageKey = `upload:${field}:${file.name}:${file.size}:${file.lastModified}`;
+  }
+
+  // Chunk checksums need Web Crypto, which browsers only expose on secure
+  // origins (HTTPS or localhost); over plain HTTP crypto.subtle is undefined
+  static supported() {
+    return Boolean(window.isSecureContext && window.crypto && window.crypto.subtle && window.fetch);
+  }
+
+  async request(url, options = {}) {
+    const response = await fetch(url, {
+      credentials: "same-origin",
+      ...options,
+      headers: { "X-CSRFToken": this.csrfToken, ...(options.headers || {}) },
+    });
+    const data = await response.json().catch(() => ({}));
+    return { ok: response.ok, status: response.status, data };
+  }
+
+  async open() {
+    const saved = localStorage.getItem(this.storageKey);
+    if (saved) {
+      const { ok, data } = await this.request(`${this.startUrl}${saved}/`);
+      if (ok && data.status === "uploading") return data;
+    }
+    const form = new FormData();
+    form.append("field", this.field);
+    form.append("filename", this.file.name);
+    form.append("size", this.file.size);
+    form.append("content_type", this.file.type);
+    const { ok, data } = await this.request(this.startUrl, { method: "POST", body: form });
+    if (!ok) throw new Error(data.message || "Could not start upload");
+    localStorage.setItem(this.storageKey, data.upload_id);
+    return data;
+  }
+
+  async sha256(blob) {
+    const digest = await crypto.subtle.digest("SHA-256", await blob.arrayBuffer());
+    return Array.from(new Uint8Array(digest), (b) => b.toString(16).padStart(2, "0")).join("");
+  }
+
+  // Resolves with the upload id once the server has the whole file
+  async start() {
+    if (!ChunkedUpload.supported()) throw new Error("Chunked uploads need a secure (HTTPS) page");
+    const session = await this.open();
+    const url = `${this.startUrl}${session.upload_id}/`;
+    let offset = session.offset;
+    let failures = 0;
+
+    while (offset < this.file.size) {
+      const chunk = this.file.slice(offset, offset + session.chunk_size);
+      try {
+        const { ok, status, data } = await this.request(url, {
+          method: "PUT",
+          headers: { "Upload-Offset": offset, "Upload-Checksum": await this.sha256(chunk) },
+          body: chunk,
+        });
+        if (ok) {
+          offset = data.offset;
+          failures = 0;
+          this.onProgress(offset / this.file.size);
+          continue;
+        }
+        if (data.offset === undefined || status === 403 || status === 404) {
+          throw new Error(data.message || "Upload rejected");
+        }
+        offset = data.offset; // server tells us where to resume
+      } catch (err) {
+        if (!(err instanceof TypeError)) throw err; // TypeError: network failure, retry below
+      }
+      failures += 1;
+      if (failures > 8) throw new Error("Upload failed after repeated retries");
+      await new Promise((resolve) => setTimeout(resolve, Math.min(1000 * 2 ** failures, 30000)));
+    }
+
+    const { ok, data } = await this.request(`${url}complete/`, { method: "POST" });
+    if (!ok) throw new Error(data.message || "Could not finish upload");
+    localStorage.removeItem(this.storageKey);
+    return session.upload_id;
+  }
+}
+
+// Starts a chunked upload for a file picked in a report form. When it
+// finishes, the upload id goes into the `<field>_upload` hidden input and
+// the file inputs are cleared so the form POST stays small. If the upload
+// API fails the inputs are left alone and the file goes with the form.
+function stageChunkedUpload(form, file, field, fileInputs) {
+  if (!ChunkedUpload.supported()) return; // the file goes with the form as before
+  const csrfToken = form.querySelector("[name=csrfmiddlewaretoken]").value;
+  let hidden = form.querySelector(`[name=${field}_upload]`);
+  if (!hidden) {
+    hidden = document.createElement("input");
+    hidden.type = "hidden";
+    hidden.name = `${field}_upload`;
+    form.appendChild(hidden);
+  }
+  hidden.value = "";
+
+  form.pendingUploads = form.pendingUploads || {};
+  form.pendingUploads[field] = new ChunkedUpload(file, field, { csrfToken })
+    .start()
+    .then((uploadId) => {
+      hidden.value = uploadId;
+      fileInputs.forEach((input) => (input.value = ""));
+    })
+    .catch((err) => console.error(`Chunked upload of ${field} failed, sending with the form instead:`, err))
+    .finally(() => delete form.pendingUploads[field]);
+
+  if (!form.dataset.waitsForUploads) {
+    form.dataset.waitsForUploads = "1";
+    form.addEventListener("submit", (e) => {
+      const pending = Object.values(form.pendingUploads);
+      if (!pending.length) return;
+      e.preventDefault();
+      Promise.all(pending).then(() => form.submit());
+    });
+  }
+}
@@ -0,0 +1,98 @@
+import hashlib
+import os
+import re
+import tempfile
+
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+
+BLOB_DIR = 'evidence/blobs'
+READ_BLOCK = 64 * 1024
+BLOB_NAME = re.compile(r'^[0-9a-f]{64}(\.[a-z0-9]{1,10})?$')
+
+
+def blob_name(digest, ext=''):
+    """Storage name of a blob: evidence/blobs/ab/cd/abcd...<ext>"""
+    return f"{BLOB_DIR}/{digest[:2]}/{digest[2:4]}/{digest}{ext}"
+
+
+def is_blob_name(name):
+    return bool(name) and name.startswith(BLOB_DIR + '/') and bool(BLOB_NAME.match(os.path.basename(name)))
+
+
+def _extension(name):
+    ext = os.path.splitext(name or '')[1].lower()
+    return ext if re.fullmatch(r'\.[a-z0-9]{1,10}', ext) else ''
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Stores each file once under the SHA-256 of its contents, so the same
+    photo attached to ten reports takes the disk space of one. The name a
+    FileField is given (from upload_to) only contributes its extension.
+
+    Blobs are shared, so delete() leaves them alone: the blobs module
+    counts references and collect_garbage() removes blobs nothing points to.
+    Files saved before this storage existed keep their names and still open.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # The final name comes from the contents, so there is nothing to deduplicate here
+        return name
+
+    def _save(self, name, content):
+        ext = _extension(name)
+        if hasattr(content, 'temporary_file_path'):
+            # Already on disk (a large upload or a staged chunked upload): hash it in place
+            source, owned = content.temporary_file_path(), False
+            digest = hashlib.sha256()
+            with open(source, 'rb') as f:
+                for block in iter(lambda: f.read(READ_BLOCK), b''):
+                    digest.update(block)
+        else:
+            source, owned, digest = self._spool(content)
+
+        name = blob_name(digest.hexdigest(), ext)
+        full_path = self.path(name)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        if os.path.exists(full_path):
+            # Seen before: bump the mtime so garbage collection's grace period restarts
+            os.utime(full_path)
+            if owned:
+                os.unlink(source)
+        else:
+            file_move_safe(source, full_path, allow_overwrite=True)
+            if self.file_permissions_mode is not None:
+                os.chmod(full_path, self.file_permissions_mode)
+        return name
+
+    def _spool(self, content):
+        """Streams content into a temporary file next to the blobs, hashing as it goes"""
+        spool_dir = self.path(BLOB_DIR)
+        os.makedirs(spool_dir, exist_ok=True)
+        digest = hashlib.sha256()
+        fd, path = tempfile.mkstemp(dir=spool_dir, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in content.chunks(READ_BLOCK):
+                    if isinstance(chunk, str):
+                        chunk = chunk.encode()
+                    digest.update(chunk)
+                    f.write(chunk)
+        except BaseException:
+            os.unlink(path)
+            raise
+        return path, True, digest
+
+    def delete(self, name):
+        if is_blob_name(name):
+            return
+        super().delete(name)
+
+
+_evidence_storage = ContentAddressedStorage()
+
+
+def evidence_storage():
+    """Storage callable for the evidence FileFields"""
+    return _evidence_storage
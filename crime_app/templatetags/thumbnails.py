@@ -0,0 +1,39 @@
+from django import template
+from django.urls import reverse
+
+from crime_app.evidence import FIELDS as EVIDENCE_FIELDS
+from crime_app.thumbnails import SIZES, derivative_name
+
+register = template.Library()
+
+EVIDENCE_KINDS = {field: kind for kind, field in EVIDENCE_FIELDS.items()}
+
+# Derivatives are only deleted along with an unreferenced blob, so a positive lookup can be remembered
+_known = set()
+KNOWN_LIMIT = 20000
+
+
+@register.simple_tag
+def thumbnail_url(fieldfile, size='preview'):
+    """
+    URL of an image's derivative at one of thumbnails.SIZES, or of the
+    original while the derivative has not been generated yet. Report
+    evidence goes through the access-checked evidence-file view, never a
+    MEDIA_URL path; other images (officer photos) link to storage.
+    """
+    if not fieldfile:
+        return ''
+    if size not in SIZES:
+        raise template.TemplateSyntaxError(f"Unknown thumbnail size '{size}'")
+    kind = EVIDENCE_KINDS.get(fieldfile.field.name)
+    if kind is not None:
+        # The view picks the derivative or the original itself
+        return f"{reverse('evidence-file', args=[fieldfile.instance.pk, kind])}?size={size}"
+    name = derivative_name(fieldfile.name, size)
+    if name in _known:
+        return fieldfile.storage.url(name)
+    if fieldfile.storage.exists(name):
+        if len(_known) < KNOWN_LIMIT:
+            _known.add(name)
+        return fieldfile.storage.url(name)
+    return fieldfile.url
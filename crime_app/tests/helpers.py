@@ -0,0 +1,69 @@
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from crime_app import uploads
+from crime_app.models import CrimeReport, Department, Officer, User
+
+# The project's caches live on local disk and are shared with the dev
+# server; tests get private in-memory ones instead
+TEST_CACHES = {
+    alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': f'tests-{alias}'}
+    for alias in settings.CACHES
+}
+
+
+def clear_caches():
+    for alias in TEST_CACHES:
+        caches[alias].clear()
+
+
+@override_settings(CACHES=TEST_CACHES)
+class AppTestCase(TestCase):
+    """TestCase with empty private caches for every test"""
+
+    def setUp(self):
+        super().setUp()
+        clear_caches()
+
+    def use_temporary_media(self):
+        """Points MEDIA_ROOT (and the upload staging area under it) at a throwaway directory"""
+        media = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        media_settings = self.settings(MEDIA_ROOT=str(media))
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+        staging = mock.patch.object(uploads, 'STAGING_DIR', media / 'uploads' / 'staging')
+        staging.start()
+        self.addCleanup(staging.stop)
+        return media
+
+
+# ===================== Factories =====================
+def make_user(email, role='citizen', **fields):
+    return User.objects.create_user(username=email, email=email, password='pass-1234', role=role, **fields)
+
+
+def make_department(name="Central", **fields):
+    fields.setdefault('location', "Downtown")
+    return Department.objects.create(name=name, **fields)
+
+
+def make_officer(email, department, badge_number=None, **fields):
+    user = make_user(email, role='officer')
+    return Officer.objects.create(
+        user=user, department=department, rank='ASP', badge_number=badge_number or email, **fields
+    )
+
+
+def make_report(**fields):
+    fields.setdefault('title', 'Stolen bicycle')
+    fields.setdefault('description', 'The lock was cut outside the market')
+    fields.setdefault('location', 'Market Road')
+    fields.setdefault('incident_type', 'THEFT')
+    return CrimeReport.objects.create(**fields)
@@ -0,0 +1,85 @@
+import io
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.utils import timezone
+
+from crime_app.archive import archivable, archive_batch, archived_counts, find_report, reports_for
+from crime_app.counters import report_counts
+from crime_app.inbox import citizen_notified
+from crime_app.models import (
+    ArchivedCitizenNotification, ArchivedReportReminder, CitizenNotification, CrimeReport, ReportReminder,
+    ReportStatusChange, User,
+)
+from crime_app.search import search_reports
+
+from .helpers import AppTestCase, make_department, make_report, make_user
+
+
+def age(report, days):
+    CrimeReport.objects.filter(pk=report.pk).update(date_updated=timezone.now() - timedelta(days=days))
+
+
+class ArchiveTests(AppTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.department = make_department()
+        cls.citizen = make_user('ada@example.com')
+        cls.closed = make_report(
+            title="Stolen generator", department=cls.department, reporter=cls.citizen,
+            status='Resolved', latitude=6.5, longitude=3.4,
+        )
+        cls.duplicate = make_report(status='Dismissed', department=cls.department, duplicate_of=cls.closed)
+        cls.open = make_report(
+            title="Broken window", description="Someone threw a stone", location="Harbour Street",
+            incident_type='VANDALISM', department=cls.department, reporter=cls.citizen,
+        )
+        for report in (cls.closed, cls.duplicate, cls.open):
+            age(report, 200)
+
+    def test_archivable(self):
+        self.assertEqual(list(archivable()), [self.closed])
+        self.assertEqual(list(archivable(days=365)), [])
+        # A cluster waits while any of its duplicates is still open
+        CrimeReport.objects.filter(pk=self.duplicate.pk).update(status='Investigating')
+        self.assertEqual(list(archivable()), [])
+
+    def test_round_trip(self):
+        before = CrimeReport.objects.values().get(pk=self.closed.pk)
+        CitizenNotification.objects.create(
+            user=self.citizen, title="Resolved", message="Your case is closed", related_report=self.closed,
+        )
+        citizen_notified(self.citizen.pk)
+        ReportReminder.objects.create(report=self.closed, user=self.citizen, message="Follow up")
+
+        self.assertEqual(archive_batch([self.closed.pk]), (2, 1))
+
+        self.assertFalse(CrimeReport.objects.filter(pk__in=[self.closed.pk, self.duplicate.pk]).exists())
+        archived = find_report(self.closed.pk)
+        self.assertTrue(archived.is_archived)
+        for field in ('report_id', 'title', 'status', 'reporter_id', 'department_id', 'date_reported', 'latitude'):
+            self.assertEqual(getattr(archived, field), before[field], field)
+        self.assertIsNone(find_report(self.closed.pk, include_archived=False))
+        self.assertEqual(find_report(self.duplicate.pk).duplicate_of_id, self.closed.pk)
+
+        self.assertEqual([r.pk for r in reports_for(reporter=self.citizen)], [self.open.pk])
+        merged = reports_for(include_archived=True, reporter=self.citizen)
+        self.assertEqual([(r.pk, r.is_archived) for r in merged], [(self.open.pk, False), (self.closed.pk, True)])
+
+        self.assertEqual(ArchivedCitizenNotification.objects.get().related_report_id, self.closed.pk)
+        self.assertEqual(User.objects.get(pk=self.citizen.pk).unread_notifications, 0)
+        self.assertEqual(ArchivedReportReminder.objects.get().message, "Follow up")
+        self.assertTrue(ReportStatusChange.objects.filter(report_id=self.closed.pk).exists())
+
+        self.assertEqual(report_counts(department=self.department)['total'], 1)
+        self.assertEqual(archived_counts(department=self.department)['total'], 2)
+        self.assertEqual(search_reports("generator"), [])
+        self.assertEqual([r.pk for r in search_reports("generator", include_archived=True)], [self.closed.pk])
+
+    def test_command_moves_everything_archivable(self):
+        out = io.StringIO()
+        call_command('archive_reports', dry_run=True, stdout=out)
+        self.assertIn("1 reports", out.getvalue())
+        call_command('archive_reports', pause=0, stdout=io.StringIO())
+        self.assertEqual(list(CrimeReport.objects.all()), [self.open])
+        self.assertEqual(archived_counts()['total'], 2)
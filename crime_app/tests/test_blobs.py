@@ -0,0 +1,89 @@
+import hashlib
+from pathlib import Path
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+
+from crime_app.blobs import collect_garbage, migrate_legacy_evidence, recount_references
+from crime_app.models import CrimeReport, EvidenceBlob
+from crime_app.storage import blob_name, evidence_storage, is_blob_name
+
+from .helpers import AppTestCase, make_report
+
+PHOTO = b'\x89PNG same photo bytes' * 50
+
+
+def references():
+    return dict(EvidenceBlob.objects.values_list('name', 'references'))
+
+
+class ContentAddressedStorageTests(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        self.media = self.use_temporary_media()
+        self.storage = evidence_storage()
+
+    def attach(self, report, data=PHOTO, filename='photo.PNG'):
+        report.evidence_image.save(filename, ContentFile(data))
+        return report.evidence_image.name
+
+    def test_identical_uploads_share_one_blob(self):
+        first, second = make_report(), make_report()
+        name = self.attach(first)
+        self.assertEqual(name, blob_name(hashlib.sha256(PHOTO).hexdigest(), '.png'))
+        self.assertEqual(self.attach(second, filename='copy.png'), name)
+        self.assertEqual(len(list((self.media / 'evidence' / 'blobs').rglob('*.png'))), 1)
+        self.assertEqual(references(), {name: 2})
+        with second.evidence_image.open('rb') as f:
+            self.assertEqual(f.read(), PHOTO)
+
+    def test_references_follow_replacement_and_deletion(self):
+        first, second = make_report(), make_report()
+        old = self.attach(first)
+        self.attach(second)
+        new = self.attach(first, data=b'another photo')
+        self.assertEqual(references(), {old: 1, new: 1})
+        second.delete()
+        self.assertEqual(references(), {old: 0, new: 1})
+        # Deleting a field's file never touches a shared blob
+        self.storage.delete(new)
+        self.assertTrue(self.storage.exists(new))
+
+    def test_garbage_collection_removes_only_unreferenced_blobs(self):
+        kept, dropped = make_report(), make_report()
+        kept_name = self.attach(kept)
+        dropped_name = self.attach(dropped, data=b'unwanted')
+        # Derivatives are written next to the blob, outside the storage API
+        Path(self.storage.path(dropped_name + '.preview.webp')).write_bytes(b'thumb')
+        dropped.delete()
+
+        self.assertEqual(collect_garbage(), (0, 0))  # still within the grace period
+        self.assertEqual(collect_garbage(grace_seconds=0, dry_run=True)[0], 1)
+        self.assertTrue(self.storage.exists(dropped_name))
+        self.assertEqual(collect_garbage(grace_seconds=0), (1, len(b'unwanted')))
+        self.assertFalse(self.storage.exists(dropped_name))
+        self.assertFalse(self.storage.exists(dropped_name + '.preview.webp'))
+        self.assertTrue(self.storage.exists(kept_name))
+        self.assertEqual(references(), {kept_name: 1})
+
+    def test_recount_repairs_drift(self):
+        name = self.attach(make_report())
+        EvidenceBlob.objects.all().delete()
+        self.assertEqual(recount_references(), 1)
+        self.assertEqual(references(), {name: 1})
+        self.assertEqual(recount_references(), 0)
+
+    def test_legacy_files_move_into_the_blob_store(self):
+        legacy = FileSystemStorage()
+        first, second = make_report(), make_report()
+        paths = ('evidence/images/2025/01/01/a.jpg', 'evidence/images/2025/01/02/b.jpg')
+        for report, path in zip((first, second), paths):
+            legacy.save(path, ContentFile(PHOTO))
+            CrimeReport.objects.filter(pk=report.pk).update(evidence_image=path)
+
+        self.assertEqual(migrate_legacy_evidence(), 2)
+        names = set(CrimeReport.objects.values_list('evidence_image', flat=True))
+        self.assertEqual(len(names), 1)
+        self.assertTrue(is_blob_name(names.pop()))
+        self.assertFalse(any(legacy.exists(path) for path in paths))
+        self.assertEqual(list(references().values()), [2])
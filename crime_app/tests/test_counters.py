@@ -0,0 +1,57 @@
+from django.urls import reverse
+
+from crime_app.counters import ALL, NONE, reconcile_counters, report_counts
+from crime_app.models import ReportCounter
+
+from .helpers import AppTestCase, make_department, make_officer, make_report, make_user
+
+
+class CounterTests(AppTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.department = make_department()
+        cls.citizen = make_user('ada@example.com')
+
+    def test_counts_follow_report_writes(self):
+        report = make_report(department=self.department, reporter=self.citizen)
+        make_report(reporter=self.citizen, status='Resolved')
+        self.assertEqual(report_counts()['total'], 2)
+        self.assertEqual(report_counts(reporter=self.citizen)['Resolved'], 1)
+        self.assertEqual(report_counts(department=None)['total'], 1)
+
+        report.status = 'Investigating'
+        report.save()
+        counts = report_counts(department=self.department)
+        self.assertEqual((counts['Pending'], counts['Investigating']), (0, 1))
+
+        report.delete()
+        self.assertEqual(report_counts(department=self.department)['total'], 0)
+        self.assertEqual(reconcile_counters(), 0)
+
+    def test_deferred_instances_still_move_their_counts(self):
+        report = make_report(department=self.department)
+        deferred = type(report).objects.only('title').get(pk=report.pk)
+        deferred.status = 'Resolved'
+        deferred.save(update_fields=['status'])
+        self.assertEqual(report_counts(department=self.department)['Resolved'], 1)
+        self.assertEqual(reconcile_counters(), 0)
+
+    def test_reconcile_repairs_drift(self):
+        make_report(department=self.department, reporter=self.citizen)
+        ReportCounter.objects.filter(department_key=ALL, reporter_key=ALL).update(count=7)
+        ReportCounter.objects.filter(department_key=self.department.pk, reporter_key=ALL).delete()
+        ReportCounter.objects.create(
+            department_key=NONE, reporter_key=ALL, status='Dismissed', priority='Low', count=3,
+        )
+        self.assertEqual(reconcile_counters(), 3)
+        self.assertEqual(report_counts()['total'], 1)
+        self.assertEqual(report_counts(department=self.department)['Pending'], 1)
+        self.assertEqual(report_counts(department=None)['total'], 0)
+        self.assertEqual(reconcile_counters(), 0)
+
+    def test_officer_board_shows_counter_totals(self):
+        make_report(department=self.department, status='Investigating')
+        make_report(department=make_department("Harbour"))
+        self.client.force_login(make_officer('officer@example.com', self.department).user)
+        context = self.client.get(reverse('officer-board')).context
+        self.assertEqual((context['total_reports'], context['pending_cases']), (1, 0))
@@ -0,0 +1,86 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.urls import reverse
+
+from crime_app.models import CrimeReport, OutboxMessage, ReportSignatureBand
+
+from .helpers import AppTestCase, make_department, make_report, make_user
+
+LAGOS = (6.5244, 3.3792)
+TITLE = "Armed robbery at the Allen Avenue filling station"
+DESCRIPTION = "Three men with guns robbed the filling station attendants on Allen Avenue and fled on motorcycles"
+
+
+class DedupTests(AppTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.central = make_department()
+        cls.canonical = cls.file()
+
+    @classmethod
+    def file(cls, title=TITLE, description=DESCRIPTION, point=LAGOS, **fields):
+        fields.setdefault('department', cls.central)
+        fields.setdefault('incident_type', 'ROBBERY')
+        return make_report(title=title, description=description, latitude=point[0], longitude=point[1], **fields)
+
+    def test_canonical_report_is_signed_and_indexed(self):
+        self.assertIsNone(self.canonical.duplicate_of)
+        self.assertTrue(self.canonical.text_signature)
+        self.assertTrue(ReportSignatureBand.objects.filter(report=self.canonical).exists())
+
+    def test_close_similar_report_joins_the_cluster(self):
+        report = self.file(
+            title="Armed robbery at Allen Avenue filling station",
+            description=DESCRIPTION + " this evening",
+            point=(LAGOS[0] + 0.001, LAGOS[1]),
+        )
+        self.assertEqual(report.duplicate_of, self.canonical)
+        self.assertGreaterEqual(report.duplicate_score, 0.5)
+        # Later filings link to the canonical report, never to another duplicate
+        third = self.file(description=DESCRIPTION + " this evening")
+        self.assertEqual(third.duplicate_of, self.canonical)
+
+    def test_unrelated_reports_stay_separate(self):
+        cases = {
+            'other type': {'incident_type': 'ASSAULT'},
+            'other department': {'department': make_department("Harbour")},
+            'far away': {'point': (LAGOS[0] + 0.05, LAGOS[1])},
+            'different story': {'title': "Burglary of a pharmacy", 'description': "Shop window broken overnight and drugs taken"},
+        }
+        for case, fields in cases.items():
+            with self.subTest(case):
+                self.assertIsNone(self.file(**fields).duplicate_of)
+
+    def test_outside_the_time_window(self):
+        CrimeReport.objects.filter(pk=self.canonical.pk).update(
+            date_reported=self.canonical.date_reported - timedelta(hours=7)
+        )
+        self.assertIsNone(self.file().duplicate_of)
+
+    def test_without_coordinates_the_location_text_decides(self):
+        def file_at(location):
+            return make_report(
+                title=TITLE, description=DESCRIPTION, incident_type='ROBBERY', department=self.central, location=location,
+            )
+
+        first = file_at("Allen Avenue")
+        self.assertEqual(file_at("allen avenue").duplicate_of, first)
+        self.assertIsNone(file_at("Awolowo Road").duplicate_of)
+
+
+class SubmissionNotificationTests(AppTestCase):
+    def test_officers_hear_once_per_cluster(self):
+        central = make_department()
+        self.client.force_login(make_user('ada@example.com'))
+        data = {
+            'title': TITLE, 'description': DESCRIPTION, 'location': "Allen Avenue",
+            'incident_type': 'ROBBERY', 'department': central.pk, 'priority': 'High',
+            'latitude': LAGOS[0], 'longitude': LAGOS[1],
+        }
+        with mock.patch('builtins.print'):
+            for _ in range(3):
+                self.client.post(reverse('user-report'), data)
+        self.assertEqual(CrimeReport.objects.count(), 3)
+        self.assertEqual(CrimeReport.objects.filter(duplicate_of__isnull=True).count(), 1)
+        self.assertEqual(OutboxMessage.objects.filter(kind='officer_notification').count(), 1)
@@ -0,0 +1,97 @@
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from crime_app import evidence
+from crime_app.evidence import parse_range
+
+from .helpers import AppTestCase, make_report, make_user
+
+AUDIO = bytes(range(256)) * 40
+
+
+class ParseRangeTests(SimpleTestCase):
+    def test_ranges(self):
+        cases = [
+            (None, None),
+            ('', None),
+            ('bytes=0-99', (0, 99)),
+            ('bytes=500-', (500, 999)),
+            ('bytes=900-5000', (900, 999)),
+            ('bytes=-100', (900, 999)),
+            ('bytes=-5000', (0, 999)),
+            ('bytes = 0 - 9', (0, 9)),
+            # Whole file: unparseable, other units and multi-range requests
+            ('bytes=-', None),
+            ('items=0-9', None),
+            ('bytes=0-1,5-9', None),
+            # Unsatisfiable
+            ('bytes=1000-', False),
+            ('bytes=5-3', False),
+            ('bytes=-0', False),
+        ]
+        for header, expected in cases:
+            with self.subTest(header=header):
+                self.assertEqual(parse_range(header, 1000), expected)
+
+
+class EvidenceViewTests(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        self.use_temporary_media()
+        self.citizen = make_user('ada@example.com')
+        self.report = make_report(reporter=self.citizen)
+        self.report.evidence_audio.save('note.mp3', ContentFile(AUDIO))
+        self.url = reverse('evidence-file', args=[self.report.pk, 'audio'])
+        self.client.force_login(self.citizen)
+
+    def test_whole_file(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), AUDIO)
+        self.assertEqual(response['Content-Type'], 'audio/mpeg')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('private', response['Cache-Control'])
+        self.assertTrue(response['Content-Disposition'].startswith('inline; filename="CR-'))
+
+    def test_ranges(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=100-199')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f"bytes 100-199/{len(AUDIO)}")
+        self.assertEqual(b''.join(response.streaming_content), AUDIO[100:200])
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=-10')
+        self.assertEqual(b''.join(response.streaming_content), AUDIO[-10:])
+
+        response = self.client.get(self.url, HTTP_RANGE=f'bytes={len(AUDIO)}-')
+        self.assertEqual((response.status_code, response['Content-Range']), (416, f"bytes */{len(AUDIO)}"))
+
+    def test_conditional_requests(self):
+        etag = self.client.get(self.url)['ETag']
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        # A stale If-Range gets the whole (changed) file instead of a range
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=etag)
+        self.assertEqual(response.status_code, 206)
+
+    def test_only_people_who_may_see_the_report(self):
+        self.client.force_login(make_user('bob@example.com'))
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_missing_evidence_and_unknown_kinds(self):
+        self.assertEqual(self.client.get(reverse('evidence-file', args=[self.report.pk, 'video'])).status_code, 404)
+        self.assertEqual(self.client.get(reverse('evidence-file', args=[self.report.pk, 'scan'])).status_code, 404)
+        self.assertEqual(self.client.get(self.url, {'size': 'preview'}).status_code, 404)
+
+    def test_download_and_front_server_offload(self):
+        response = self.client.get(self.url, {'download': 1})
+        self.assertTrue(response['Content-Disposition'].startswith('attachment;'))
+        with mock.patch.object(evidence, 'SENDFILE', 'x-accel-redirect'):
+            response = self.client.get(self.url)
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/' + self.report.evidence_audio.name)
+        self.assertEqual(response.content, b'')
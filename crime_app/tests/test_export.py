@@ -0,0 +1,85 @@
+import csv
+import io
+import json
+from datetime import timedelta
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.urls import reverse
+from django.utils import timezone
+
+from crime_app import export
+from crime_app.export import FORMATS, HEADER, aiter_lines, export_querysets, export_rows
+from crime_app.models import CrimeReport
+
+from .helpers import AppTestCase, make_department, make_report, make_user
+
+
+class ExportTests(AppTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = make_user('admin@example.com', role='admin')
+        cls.central = make_department()
+        cls.citizen = make_user('ada@example.com', first_name="Ada", phone="0801")
+        cls.old = make_report(title="Old, \"quoted\" title", department=cls.central, reporter=cls.citizen)
+        CrimeReport.objects.filter(pk=cls.old.pk).update(date_reported=timezone.now() - timedelta(days=10))
+        cls.resolved = make_report(title="Resolved", status='Resolved', department=cls.central)
+        cls.loose = make_report(title="Unassigned")
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.admin)
+
+    def ndjson(self, **params):
+        response = self.client.get(reverse('export-reports', args=['ndjson']), params)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        return [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+
+    def test_csv_has_a_header_and_one_row_per_report(self):
+        response = self.client.get(reverse('export-reports', args=['csv']))
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment; filename="crime-reports-', response['Content-Disposition'])
+        rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(rows[0], HEADER)
+        self.assertEqual([row[1] for row in rows[1:]], ["Old, \"quoted\" title", "Resolved", "Unassigned"])
+        first = dict(zip(HEADER, rows[1]))
+        self.assertEqual(
+            (first['department'], first['reporter_email'], first['reporter_phone']),
+            ("Central", 'ada@example.com', "0801"),
+        )
+
+    def test_filters(self):
+        today = timezone.localdate().isoformat()
+        self.assertEqual([r['title'] for r in self.ndjson(status='Resolved')], ["Resolved"])
+        self.assertEqual(len(self.ndjson(department=self.central.pk)), 2)
+        self.assertEqual([r['title'] for r in self.ndjson(date_from=today)], ["Resolved", "Unassigned"])
+        self.assertEqual(len(self.ndjson(date_to=today)), 3)
+
+    def test_bad_filters_and_formats(self):
+        cases = [
+            ('ndjson', {'status': 'Lost'}),
+            ('ndjson', {'date_from': '2025-13-01'}),
+            ('ndjson', {'department': 'x'}),
+            ('xml', {}),
+        ]
+        for fmt, params in cases:
+            with self.subTest(fmt=fmt, params=params):
+                self.assertEqual(self.client.get(reverse('export-reports', args=[fmt]), params).status_code, 400)
+
+    def test_admins_only(self):
+        self.client.force_login(self.citizen)
+        self.assertEqual(self.client.get(reverse('export-reports', args=['csv'])).status_code, 403)
+
+    def test_async_lines_match_sync_lines(self):
+        async def collect(lines, querysets):
+            return ''.join([piece async for piece in aiter_lines(lines, querysets)])
+
+        with mock.patch.object(export, 'CHUNK_SIZE', 2):
+            for fmt, (lines, _) in FORMATS.items():
+                with self.subTest(fmt=fmt):
+                    expected = ''.join(lines(export_rows(export_querysets())))
+                    self.assertEqual(async_to_sync(collect)(lines, export_querysets()), expected)
+            self.assertEqual(
+                async_to_sync(collect)(export.csv_lines, export_querysets(status='Dismissed')),
+                ''.join(export.csv_lines(())),
+            )
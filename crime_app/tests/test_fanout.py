@@ -0,0 +1,49 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from crime_app.models import Notification, OutboxMessage
+from crime_app.outbox import drain
+from crime_app.utils import notify_department_officers
+
+from .helpers import AppTestCase, make_department, make_officer, make_report
+
+
+def notification_inserts(queries):
+    return [q for q in queries if q['sql'].startswith('INSERT INTO "crime_app_notification"')]
+
+
+class NotifyDepartmentOfficersTests(AppTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.department = make_department()
+        cls.acting = make_officer('acting@example.com', cls.department)
+        cls.on_duty = make_officer('on-duty@example.com', cls.department)
+        cls.off_duty = make_officer('off-duty@example.com', cls.department, on_duty=False)
+        cls.elsewhere = make_officer('elsewhere@example.com', make_department("Harbour"))
+
+    def notified(self):
+        return set(Notification.objects.values_list('officer_id', flat=True))
+
+    def test_one_insert_for_the_whole_department(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(notify_department_officers(self.department, "New report"), 3)
+        self.assertEqual(len(notification_inserts(queries.captured_queries)), 1)
+        self.assertEqual(self.notified(), {self.acting.pk, self.on_duty.pk, self.off_duty.pk})
+
+    def test_skips_the_acting_officer_and_those_off_duty(self):
+        notify_department_officers(self.department.pk, "Status changed", exclude=self.acting, on_duty_only=True)
+        self.assertEqual(self.notified(), {self.on_duty.pk})
+
+    def test_no_department_notifies_nobody(self):
+        self.assertEqual(notify_department_officers(None, "Lost report"), 0)
+        self.assertFalse(Notification.objects.exists())
+
+    def test_status_update_reaches_only_colleagues_on_duty(self):
+        report = make_report(department=self.department)
+        self.client.force_login(self.acting.user)
+        self.client.post(reverse('update-status', args=[report.pk]), {'status': 'Investigating'})
+        message = OutboxMessage.objects.get(kind='officer_notification')
+        self.assertTrue(message.payload['on_duty_only'])
+        drain()
+        self.assertEqual(self.notified(), {self.on_duty.pk})
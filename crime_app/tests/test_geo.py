@@ -0,0 +1,89 @@
+import io
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from crime_app.geo import MAX_QUERY_CELLS, bbox_around, cells_for_bbox, encode_geohash, haversine_m
+from crime_app.models import CrimeReport
+
+from .helpers import AppTestCase, make_department, make_officer, make_report, make_user
+
+ORIGIN = (6.5244, 3.3792)
+
+
+def offset(metres_north, metres_east=0):
+    """A point the given distance from ORIGIN (small distances only)"""
+    lat = ORIGIN[0] + metres_north / 111195
+    return lat, ORIGIN[1] + metres_east / (111195 * 0.99352)
+
+
+class GeohashTests(SimpleTestCase):
+    def test_known_geohash(self):
+        self.assertEqual(encode_geohash(57.64911, 10.40744, 11), 'u4pruydqqvj')
+
+    def test_bbox_cells_cover_the_box(self):
+        box = bbox_around(*ORIGIN, 500)
+        precision, prefixes = cells_for_bbox(*box)
+        self.assertLessEqual(len(prefixes), MAX_QUERY_CELLS)
+        for lat in (box[0], ORIGIN[0], box[2]):
+            for lng in (box[1], ORIGIN[1], box[3]):
+                self.assertIn(encode_geohash(lat, lng, precision), prefixes)
+
+    def test_large_boxes_coarsen(self):
+        precision, prefixes = cells_for_bbox(*bbox_around(*ORIGIN, 50000))
+        self.assertLess(precision, 7)
+        self.assertLessEqual(len(prefixes), MAX_QUERY_CELLS)
+
+    def test_haversine(self):
+        self.assertAlmostEqual(haversine_m(*ORIGIN, *offset(300)), 300, delta=1)
+
+
+class NearbyTests(AppTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.here = make_report(title="Here", latitude=ORIGIN[0], longitude=ORIGIN[1])
+        cls.close = make_report(title="Close", latitude=offset(200)[0], longitude=offset(200)[1])
+        cls.edge = make_report(title="Edge", latitude=offset(0, 480)[0], longitude=offset(0, 480)[1])
+        cls.far = make_report(title="Far", latitude=offset(800)[0], longitude=offset(800)[1])
+        make_report(title="Nowhere")
+
+    def test_save_fills_the_geohash(self):
+        self.assertEqual(self.here.geohash, encode_geohash(*ORIGIN))
+        self.assertIsNone(CrimeReport.objects.get(title="Nowhere").geohash)
+
+    def test_nearby_filters_and_orders_by_distance(self):
+        found = list(CrimeReport.objects.nearby(*ORIGIN, radius_m=500))
+        self.assertEqual([r.title for r in found], ["Here", "Close", "Edge"])
+        self.assertAlmostEqual(found[1].distance_m, 200, delta=2)
+
+    def test_within_bbox(self):
+        south, west, north, east = bbox_around(*offset(200), 50)
+        self.assertEqual(list(CrimeReport.objects.within_bbox(south, west, north, east)), [self.close])
+
+    def test_recent_neighbours_only(self):
+        CrimeReport.objects.filter(pk=self.close.pk).update(date_reported=timezone.now() - timedelta(days=2))
+        self.assertEqual([r.title for r in self.here.get_nearby_reports()], ["Edge"])
+
+    def test_backfill_repairs_geohashes(self):
+        CrimeReport.objects.update(geohash=None)
+        call_command('backfill_geohash', stdout=io.StringIO())
+        self.assertEqual(CrimeReport.objects.get(pk=self.edge.pk).geohash, encode_geohash(*offset(0, 480)))
+
+
+class NearbyPanelTests(AppTestCase):
+    def test_officers_only_see_their_department_nearby(self):
+        central = make_department()
+        report = make_report(department=central, latitude=ORIGIN[0], longitude=ORIGIN[1])
+        neighbour = make_report(title="Ours", department=central, latitude=offset(100)[0], longitude=ORIGIN[1])
+        make_report(title="Theirs", department=make_department("Harbour"), latitude=offset(50)[0], longitude=ORIGIN[1])
+
+        self.client.force_login(make_officer('officer@example.com', central).user)
+        response = self.client.get(reverse('report-detail', args=[report.pk]))
+        self.assertEqual(response.context['nearby_reports'], [neighbour])
+
+        self.client.force_login(make_user('admin@example.com', role='admin'))
+        response = self.client.get(reverse('crime-detail', args=[report.pk]))
+        self.assertEqual(len(response.context['nearby_reports']), 2)
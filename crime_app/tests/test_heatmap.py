@@ -0,0 +1,78 @@
+from django.core.cache import cache
+from django.urls import reverse
+
+from crime_app.heatmap import ALL_DEPARTMENTS, ALL_TYPES, get_tile, tile_for, tile_key
+from crime_app.models import CrimeReport
+
+from .helpers import AppTestCase, make_department, make_officer, make_report, make_user
+
+ZOOM = 12
+LAGOS = (6.5244, 3.3792)
+ABUJA = (9.0765, 7.3986)
+
+
+class HeatmapTileViewTests(AppTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.central = make_department()
+        cls.harbour = make_department("Harbour")
+        cls.officer = make_officer('officer@example.com', cls.central)
+        make_report(department=cls.central, latitude=LAGOS[0], longitude=LAGOS[1])
+        make_report(department=cls.harbour, latitude=LAGOS[0], longitude=LAGOS[1])
+        cls.x, cls.y = tile_for(*LAGOS, ZOOM)
+
+    def get(self, fmt='json', **params):
+        return self.client.get(reverse('heatmap-tile', args=[ZOOM, self.x, self.y, fmt]), params)
+
+    def test_officers_see_their_own_department(self):
+        self.client.force_login(self.officer.user)
+        self.assertEqual(self.get().json()['total'], 1)
+
+    def test_admins_see_every_department(self):
+        self.client.force_login(make_user('admin@example.com', role='admin'))
+        body = self.get(type='THEFT').json()
+        self.assertEqual(body['total'], 2)
+        self.assertEqual(len(body['cells']), 1)
+        self.assertEqual(self.get('png')['Content-Type'], 'image/png')
+
+    def test_citizens_and_bad_filters_are_refused(self):
+        self.client.force_login(make_user('ada@example.com'))
+        self.assertEqual(self.get().status_code, 403)
+        self.client.force_login(self.officer.user)
+        self.assertEqual(self.get(window='1y').status_code, 400)
+
+
+class HeatmapInvalidationTests(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        self.report = make_report(latitude=LAGOS[0], longitude=LAGOS[1])
+        self.lagos = tile_key('7d', ALL_TYPES, ALL_DEPARTMENTS, ZOOM, *tile_for(*LAGOS, ZOOM))
+        self.abuja = tile_key('7d', ALL_TYPES, ALL_DEPARTMENTS, ZOOM, *tile_for(*ABUJA, ZOOM))
+        for point in (LAGOS, ABUJA):
+            get_tile('7d', ALL_TYPES, ALL_DEPARTMENTS, ZOOM, *tile_for(*point, ZOOM))
+
+    def test_new_report_drops_its_tiles(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            make_report(latitude=LAGOS[0], longitude=LAGOS[1])
+        self.assertIsNone(cache.get(self.lagos))
+        self.assertIsNotNone(cache.get(self.abuja))
+
+    def test_status_change_keeps_cached_tiles(self):
+        for report in (self.report, CrimeReport.objects.get(), CrimeReport.objects.only('status').get()):
+            report.status = 'Investigating'
+            with self.captureOnCommitCallbacks(execute=True):
+                report.save()
+            self.assertIsNotNone(cache.get(self.lagos))
+
+    def test_move_drops_old_and_new_tiles(self):
+        report = CrimeReport.objects.only('latitude', 'longitude').get()
+        report.latitude, report.longitude = ABUJA
+        with self.captureOnCommitCallbacks(execute=True):
+            report.save()
+        self.assertIsNone(cache.get(self.lagos))
+        self.assertIsNone(cache.get(self.abuja))
+
+    def test_delete_drops_its_tiles(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.report.delete()
+        self.assertIsNone(cache.get(self.lagos))
@@ -0,0 +1,94 @@
+import numpy as np
+from django.db import transaction
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from crime_app.history import _grouped_stats, resolution_stats, time_in_status
+from crime_app.models import ReportStatusChange
+
+from .helpers import AppTestCase, make_department, make_officer, make_report, make_user
+
+HOUR = 3600
+
+
+class GroupedStatsTests(SimpleTestCase):
+    def test_mean_and_nearest_rank_p90_per_group(self):
+        keys = np.array(['b', 'a', 'b', 'a', 'a'] + ['c'] * 10)
+        seconds = np.array([2, 10, 4, 30, 20] + list(range(1, 11)), dtype=np.float64) * HOUR
+        stats = {key: (count, mean, p90) for key, count, mean, p90 in _grouped_stats(keys, seconds)}
+        self.assertEqual(stats['a'], (3, 20.0, 30.0))
+        self.assertEqual(stats['b'], (2, 3.0, 4.0))
+        self.assertEqual(stats['c'], (10, 5.5, 9.0))
+        self.assertEqual(_grouped_stats(np.array([]), np.array([])), [])
+
+
+class StatusLogTests(AppTestCase):
+    def test_every_status_change_is_logged_once(self):
+        report = make_report()
+        report.title = "Edited title"
+        report.save()
+        report.status = 'Investigating'
+        report.save()
+        report.status = 'Resolved'
+        report.save(update_fields=['status'])
+        transitions = list(ReportStatusChange.objects.order_by('id').values_list('from_status', 'to_status'))
+        self.assertEqual(transitions, [('', 'Pending'), ('Pending', 'Investigating'), ('Investigating', 'Resolved')])
+        last = ReportStatusChange.objects.latest('id')
+        self.assertIsNotNone(last.seconds_in_previous)
+
+    def test_log_shares_the_change_transaction(self):
+        report = make_report()
+        with self.assertRaises(ZeroDivisionError), transaction.atomic():
+            report.status = 'Dismissed'
+            report.save()
+            1 / 0
+        self.assertFalse(ReportStatusChange.objects.filter(to_status='Dismissed').exists())
+
+    def test_officer_update_records_who_changed_it(self):
+        department = make_department()
+        officer = make_officer('officer@example.com', department)
+        report = make_report(department=department)
+        self.client.force_login(officer.user)
+        self.client.post(reverse('update-status', args=[report.pk]), {'status': 'Investigating'})
+        change = ReportStatusChange.objects.get(to_status='Investigating')
+        self.assertEqual((change.changed_by_id, change.department_id), (officer.user_id, department.pk))
+
+
+class SlaTests(AppTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.central = make_department()
+        cls.harbour = make_department("Harbour")
+        report = make_report(department=cls.central)
+        ReportStatusChange.objects.all().delete()
+
+        def change(department, incident_type, from_status, to_status, hours_in_previous, hours_since_reported):
+            ReportStatusChange.objects.create(
+                report=report, department=department, incident_type=incident_type,
+                from_status=from_status, to_status=to_status,
+                seconds_in_previous=hours_in_previous * HOUR, seconds_since_reported=hours_since_reported * HOUR,
+            )
+
+        change(cls.central, 'THEFT', 'Pending', 'Investigating', 1, 1)
+        change(cls.central, 'THEFT', 'Investigating', 'Resolved', 3, 4)
+        change(cls.central, 'THEFT', 'Investigating', 'Resolved', 8, 10)
+        change(cls.harbour, 'ASSAULT', 'Pending', 'Resolved', 6, 6)
+
+    def test_resolution_stats_per_department_and_type(self):
+        stats = {(s['department_id'], s['incident_type']): s for s in resolution_stats()}
+        self.assertEqual(stats[(self.central.pk, 'THEFT')]['resolved'], 2)
+        self.assertEqual(stats[(self.central.pk, 'THEFT')]['mean_hours'], 7.0)
+        self.assertEqual(stats[(self.central.pk, 'THEFT')]['p90_hours'], 10.0)
+        self.assertEqual(stats[(self.harbour.pk, 'ASSAULT')]['mean_hours'], 6.0)
+        self.assertEqual(len(resolution_stats(department=self.harbour.pk)), 1)
+
+    def test_time_in_status(self):
+        stats = time_in_status()
+        self.assertEqual(stats['Investigating'], {'transitions': 2, 'mean_hours': 5.5, 'p90_hours': 8.0})
+        self.assertEqual(stats['Pending']['transitions'], 2)
+
+    def test_report_view(self):
+        self.client.force_login(make_user('admin@example.com', role='admin'))
+        body = self.client.get(reverse('sla-report'), {'department': self.central.pk, 'days': 7}).json()
+        self.assertEqual([s['resolved'] for s in body['resolution']], [2])
+        self.assertEqual(self.client.get(reverse('sla-report'), {'days': 'week'}).status_code, 400)
@@ -0,0 +1,205 @@
+import csv
+import io
+import json
+import shutil
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from crime_app.archive import archive_batch
+from crime_app.counters import report_counts
+from crime_app.ingest import Importer
+from crime_app.models import CrimeReport, ReportStatusChange
+
+from .helpers import AppTestCase, make_department, make_report, make_user
+
+
+def row(**fields):
+    values = {
+        'title': "Stolen bicycle", 'description': "Taken from the rack", 'location': "Market Road",
+        'incident_type': 'Theft',
+    }
+    values.update(fields)
+    return values
+
+
+class ImportChunkTests(AppTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.department = make_department()
+        cls.citizen = make_user('ada@example.com')
+
+    def test_valid_rows_are_written_with_their_dates(self):
+        reported = timezone.now() - timedelta(days=400)
+        result = Importer().import_chunk([
+            row(report_id='CR-LEGACY01', department="central", reporter_email='ADA@example.com',
+                priority='high', status='Resolved', latitude='6.5', longitude='3.4',
+                date_reported=reported.isoformat()),
+            row(title="Broken window", incident_type='VANDALISM'),
+        ])
+        self.assertEqual((result.imported, result.skipped, result.errors), (2, 0, []))
+
+        legacy = CrimeReport.objects.get(report_id='CR-LEGACY01')
+        self.assertEqual(
+            (legacy.department_id, legacy.reporter_id, legacy.priority, legacy.status, legacy.incident_type),
+            (self.department.pk, self.citizen.pk, 'High', 'Resolved', 'THEFT'),
+        )
+        self.assertEqual((legacy.date_reported, legacy.date_updated), (reported, reported))
+        self.assertTrue(legacy.geohash)
+        self.assertTrue(CrimeReport.objects.get(title="Broken window").report_id)
+        self.assertEqual(report_counts()['total'], 2)
+        # Filed as Pending, then moved to its imported status
+        self.assertEqual(
+            list(ReportStatusChange.objects.filter(report=legacy).values_list('to_status', flat=True).order_by('at', 'pk')),
+            ['Pending', 'Resolved'],
+        )
+
+    def test_invalid_rows_are_reported_by_row_number(self):
+        future = (timezone.now() + timedelta(days=1)).isoformat()
+        rows = [
+            row(),
+            row(title=''),
+            row(incident_type='Jaywalking'),
+            row(latitude='6.5'),
+            row(latitude='north', longitude='3.4'),
+            row(date_reported=future),
+            row(department='Nowhere'),
+            row(reporter_email='nobody@example.com'),
+            row(report_id='CR-TWICE001'),
+            row(report_id='CR-TWICE001'),
+            "not an object",
+        ]
+        result = Importer().import_chunk(rows, first_row=11)
+        self.assertEqual(result.imported, 2)
+        self.assertEqual(result.errors, [
+            (12, "title is required"),
+            (13, "Unknown incident_type"),
+            (14, "latitude and longitude go together"),
+            (15, "latitude and longitude must be numbers"),
+            (16, "date_reported is in the future"),
+            (17, "Unknown department"),
+            (18, "Unknown reporter_email"),
+            (20, "report_id appears twice in the batch"),
+            (21, "Not a report object"),
+        ])
+        self.assertEqual(CrimeReport.objects.count(), 2)
+
+    def test_existing_report_ids_are_skipped(self):
+        live = make_report(report_id='CR-LIVE0001')
+        archived = make_report(report_id='CR-ARCH0001', status='Resolved')
+        archive_batch([archived.pk])
+        result = Importer().import_chunk([
+            row(report_id=live.report_id), row(report_id=archived.report_id), row(report_id='CR-NEW00001'),
+        ])
+        self.assertEqual((result.imported, result.skipped, result.failed), (1, 2, 0))
+        self.assertEqual(CrimeReport.objects.filter(report_id=live.report_id).count(), 1)
+        self.assertFalse(CrimeReport.objects.filter(report_id=archived.report_id).exists())
+
+    def test_dry_run_writes_nothing(self):
+        result = Importer(dry_run=True).import_chunk([row(), row(title='')])
+        self.assertEqual((result.imported, result.failed), (1, 1))
+        self.assertFalse(CrimeReport.objects.exists())
+
+    def test_legacy_chunk_costs_the_same_queries_however_many_rows(self):
+        # Rows older than LIVE_WINDOW skip the per-report duplicate check and tile invalidation
+        reported = (timezone.now() - timedelta(days=400)).isoformat()
+
+        def queries_for(count, start):
+            rows = [
+                row(report_id=f'CR-Q{start + i:07d}', reporter_email='ada@example.com', date_reported=reported)
+                for i in range(count)
+            ]
+            with CaptureQueriesContext(connection) as queries:
+                Importer().import_chunk(rows)
+            return len(queries)
+
+        # The first chunk also creates the counter rows
+        queries_for(1, 1000)
+        self.assertEqual(queries_for(3, 0), queries_for(30, 100))
+
+
+class ImportCommandTests(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.path = directory / 'reports.csv'
+        with open(self.path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(row(report_id='')))
+            writer.writeheader()
+            writer.writerows(row(report_id=f'CR-CMD{i:05d}', title=f"Report {i}") for i in range(5))
+        self.progress = Path(f"{self.path}.progress.json")
+
+    def run_import(self, *args):
+        call_command('import_reports', str(self.path), '--chunk-size=2', *args, stdout=io.StringIO())
+
+    def test_resume_continues_after_the_last_committed_chunk(self):
+        # As if a run had died after committing its first chunk
+        Importer().import_chunk([row(report_id='CR-CMD00000', title="Report 0"), row(report_id='CR-CMD00001', title="Report 1")])
+        self.progress.write_text(json.dumps({'rows': 2, 'imported': 2, 'skipped': 0, 'rejected': 0, 'done': False}))
+
+        with self.assertRaisesMessage(CommandError, "unfinished import at row 2"):
+            self.run_import()
+        with mock.patch.object(Importer, 'import_chunk', wraps=Importer().import_chunk) as import_chunk:
+            self.run_import('--resume')
+        self.assertEqual([call.kwargs['first_row'] for call in import_chunk.call_args_list], [3, 5])
+        self.assertEqual(CrimeReport.objects.count(), 5)
+        self.assertEqual(
+            json.loads(self.progress.read_text()),
+            {'rows': 5, 'imported': 5, 'skipped': 0, 'rejected': 0, 'done': True},
+        )
+
+    def test_restart_skips_what_is_already_on_file(self):
+        self.run_import()
+        self.run_import('--restart')
+        self.assertEqual(CrimeReport.objects.count(), 5)
+        self.assertEqual(json.loads(self.progress.read_text())['skipped'], 5)
+
+
+class ImportViewTests(AppTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = make_user('admin@example.com', role='admin')
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.admin)
+
+    def post(self, body, content_type='application/json', **params):
+        url = reverse('import-reports')
+        if params:
+            url += '?' + '&'.join(f'{key}={value}' for key, value in params.items())
+        return self.client.post(url, body, content_type=content_type)
+
+    def test_json_batch(self):
+        response = self.post(json.dumps({'reports': [row(), row(reporter_email='nobody@example.com')]}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['imported'], 1)
+        self.assertEqual(response.json()['errors'], [{'row': 2, 'message': "Unknown reporter_email"}])
+
+    def test_csv_and_ndjson_bodies(self):
+        csv_body = "title,description,location,incident_type\nStolen phone,At the bus stop,Main Street,THEFT\n"
+        self.assertEqual(self.post(csv_body, 'text/csv').json()['imported'], 1)
+        ndjson_body = json.dumps(row()) + "\n{broken\n"
+        data = self.post(ndjson_body, 'application/x-ndjson').json()
+        self.assertEqual((data['imported'], data['failed']), (1, 1))
+
+    def test_dry_run(self):
+        self.assertEqual(self.post(json.dumps([row()]), dry_run=1).json()['imported'], 1)
+        self.assertFalse(CrimeReport.objects.exists())
+
+    def test_rejected_bodies(self):
+        self.assertEqual(self.post("not json").status_code, 400)
+        self.assertEqual(self.post(json.dumps({'rows': []})).status_code, 400)
+        with mock.patch('crime_app.views.MAX_API_ROWS', 1):
+            self.assertEqual(self.post(json.dumps([row(), row()])).status_code, 413)
+        with self.settings(DATA_UPLOAD_MAX_MEMORY_SIZE=100):
+            self.assertEqual(self.post(json.dumps([row()] * 5)).status_code, 413)
+        self.assertFalse(CrimeReport.objects.exists())
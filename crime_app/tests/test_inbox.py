@@ -0,0 +1,147 @@
+import json
+from datetime import timedelta
+
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from crime_app.context_processors import officer_notifications
+from crime_app.inbox import (
+    citizen_notified, mark_all_citizen_notifications_read, mark_citizen_notification_read,
+    mark_officer_notifications_read, read_at, recent_citizen_notifications, recent_officer_notifications,
+    reconcile_unread_counts,
+)
+from crime_app.middleware import load_principal
+from crime_app.models import CitizenNotification, Notification, Officer, User
+from crime_app.utils import notify_department_officers
+
+from .helpers import AppTestCase, make_department, make_officer, make_user
+
+
+def notify_citizen(user, title):
+    CitizenNotification.objects.create(user=user, title=title, message=title)
+    citizen_notified(user.pk, title, title)
+
+
+class UnreadCounterTests(AppTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.department = make_department()
+        cls.officer = make_officer('officer@example.com', cls.department)
+        cls.citizen = make_user('ada@example.com')
+
+    def test_fan_out_bumps_officer_counters(self):
+        for i in range(3):
+            notify_department_officers(self.department, f"Report {i}")
+        self.officer.refresh_from_db()
+        self.assertEqual(self.officer.unread_notifications, 3)
+
+    def test_recent_list_is_cached_until_a_write(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            notify_department_officers(self.department, "First")
+        officer = Officer.objects.get(pk=self.officer.pk)
+        self.assertEqual([n.message for n in recent_officer_notifications(officer)], ["First"])
+        with self.assertNumQueries(0):
+            recent_officer_notifications(officer)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            notify_department_officers(self.department, "Second")
+        self.assertEqual([n.message for n in recent_officer_notifications(officer)], ["Second", "First"])
+
+    def test_citizen_counter_and_recent_list(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(7):
+                notify_citizen(self.citizen, f"Update {i}")
+        self.citizen.refresh_from_db()
+        self.assertEqual(self.citizen.unread_notifications, 7)
+        recent = recent_citizen_notifications(self.citizen)
+        self.assertEqual([n.title for n in recent], [f"Update {i}" for i in range(6, 1, -1)])
+        self.assertFalse(any(n.seen for n in recent))
+
+    def test_bell_runs_no_sql_once_warm(self):
+        notify_department_officers(self.department, "New report")
+        request = RequestFactory().get('/')
+        request.user = User.objects.get(pk=self.officer.user_id)
+        request.session = {}
+        request.principal = load_principal(request)
+        officer_notifications(request)
+        with self.assertNumQueries(0):
+            context = officer_notifications(request)
+        self.assertEqual(context['unread_count'], 1)
+        self.assertEqual(len(context['recent_notifications']), 1)
+
+    def test_reconcile_repairs_drifted_counters(self):
+        notify_department_officers(self.department, "New report")
+        notify_citizen(self.citizen, "Received")
+        Officer.objects.update(unread_notifications=40)
+        User.objects.filter(pk=self.citizen.pk).update(unread_notifications=0)
+        self.assertEqual(reconcile_unread_counts(), 2)
+        self.assertEqual(Officer.objects.get(pk=self.officer.pk).unread_notifications, 1)
+        self.assertEqual(User.objects.get(pk=self.citizen.pk).unread_notifications, 1)
+        self.assertEqual(reconcile_unread_counts(), 0)
+
+
+class WatermarkTests(AppTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.department = make_department()
+        cls.officer = make_officer('officer@example.com', cls.department)
+        cls.citizen = make_user('ada@example.com')
+
+    def test_mark_all_costs_the_same_for_any_backlog(self):
+        def mark_all_queries():
+            officer = Officer.objects.select_related('user').get(pk=self.officer.pk)
+            with CaptureQueriesContext(connection) as queries:
+                mark_officer_notifications_read(officer)
+            return [q['sql'] for q in queries.captured_queries if not q['sql'].startswith(('SAVEPOINT', 'RELEASE'))]
+
+        notify_department_officers(self.department, "Only one")
+        mark_all_queries()
+        small = mark_all_queries()
+        Notification.objects.bulk_create(
+            Notification(officer=self.officer, message=f"Backlog {i}") for i in range(200)
+        )
+        self.assertEqual(len(mark_all_queries()), len(small))
+        # One watermark row and the counter; no notification row is touched
+        self.assertEqual(len(small), 2)
+        self.assertFalse(any('"crime_app_notification"' in sql for sql in small))
+
+    def test_watermark_and_per_item_flags_decide_read_state(self):
+        old = CitizenNotification.objects.create(user=self.citizen, title="Old", message="")
+        mark_all_citizen_notifications_read(self.citizen)
+        self.assertEqual(User.objects.get(pk=self.citizen.pk).unread_notifications, 0)
+
+        user = User.objects.get(pk=self.citizen.pk)
+        newer = [
+            CitizenNotification.objects.create(
+                user=user, title=title, message="", created_at=read_at(user, 'citizen') + timedelta(seconds=1),
+            )
+            for title in ("New", "Newer")
+        ]
+        for notification in newer:
+            citizen_notified(user.pk)
+        self.assertTrue(mark_citizen_notification_read(user, newer[0].pk))
+        # Already read through the watermark: nothing to decrement
+        self.assertTrue(mark_citizen_notification_read(user, old.pk))
+        self.assertEqual(User.objects.get(pk=user.pk).unread_notifications, 1)
+        seen = {n.title: n.seen for n in recent_citizen_notifications(user)}
+        self.assertEqual(seen, {"Old": True, "New": True, "Newer": False})
+        self.assertEqual(reconcile_unread_counts(), 0)
+
+    def test_views(self):
+        CitizenNotification.objects.create(user=self.citizen, title="Mine", message="")
+        citizen_notified(self.citizen.pk)
+        theirs = CitizenNotification.objects.create(user=make_user('bob@example.com'), title="Theirs", message="")
+
+        self.client.force_login(self.citizen)
+        response = self.client.post(reverse('mark_notification_read', args=[theirs.pk]))
+        self.assertEqual(json.loads(response.content)['status'], 'error')
+        self.client.post(reverse('mark_all_notifications_read'))
+        self.assertEqual(User.objects.get(pk=self.citizen.pk).unread_notifications, 0)
+        self.assertLessEqual(read_at(User.objects.get(pk=self.citizen.pk), 'citizen'), timezone.now())
+
+        self.assertEqual(self.client.post(reverse('mark-notifications-read')).status_code, 403)
+        self.client.force_login(self.officer.user)
+        self.assertEqual(self.client.post(reverse('mark-notifications-read')).json(), {'status': 'success'})
@@ -0,0 +1,101 @@
+import asyncio
+import json
+import threading
+import time
+from unittest import mock
+
+from django.db import connection, transaction
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from crime_app import live
+from crime_app.inbox import citizen_notified
+from crime_app.models import LiveEvent
+from crime_app.utils import notify_department_officers
+
+from .helpers import TEST_CACHES, AppTestCase, make_department, make_officer, make_user
+
+
+def live_event_inserts(queries):
+    return [q for q in queries if q['sql'].startswith('INSERT INTO "crime_app_liveevent"')]
+
+
+class PublishTests(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        self.broker = live.DatabaseBroker()
+        self.broker._pruned_at = time.monotonic()
+        patcher = mock.patch.object(live, '_broker', self.broker)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_department_fan_out_is_one_insert(self):
+        department = make_department()
+        officers = [make_officer(f"officer{i}@example.com", department) for i in range(5)]
+        with CaptureQueriesContext(connection) as queries:
+            with self.captureOnCommitCallbacks(execute=True):
+                notify_department_officers(department, "New report")
+        self.assertEqual(len(live_event_inserts(queries.captured_queries)), 1)
+        self.assertEqual(
+            sorted(LiveEvent.objects.values_list('channel', flat=True)),
+            sorted(live.officer_channel(officer.pk) for officer in officers),
+        )
+        self.assertEqual(LiveEvent.objects.first().payload['message'], "New report")
+
+    def test_failed_publish_does_not_fail_the_committed_write(self):
+        citizen = make_user('ada@example.com')
+        with mock.patch.object(self.broker, 'publish_many', side_effect=RuntimeError("broker down")):
+            with self.assertLogs(level='ERROR'):
+                with self.captureOnCommitCallbacks(execute=True):
+                    citizen_notified(citizen.pk, "Hello", "World")
+        citizen.refresh_from_db()
+        self.assertEqual(citizen.unread_notifications, 1)
+
+
+class StreamViewTests(AppTestCase):
+    def test_wsgi_gets_no_content_instead_of_a_hung_stream(self):
+        self.client.force_login(make_user('ada@example.com'))
+        response = self.client.get(reverse('notification-stream'))
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(response.streaming)
+
+    def test_pages_only_open_the_stream_under_asgi(self):
+        self.client.force_login(make_user('ada@example.com'))
+        response = self.client.get(reverse('citizen_notifications'))
+        self.assertFalse(response.context['live_notifications'])
+
+
+@override_settings(CACHES=TEST_CACHES)
+class CrossThreadDeliveryTests(TransactionTestCase):
+    """Events published by another connection reach a subscriber through the poller"""
+
+    def test_event_reaches_subscriber(self):
+        broker = live.DatabaseBroker()
+        citizen = make_user('ada@example.com')
+        channel = live.citizen_channel(citizen.pk)
+
+        def publish_elsewhere():
+            with transaction.atomic():
+                citizen_notified(citizen.pk, "Hello", "from the outbox worker")
+            connection.close()
+
+        async def listen():
+            async with broker.subscribe(channel) as queue:
+                # Let the poller take its starting position before publishing
+                await asyncio.sleep(live.POLL_SECONDS * 2)
+                await asyncio.to_thread(publish_elsewhere)
+                return await asyncio.wait_for(queue.get(), timeout=5)
+
+        with mock.patch.object(live, '_broker', broker):
+            event = asyncio.run(listen())
+        self.assertEqual((event['type'], event['title']), ('notification', "Hello"))
+        json.loads(live.format_sse(event).split('data: ', 1)[1])
+
+        # The poller winds down once nobody is subscribed
+        for _ in range(50):
+            if broker._poller is None:
+                break
+            time.sleep(0.1)
+        self.assertIsNone(broker._poller)
+        self.assertFalse(any(t.name == 'live-events' for t in threading.enumerate()))
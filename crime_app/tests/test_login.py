@@ -0,0 +1,69 @@
+import io
+from unittest import mock
+
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import get_hasher
+from django.core.management import call_command
+from django.urls import reverse
+
+from crime_app.backends import EmailBackend
+from crime_app.models import User
+
+from .helpers import AppTestCase, make_department, make_officer, make_user
+
+
+class EmailLoginTests(AppTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.citizen = make_user('Ada@Example.com ')
+        cls.officer = make_officer('officer@example.com', make_department())
+
+    def setUp(self):
+        super().setUp()
+        hasher = get_hasher()
+        self.encode = mock.patch.object(hasher, 'encode', wraps=hasher.encode)
+        self.hashes = self.encode.start()
+        self.addCleanup(self.encode.stop)
+
+    def login(self, email, password='pass-1234'):
+        self.hashes.reset_mock()
+        return self.client.post(reverse('my-login'), {'email': email, 'password': password})
+
+    def test_emails_are_stored_and_matched_normalized(self):
+        self.assertEqual(User.objects.get(pk=self.citizen.pk).email, 'ada@example.com')
+        self.assertRedirects(self.login('  ADA@example.COM'), reverse('user-board'), fetch_redirect_response=False)
+        self.assertEqual(self.hashes.call_count, 1)
+
+    def test_roles_land_on_their_boards(self):
+        response = self.login('officer@example.com')
+        self.assertRedirects(response, reverse('officer-board'), fetch_redirect_response=False)
+        make_user('admin@example.com', role='admin')
+        self.assertRedirects(self.login('admin@example.com'), reverse('dashboard'), fetch_redirect_response=False)
+
+    def test_failures_cost_one_hash_too(self):
+        for email, password in (('ada@example.com', 'wrong'), ('nobody@example.com', 'pass-1234')):
+            with self.subTest(email=email):
+                response = self.login(email, password)
+                self.assertEqual(response.status_code, 200)
+                self.assertContains(response, "Invalid email or password.")
+                self.assertEqual(self.hashes.call_count, 1)
+
+    def test_inactive_users_are_refused(self):
+        User.objects.filter(pk=self.citizen.pk).update(is_active=False)
+        self.assertEqual(self.login('ada@example.com').status_code, 200)
+        self.assertIsNone(authenticate(None, email='ada@example.com', password='pass-1234'))
+
+    def test_get_user_joins_the_officer_and_department(self):
+        with self.assertNumQueries(1):
+            user = EmailBackend().get_user(self.officer.user_id)
+            self.assertEqual(user.officer.department.name, "Central")
+
+
+class BenchmarkLoginTests(AppTestCase):
+    def test_reports_one_hash_per_login(self):
+        out = io.StringIO()
+        call_command('benchmark_login', iterations=1, stdout=out)
+        rows = {line[:16].strip(): line.split() for line in out.getvalue().splitlines()[2:]}
+        self.assertEqual(set(rows), {'success', 'wrong password', 'unknown email'})
+        for label, columns in rows.items():
+            self.assertEqual(columns[-2], '1.0', label)
@@ -0,0 +1,99 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.db import transaction
+from django.utils import timezone
+
+from crime_app import outbox
+from crime_app.models import CitizenNotification, Notification, OutboxMessage
+
+from .helpers import AppTestCase, make_department, make_officer, make_user
+
+
+def explode(payload):
+    raise RuntimeError("handler broke")
+
+
+class OutboxTests(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        handlers = mock.patch.dict(outbox.HANDLERS, {'explode': explode})
+        handlers.start()
+        self.addCleanup(handlers.stop)
+
+    def make_due(self):
+        OutboxMessage.objects.update(available_at=timezone.now() - timedelta(seconds=1))
+
+    def test_messages_only_exist_if_the_change_commits(self):
+        with self.assertRaises(ZeroDivisionError):
+            with transaction.atomic():
+                outbox.enqueue('explode')
+                1 / 0
+        self.assertFalse(OutboxMessage.objects.exists())
+
+    def test_drain_delivers_notifications(self):
+        department = make_department()
+        officer = make_officer('officer@example.com', department)
+        citizen = make_user('ada@example.com')
+        outbox.queue_officer_notification(department, "New report")
+        outbox.queue_citizen_notification(citizen, "Received", "Thanks")
+        self.assertIsNone(outbox.queue_officer_notification(None, "Nobody to tell"))
+
+        self.assertEqual(outbox.drain(), (2, 0))
+        self.assertEqual(list(OutboxMessage.objects.values_list('status', flat=True)), ['done', 'done'])
+        self.assertTrue(Notification.objects.filter(officer=officer, message="New report").exists())
+        self.assertTrue(CitizenNotification.objects.filter(user=citizen, title="Received").exists())
+        self.assertEqual(outbox.drain(), (0, 0))
+
+    def test_failures_back_off_then_give_up(self):
+        message = outbox.enqueue('explode')
+        with self.assertLogs(outbox.logger, 'ERROR'):
+            self.assertEqual(outbox.drain(), (0, 1))
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts), ('pending', 1))
+        self.assertEqual(message.last_error, "RuntimeError: handler broke")
+        self.assertGreater(message.available_at, timezone.now() + timedelta(seconds=1))
+        # Not due again until the backoff has passed
+        self.assertEqual(outbox.drain(), (0, 0))
+
+        with self.assertLogs(outbox.logger, 'ERROR'):
+            for _ in range(outbox.MAX_ATTEMPTS - 1):
+                self.make_due()
+                outbox.drain()
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts), ('failed', outbox.MAX_ATTEMPTS))
+        self.make_due()
+        self.assertEqual(outbox.drain(), (0, 0))
+
+    def test_retry_delay_is_capped(self):
+        self.assertEqual(outbox.retry_delay(1), timedelta(seconds=2))
+        self.assertEqual(outbox.retry_delay(3), timedelta(seconds=8))
+        self.assertEqual(outbox.retry_delay(30), timedelta(minutes=10))
+
+    def test_failure_in_a_batch_spares_the_rest(self):
+        citizen = make_user('ada@example.com')
+        outbox.queue_citizen_notification(citizen, "First", "One")
+        broken = outbox.queue_citizen_notification(citizen, "Second", "Two")
+        outbox.queue_citizen_notification(citizen, "Third", "Three")
+        OutboxMessage.objects.filter(pk=broken.pk).update(payload={'user_id': 0})
+
+        with self.assertLogs(outbox.logger, 'ERROR'):
+            self.assertEqual(outbox.drain(), (2, 1))
+        self.assertEqual(
+            sorted(CitizenNotification.objects.values_list('title', flat=True)), ["First", "Third"]
+        )
+        broken.refresh_from_db()
+        self.assertEqual((broken.status, broken.attempts), ('pending', 1))
+
+    def test_leases_keep_others_away_until_they_expire(self):
+        message = outbox.enqueue('explode')
+        claimed = outbox.claim_batch()
+        self.assertEqual([m.pk for m in claimed], [message.pk])
+        self.assertEqual(claimed[0].status, 'processing')
+        self.assertEqual(outbox.claim_batch(), [])
+
+        # The worker holding it died; once the lease runs out it is redelivered
+        OutboxMessage.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+        reclaimed = outbox.claim_batch()
+        self.assertEqual([m.pk for m in reclaimed], [message.pk])
+        self.assertNotEqual(reclaimed[0].claim_token, claimed[0].claim_token)
@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+
+from django.test import SimpleTestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from crime_app.models import CrimeReport
+from crime_app.utils import decode_cursor, encode_cursor, keyset_paginate
+
+from .helpers import AppTestCase, make_report, make_user
+
+
+class CursorTests(SimpleTestCase):
+    def test_round_trip(self):
+        stamp = datetime(2025, 3, 1, 12, 30, 15, 250000, tzinfo=timezone.get_fixed_timezone(60))
+        report = CrimeReport(pk=42, date_reported=stamp)
+        self.assertEqual(decode_cursor(encode_cursor(report)), (stamp, 42))
+
+    def test_malformed_cursors_decode_to_none(self):
+        for cursor in ('', 'not a cursor!', 'bm9waXBl', 'MjAyNS0wMy0wMXx4', '_w=='):
+            with self.subTest(cursor=cursor):
+                self.assertIsNone(decode_cursor(cursor))
+
+
+class KeysetPaginateTests(AppTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Five reports sharing one timestamp, so only the id breaks ties
+        stamp = timezone.now() - timedelta(days=1)
+        cls.reports = [make_report(title=f"Report {i}") for i in range(5)]
+        CrimeReport.objects.update(date_reported=stamp)
+        cls.newest_first = sorted((r.pk for r in cls.reports), reverse=True)
+
+    def test_pages_forward_then_back(self):
+        queryset = CrimeReport.objects.all()
+        first = keyset_paginate(queryset, per_page=2)
+        second = keyset_paginate(queryset, after=first['next_cursor'], per_page=2)
+        third = keyset_paginate(queryset, after=second['next_cursor'], per_page=2)
+        pages = [[r.pk for r in page['items']] for page in (first, second, third)]
+        self.assertEqual(sum(pages, []), self.newest_first)
+        self.assertIsNone(first['prev_cursor'])
+        self.assertIsNone(third['next_cursor'])
+
+        back = keyset_paginate(queryset, before=third['prev_cursor'], per_page=2)
+        self.assertEqual([r.pk for r in back['items']], pages[1])
+        self.assertIsNotNone(back['prev_cursor'])
+
+    def test_garbage_cursor_starts_from_the_top(self):
+        page = keyset_paginate(CrimeReport.objects.all(), after='garbage', per_page=2)
+        self.assertEqual([r.pk for r in page['items']], self.newest_first[:2])
+
+
+class ReportedCrimeViewTests(AppTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = make_user('admin@example.com', role='admin')
+        for i in range(30):
+            make_report(title=f"Report {i}")
+
+    def test_pages_through_every_report_once(self):
+        self.client.force_login(self.admin)
+        url = reverse('reported-crime')
+        first = self.client.get(url)
+        self.assertEqual(len(first.context['reports']), 25)
+        second = self.client.get(url, {'after': first.context['next_cursor']})
+        seen = [r.pk for r in first.context['reports']] + [r.pk for r in second.context['reports']]
+        self.assertEqual(sorted(seen), sorted(CrimeReport.objects.values_list('pk', flat=True)))
+        self.assertIsNone(second.context['next_cursor'])
+
+    def test_non_admins_are_turned_away(self):
+        self.client.force_login(make_user('ada@example.com'))
+        self.assertRedirects(self.client.get(reverse('reported-crime')), reverse('my-login'))
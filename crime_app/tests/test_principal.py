@@ -0,0 +1,113 @@
+import json
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory
+from django.urls import reverse
+
+from crime_app.middleware import PRINCIPAL_SESSION_KEY, PRINCIPAL_TTL, load_principal
+from crime_app.models import User
+
+from .helpers import AppTestCase, make_department, make_officer, make_user
+
+
+class PrincipalTests(AppTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.department = make_department()
+        cls.officer = make_officer('officer@example.com', cls.department)
+
+    def principal_for(self, user, session=None):
+        request = RequestFactory().get('/')
+        request.user = user
+        request.session = {} if session is None else session
+        return load_principal(request)
+
+    def test_roles(self):
+        self.assertEqual(self.principal_for(AnonymousUser()).role, 'anonymous')
+        self.assertTrue(self.principal_for(make_user('ada@example.com')).is_citizen)
+        self.assertTrue(self.principal_for(make_user('admin@example.com', role='admin')).is_admin)
+        superuser = User.objects.create_superuser('root@example.com', 'root@example.com', 'pass-1234')
+        self.assertTrue(self.principal_for(superuser).is_admin)
+
+        principal = self.principal_for(User.objects.get(pk=self.officer.user_id))
+        self.assertEqual(principal.role, 'officer')
+        self.assertEqual((principal.officer_id, principal.department_id), (self.officer.pk, self.department.pk))
+
+    def test_officer_and_department_load_in_one_query(self):
+        user = User.objects.get(pk=self.officer.user_id)
+        with self.assertNumQueries(1):
+            principal = self.principal_for(user)
+            self.assertEqual(principal.department.name, "Central")
+            self.assertEqual(principal.officer.badge_number, self.officer.badge_number)
+
+    def test_session_answers_until_the_ttl_runs_out(self):
+        session = {}
+        user = User.objects.get(pk=self.officer.user_id)
+        self.principal_for(user, session)
+        self.officer.delete()
+        user = User.objects.get(pk=user.pk)
+        with self.assertNumQueries(0):
+            self.assertTrue(self.principal_for(user, session).is_officer)
+        with mock.patch('crime_app.middleware.time.time', return_value=session[PRINCIPAL_SESSION_KEY]['at'] + PRINCIPAL_TTL):
+            self.assertFalse(self.principal_for(user, session).is_officer)
+
+    def test_officer_board_resolves_the_principal_once(self):
+        self.client.force_login(self.officer.user)
+        self.client.get(reverse('officer-board'))
+        # The joined user/officer/department load, the counters and two report lists
+        with self.assertNumQueries(4):
+            self.assertEqual(self.client.get(reverse('officer-board')).status_code, 200)
+
+
+class CachedPrincipalTests(AppTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = make_user('admin@example.com', role='admin')
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.admin)
+        # Prime the session's cached principal
+        self.assertEqual(self.client.get(reverse('sla-report')).status_code, 200)
+        self.assertIn(PRINCIPAL_SESSION_KEY, self.client.session)
+
+    def assertLockedOut(self):
+        self.assertEqual(self.client.get(reverse('export-reports', args=['ndjson'])).status_code, 403)
+        self.assertEqual(self.client.get(reverse('sla-report')).status_code, 403)
+        response = self.client.post(reverse('import-reports'), json.dumps([]), content_type='application/json')
+        self.assertEqual(response.status_code, 403)
+        self.assertNotIn(PRINCIPAL_SESSION_KEY, self.client.session)
+
+    def test_deactivated_user_loses_access_at_once(self):
+        self.admin.is_active = False
+        self.admin.save()
+        self.assertLockedOut()
+
+    def test_deleted_user_loses_access_at_once(self):
+        self.admin.delete()
+        self.assertLockedOut()
+
+    def test_password_change_ends_other_sessions(self):
+        self.admin.set_password('changed-5678')
+        self.admin.save()
+        self.assertLockedOut()
+
+    def test_cache_is_not_reused_for_another_user(self):
+        citizen = make_user('ada@example.com')
+        session = self.client.session
+        cached = session[PRINCIPAL_SESSION_KEY]
+        self.client.force_login(citizen)
+        session = self.client.session
+        session[PRINCIPAL_SESSION_KEY] = cached
+        session.save()
+        self.assertEqual(self.client.get(reverse('sla-report')).status_code, 403)
+
+
+class ContextProcessorTests(AppTestCase):
+    def test_officer_page_survives_officer_row_removed_within_ttl(self):
+        officer = make_officer('officer@example.com', make_department())
+        self.client.force_login(officer.user)
+        self.assertEqual(self.client.get(reverse('officer-board')).status_code, 200)
+        officer.delete()
+        self.assertEqual(self.client.get(reverse('officer-board')).status_code, 200)
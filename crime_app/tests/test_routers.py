@@ -0,0 +1,69 @@
+import time
+from importlib import import_module
+from unittest import mock
+
+from django.conf import settings
+from django.db import router
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from crime_app import routers
+from crime_app.models import CrimeReport
+from crime_app.routers import (
+    STICKY_SECONDS, STICKY_SESSION_KEY, ReplicaRouter, ReplicaStickinessMiddleware, read_replica,
+)
+
+from .helpers import AppTestCase
+
+
+@read_replica
+def where_reads_go(request):
+    return HttpResponse(router.db_for_read(CrimeReport))
+
+
+class ReplicaRoutingTests(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        configured = mock.patch.object(routers, 'replica_configured', return_value=True)
+        configured.start()
+        self.addCleanup(configured.stop)
+
+    def request(self, method='get'):
+        request = getattr(RequestFactory(), method)('/')
+        request.session = import_module(settings.SESSION_ENGINE).SessionStore()
+        request.session.save()
+        return request
+
+    def test_only_decorated_safe_requests_read_from_the_replica(self):
+        self.assertEqual(where_reads_go(self.request()).content, b'replica')
+        self.assertEqual(where_reads_go(self.request('post')).content, b'default')
+        # Outside the view the flag is reset
+        self.assertEqual(router.db_for_read(CrimeReport), 'default')
+        self.assertEqual(router.db_for_write(CrimeReport), 'default')
+
+    def test_sessions_that_wrote_read_their_writes(self):
+        request = self.request('post')
+        ReplicaStickinessMiddleware(lambda r: HttpResponse())(request)
+        self.assertGreater(request.session[STICKY_SESSION_KEY], time.time())
+
+        follow_up = self.request()
+        follow_up.session = request.session
+        self.assertEqual(where_reads_go(follow_up).content, b'default')
+        with mock.patch('crime_app.routers.time.time', return_value=time.time() + STICKY_SECONDS + 1):
+            self.assertEqual(where_reads_go(follow_up).content, b'replica')
+
+    def test_safe_requests_do_not_pin(self):
+        request = self.request()
+        ReplicaStickinessMiddleware(lambda r: HttpResponse())(request)
+        self.assertNotIn(STICKY_SESSION_KEY, request.session)
+
+    def test_without_a_replica_everything_stays_on_the_primary(self):
+        with mock.patch.object(routers, 'replica_configured', return_value=False):
+            self.assertEqual(where_reads_go(self.request()).content, b'default')
+            request = self.request('post')
+            ReplicaStickinessMiddleware(lambda r: HttpResponse())(request)
+            self.assertNotIn(STICKY_SESSION_KEY, request.session)
+
+    def test_replicas_are_never_migrated(self):
+        self.assertTrue(ReplicaRouter().allow_migrate('default', 'crime_app'))
+        self.assertFalse(ReplicaRouter().allow_migrate('replica', 'crime_app'))
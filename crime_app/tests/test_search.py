@@ -0,0 +1,72 @@
+from django.db import connection
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from crime_app.models import CrimeReport
+from crime_app.search import FTS_TABLE, build_match_query, rebuild_index, search_reports
+
+from .helpers import AppTestCase, make_department, make_officer, make_report, make_user
+
+
+class MatchQueryTests(SimpleTestCase):
+    def test_words_are_quoted_and_the_last_is_a_prefix(self):
+        self.assertEqual(build_match_query('Stolen BIKE'), '"stolen" "bike"*')
+
+    def test_operators_and_punctuation_are_not_syntax(self):
+        self.assertEqual(build_match_query('title:car OR "x'), '"title" "car" "or" "x"*')
+        self.assertIsNone(build_match_query(' -*" '))
+
+
+class SearchReportsTests(AppTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.central = make_department()
+        cls.harbour = make_department("Harbour")
+        cls.bike = make_report(title="Stolen bicycle", department=cls.central)
+        cls.car = make_report(title="Car window smashed", description="Bicycle rack damaged too", department=cls.harbour)
+        cls.loose = make_report(title="Bicycle left in road", department=None)
+
+    def ids(self, *args, **kwargs):
+        return [report.pk for report in search_reports(*args, **kwargs)]
+
+    def test_title_matches_rank_above_description_matches(self):
+        self.assertEqual(self.ids('bicycle')[-1], self.car.pk)
+        self.assertCountEqual(self.ids('bicy'), [self.bike.pk, self.car.pk, self.loose.pk])
+
+    def test_department_scoping(self):
+        self.assertEqual(self.ids('bicycle', department=self.central), [self.bike.pk])
+        self.assertEqual(self.ids('bicycle', department=self.harbour.pk), [self.car.pk])
+        self.assertEqual(self.ids('bicycle', department=None), [self.loose.pk])
+
+    def test_index_follows_edits_and_deletes(self):
+        self.bike.title = "Stolen scooter"
+        self.bike.description = "Taken from the porch"
+        self.bike.save()
+        self.assertEqual(self.ids('scooter'), [self.bike.pk])
+        self.assertNotIn(self.bike.pk, self.ids('bicycle'))
+        self.car.delete()
+        self.assertEqual(self.ids('smashed'), [])
+
+    def test_rebuild_restores_the_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        self.assertEqual(self.ids('bicycle'), [])
+        self.assertEqual(rebuild_index(), CrimeReport.objects.count())
+        self.assertEqual(len(self.ids('bicycle')), 3)
+
+
+class SearchViewTests(AppTestCase):
+    def test_officers_only_find_their_department(self):
+        central = make_department()
+        own = make_report(title="Stolen bicycle", department=central)
+        make_report(title="Stolen bicycle", department=make_department("Harbour"))
+        self.client.force_login(make_officer('officer@example.com', central).user)
+        response = self.client.get(reverse('search-report'), {'q': 'bicycle'})
+        self.assertEqual([r.pk for r in response.context['results']], [own.pk])
+
+    def test_admins_search_everything(self):
+        make_report(title="Stolen bicycle", department=make_department())
+        make_report(title="Stolen bicycle")
+        self.client.force_login(make_user('admin@example.com', role='admin'))
+        response = self.client.get(reverse('search-crime'), {'q': 'stolen'})
+        self.assertEqual(len(response.context['results']), 2)
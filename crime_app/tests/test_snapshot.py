@@ -0,0 +1,55 @@
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.urls import reverse
+
+from crime_app.models import CrimeReport
+from crime_app.snapshot import STATUS_CODES, build_snapshot, load_snapshot, read_manifest, snapshot_dir
+
+from .helpers import AppTestCase, make_department, make_report, make_user
+
+
+class SnapshotTests(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        snapshot_settings = self.settings(ANALYTICS_SNAPSHOT_DIR=self.directory)
+        snapshot_settings.enable()
+        self.addCleanup(snapshot_settings.disable)
+        self.department = make_department()
+        self.reports = [make_report(department=self.department, latitude=6.5, longitude=3.4) for _ in range(3)]
+
+    def test_follows_the_setting(self):
+        self.assertEqual(snapshot_dir(), self.directory)
+        self.assertIsNone(load_snapshot())
+        build_snapshot()
+        self.assertTrue((self.directory / 'manifest.json').exists())
+
+    def test_appends_new_and_refreshes_changed_reports(self):
+        self.assertEqual(build_snapshot(), (3, 0))
+        self.reports[0].status = 'Resolved'
+        self.reports[0].save()
+        make_report()
+        self.assertEqual(build_snapshot(), (1, 1))
+
+        snapshot = load_snapshot()
+        self.assertEqual(list(snapshot['id']), sorted([r.pk for r in self.reports]) + [CrimeReport.objects.latest('id').pk])
+        self.assertEqual(read_manifest()['rows'], 4)
+        self.assertEqual(snapshot['status'][0], STATUS_CODES.index('Resolved'))
+        self.assertEqual(list(snapshot['department_id']), [self.department.pk] * 3 + [0])
+
+    def test_summary_view(self):
+        self.client.force_login(make_user('admin@example.com', role='admin'))
+        url = reverse('analytics-summary')
+        self.assertEqual(self.client.get(url).status_code, 503)
+        build_snapshot()
+        body = self.client.get(url).json()
+        self.assertEqual(body['reports'], 3)
+        self.assertEqual(body['by_status']['Pending'], 3)
+        self.assertEqual(body['by_department'], {str(self.department.pk): 3})
+
+    def test_summary_is_admin_only(self):
+        self.client.force_login(make_user('ada@example.com'))
+        self.assertEqual(self.client.get(reverse('analytics-summary')).status_code, 403)
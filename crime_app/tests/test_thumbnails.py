@@ -0,0 +1,73 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.template import Context, Template, TemplateSyntaxError
+from django.urls import reverse
+from PIL import Image
+
+from crime_app import thumbnails
+from crime_app.models import OutboxMessage
+from crime_app.outbox import drain
+from crime_app.templatetags import thumbnails as thumbnail_tags
+from crime_app.thumbnails import SIZES, derivative_name
+
+from .helpers import AppTestCase, make_department, make_officer, make_report
+
+
+def image_file(size=(1200, 800), fmt='PNG'):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, (200, 30, 30)).save(buffer, fmt)
+    return ContentFile(buffer.getvalue(), name=f"photo.{fmt.lower()}")
+
+
+class ThumbnailTests(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        self.use_temporary_media()
+        pool = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(pool.shutdown)
+        for patcher in (
+            mock.patch.object(thumbnails, 'get_pool', return_value=pool),
+            mock.patch.object(thumbnail_tags, '_known', set()),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.officer = make_officer('officer@example.com', make_department())
+
+    def upload_photo(self):
+        self.officer.profile_picture.save('photo.png', image_file())
+        return self.officer.profile_picture
+
+    def render(self, fieldfile, size='avatar'):
+        template = Template("{% load thumbnails %}{% thumbnail_url image size %}")
+        return template.render(Context({'image': fieldfile, 'size': size}))
+
+    def test_upload_queues_derivatives_and_the_outbox_renders_them(self):
+        photo = self.upload_photo()
+        self.assertEqual(OutboxMessage.objects.get(kind='image_derivatives').payload, {'name': photo.name})
+        drain()
+        for size, edge in SIZES.items():
+            with photo.storage.open(derivative_name(photo.name, size)) as f, Image.open(f) as thumb:
+                self.assertEqual(max(thumb.size), edge)
+                self.assertEqual(thumb.format.lower(), thumbnails.FORMAT)
+        # Nothing left to render
+        self.assertEqual(thumbnails.generate_derivatives(photo.name), [])
+
+    def test_tag_falls_back_to_the_original_until_rendered(self):
+        photo = self.upload_photo()
+        self.assertEqual(self.render(photo), photo.url)
+        drain()
+        self.assertEqual(self.render(photo), photo.storage.url(derivative_name(photo.name, 'avatar')))
+        self.assertEqual(self.render(None), '')
+        with self.assertRaises(TemplateSyntaxError):
+            self.render(photo, 'poster')
+
+    def test_evidence_goes_through_the_access_checked_view(self):
+        report = make_report()
+        report.evidence_image.save('scene.png', image_file())
+        self.assertEqual(
+            self.render(report.evidence_image, 'preview'),
+            f"{reverse('evidence-file', args=[report.pk, 'image'])}?size=preview",
+        )
@@ -0,0 +1,152 @@
+import hashlib
+import io
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+
+from crime_app import uploads
+from crime_app.models import UploadSession
+
+from .helpers import AppTestCase, make_report, make_user
+
+
+class UploadTests(AppTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.citizen = make_user('ada@example.com')
+
+    def setUp(self):
+        super().setUp()
+        self.use_temporary_media()
+        self.data = b'0123456789' * 3
+        self.session = uploads.start_upload(self.citizen, 'evidence_video', 'clip.mp4', len(self.data), 'video/mp4')
+
+    def write(self, offset, data, checksum=None):
+        checksum = checksum or hashlib.sha256(data).hexdigest()
+        return uploads.write_chunk(self.session, offset, len(data), io.BytesIO(data), checksum)
+
+    def test_start_rejects_bad_requests(self):
+        with self.assertRaises(uploads.UploadError):
+            uploads.start_upload(self.citizen, 'evidence_image', 'a.jpg', 10)
+        with self.assertRaises(uploads.UploadError):
+            uploads.start_upload(self.citizen, 'evidence_video', 'a.mp3', 10, 'audio/mpeg')
+        with self.assertRaises(uploads.UploadError):
+            uploads.start_upload(self.citizen, 'evidence_video', 'a.mp4', 0)
+
+    def test_chunks_complete_the_upload(self):
+        self.assertEqual(self.write(0, self.data[:10]), 10)
+        self.assertEqual(self.write(10, self.data[10:]), len(self.data))
+        uploads.complete_upload(self.session, hashlib.sha256(self.data).hexdigest())
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.status, 'complete')
+        self.assertEqual(uploads.staging_path(self.session).read_bytes(), self.data)
+
+    def test_wrong_offset_reports_where_to_resume(self):
+        self.write(0, self.data[:10])
+        with self.assertRaises(uploads.UploadError) as raised:
+            self.write(20, self.data[20:])
+        self.assertEqual((raised.exception.status, raised.exception.offset), (409, 10))
+
+    def test_checksum_mismatch_cuts_back_to_last_good_offset(self):
+        self.write(0, self.data[:10])
+        with self.assertRaises(uploads.UploadError) as raised:
+            self.write(10, self.data[10:20], checksum='0' * 64)
+        self.assertEqual((raised.exception.status, raised.exception.offset), (422, 10))
+        self.assertEqual(uploads.staging_path(self.session).stat().st_size, 10)
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.received, 10)
+        self.assertIsNone(self.session.lease_until)
+        # The same chunk can simply be sent again
+        self.assertEqual(self.write(10, self.data[10:20]), 20)
+
+    def test_chunk_past_declared_size_is_rejected(self):
+        with self.assertRaises(uploads.UploadError) as raised:
+            self.write(25, self.data[:10])
+        self.assertEqual(raised.exception.status, 400)
+
+    def test_concurrent_writer_holding_the_lease_wins(self):
+        UploadSession.objects.filter(pk=self.session.pk).update(
+            lease_until=timezone.now() + timedelta(seconds=60)
+        )
+        with self.assertRaises(uploads.UploadError) as raised:
+            self.write(0, self.data[:10])
+        self.assertEqual((raised.exception.status, str(raised.exception)), (409, "Another chunk is being written"))
+
+    def test_complete_requires_every_byte(self):
+        self.write(0, self.data[:10])
+        with self.assertRaises(uploads.UploadError) as raised:
+            uploads.complete_upload(self.session)
+        self.assertEqual((raised.exception.status, raised.exception.offset), (409, 10))
+
+    def test_no_writes_after_complete_or_abort(self):
+        self.write(0, self.data)
+        uploads.complete_upload(self.session)
+        with self.assertRaises(uploads.UploadError) as raised:
+            self.write(0, self.data[:10])
+        self.assertEqual(raised.exception.status, 409)
+
+        uploads.abort_upload(self.session)
+        self.assertFalse(uploads.staging_path(self.session).exists())
+        with self.assertRaises(uploads.UploadError):
+            uploads.complete_upload(self.session)
+
+    def test_purge_spares_uploads_still_receiving_chunks(self):
+        idle = uploads.start_upload(self.citizen, 'evidence_audio', 'note.mp3', 10, 'audio/mpeg')
+        UploadSession.objects.update(updated_at=timezone.now() - timedelta(days=3))
+        self.session.refresh_from_db()
+        self.write(0, self.data[:10])
+        self.assertEqual(uploads.purge_stale_uploads(timedelta(days=2)), 1)
+        statuses = dict(UploadSession.objects.values_list('pk', 'status'))
+        self.assertEqual(statuses, {self.session.pk: 'uploading', idle.pk: 'aborted'})
+
+
+class UploadViewTests(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        self.use_temporary_media()
+        self.citizen = make_user('ada@example.com')
+        self.client.force_login(self.citizen)
+        self.data = b'\x00\x01video' * 100
+
+    def put(self, upload_id, offset, data):
+        return self.client.generic(
+            'PUT', reverse('upload-detail', args=[upload_id]), data,
+            content_type='application/offset+octet-stream',
+            HTTP_UPLOAD_OFFSET=str(offset),
+            HTTP_UPLOAD_CHECKSUM=hashlib.sha256(data).hexdigest(),
+        )
+
+    def test_resumable_upload_attaches_to_the_report(self):
+        report = make_report(reporter=self.citizen)
+        started = self.client.post(reverse('upload-start'), {
+            'field': 'evidence_video', 'filename': 'clip.mp4', 'size': len(self.data), 'content_type': 'video/mp4',
+        })
+        self.assertEqual(started.status_code, 201)
+        upload_id = started.json()['upload_id']
+
+        self.assertEqual(self.put(upload_id, 0, self.data[:500]).status_code, 200)
+        # A client that lost track asks where to resume
+        offset = self.client.get(reverse('upload-detail', args=[upload_id])).json()['offset']
+        self.assertEqual(offset, 500)
+        self.assertEqual(self.put(upload_id, 0, self.data[:500]).status_code, 409)
+        self.put(upload_id, offset, self.data[offset:])
+
+        response = self.client.post(reverse('upload-complete', args=[upload_id]), {
+            'checksum': hashlib.sha256(self.data).hexdigest(), 'report': report.pk,
+        })
+        self.assertEqual(response.status_code, 200)
+        report.refresh_from_db()
+        with report.evidence_video.open('rb') as f:
+            self.assertEqual(f.read(), self.data)
+
+    def test_uploads_belong_to_their_user(self):
+        session = uploads.start_upload(make_user('bob@example.com'), 'evidence_audio', 'a.mp3', 10, 'audio/mpeg')
+        self.assertEqual(self.client.get(reverse('upload-detail', args=[session.pk])).status_code, 404)
+
+    def test_attaching_to_someone_elses_report_is_refused(self):
+        session = uploads.start_upload(self.citizen, 'evidence_audio', 'a.mp3', 10, 'audio/mpeg')
+        self.put(session.pk, 0, b'0123456789')
+        report = make_report(reporter=make_user('bob@example.com'))
+        response = self.client.post(reverse('upload-complete', args=[session.pk]), {'report': report.pk})
+        self.assertEqual(response.status_code, 403)
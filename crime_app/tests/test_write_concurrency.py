@@ -0,0 +1,52 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+
+from crime_app.management.commands.stress_report_writes import Command, submit_report
+from crime_app.models import CitizenNotification, CrimeReport, Notification, OutboxMessage
+
+from .helpers import TEST_CACHES, clear_caches, make_department, make_officer, make_user
+
+
+@override_settings(CACHES=TEST_CACHES)
+class ConcurrentSubmissionTests(TransactionTestCase):
+    """
+    The stress_report_writes workload in miniature: report submissions from
+    several threads, each on its own connection, with the outbox drained
+    alongside. None of the writes may fail with 'database is locked'.
+    """
+    SUBMISSIONS = 40
+    THREADS = 8
+
+    def setUp(self):
+        clear_caches()
+
+    def test_no_write_fails_with_database_locked(self):
+        departments = [make_department(name) for name in ("Central", "Harbour")]
+        for department in departments:
+            for i in range(3):
+                make_officer(f"officer{i}@{department.name.lower()}.example.com", department)
+        citizen = make_user('ada@example.com')
+        connection.close()
+
+        stop = threading.Event()
+        outbox_errors = []
+        outbox = Command()._start_outbox(stop, outbox_errors)
+        try:
+            with ThreadPoolExecutor(max_workers=self.THREADS) as pool:
+                results = list(pool.map(
+                    lambda i: submit_report("[test]", citizen, [d.pk for d in departments], i),
+                    range(self.SUBMISSIONS),
+                ))
+        finally:
+            stop.set()
+            outbox.join()
+
+        errors = [error for _, error, _ in results if error] + outbox_errors
+        self.assertEqual(errors, [])
+        self.assertEqual(CrimeReport.objects.count(), self.SUBMISSIONS)
+        self.assertFalse(OutboxMessage.objects.exclude(status='done').exists())
+        self.assertEqual(Notification.objects.count(), self.SUBMISSIONS * 3)
+        self.assertEqual(CitizenNotification.objects.filter(user=citizen).count(), self.SUBMISSIONS)
@@ -0,0 +1,111 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from PIL import Image, ImageOps, features
+
+from .models import CrimeReport, Officer
+from .outbox import enqueue, handler
+
+# Name -> longest edge in pixels. Avatars are shown at 48-80px and previews
+# at up to ~240px, so both leave room for 2x screens.
+SIZES = {
+    'avatar': 160,
+    'preview': 480,
+}
+FORMAT = 'webp' if features.check('webp') else 'jpeg'
+QUALITY = 80
+WORKERS = getattr(settings, 'THUMBNAIL_WORKERS', max(1, (os.cpu_count() or 2) // 2))
+
+_pool = None
+
+
+def get_pool():
+    """Pillow runs in worker processes: a huge or corrupt image can't take down the caller"""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=WORKERS)
+    return _pool
+
+
+def derivative_name(name, size):
+    """Deterministic storage name of a derivative, stored next to the original"""
+    return f"{name}.{size}.{'jpg' if FORMAT == 'jpeg' else FORMAT}"
+
+
+def render_derivatives(source, targets):
+    """
+    Runs in a pool process. Writes each (path, longest_edge) target from the
+    source image and returns the paths written. Files appear atomically, so
+    a page never links to a half-written thumbnail.
+    """
+    written = []
+    with Image.open(source) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+        if FORMAT == 'jpeg' and image.mode == 'RGBA':
+            image = image.convert('RGB')
+        for path, edge in targets:
+            thumb = image.copy()
+            thumb.thumbnail((edge, edge), Image.LANCZOS)
+            tmp = f"{path}.tmp"
+            if FORMAT == 'webp':
+                thumb.save(tmp, FORMAT, quality=QUALITY, method=4)
+            else:
+                thumb.save(tmp, FORMAT, quality=QUALITY, optimize=True, progressive=True)
+            os.replace(tmp, path)
+            written.append(path)
+    return written
+
+
+def missing_targets(name, storage=default_storage):
+    return [
+        (storage.path(derivative_name(name, size)), edge)
+        for size, edge in SIZES.items()
+        if not storage.exists(derivative_name(name, size))
+    ]
+
+
+def generate_derivatives(name, storage=default_storage):
+    """Renders any missing derivatives of one stored image in the process pool"""
+    if not storage.exists(name):
+        return []
+    targets = missing_targets(name, storage)
+    if not targets:
+        return []
+    return get_pool().submit(render_derivatives, storage.path(name), targets).result()
+
+
+# ===================== Scheduling =====================
+@handler('image_derivatives')
+def deliver_image_derivatives(payload):
+    """
+    Renders before anything is written: the outbox runs handlers outside a
+    transaction, so waiting on the pool holds no database lock, and the
+    only write left is deliver() marking the message done.
+    """
+    generate_derivatives(payload['name'])
+
+
+def schedule_derivatives(fieldfile):
+    """Queues derivative generation after the upload commits, unless they already exist"""
+    if fieldfile and not all(default_storage.exists(derivative_name(fieldfile.name, size)) for size in SIZES):
+        enqueue('image_derivatives', name=fieldfile.name)
+
+
+@receiver(post_save, sender=CrimeReport)
+def crime_report_schedule_thumbnails(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and 'evidence_image' not in update_fields):
+        return
+    schedule_derivatives(instance.evidence_image)
+
+
+@receiver(post_save, sender=Officer)
+def officer_schedule_thumbnails(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and 'profile_picture' not in update_fields):
+        return
+    schedule_derivatives(instance.profile_picture)
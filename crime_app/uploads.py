@@ -0,0 +1,218 @@
+import hashlib
+import os
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import UploadSession
+
+STAGING_DIR = Path(settings.MEDIA_ROOT) / 'uploads' / 'staging'
+CHUNK_SIZE = getattr(settings, 'UPLOAD_CHUNK_SIZE', 2 * 1024 * 1024)
+MAX_CHUNK_SIZE = getattr(settings, 'UPLOAD_MAX_CHUNK_SIZE', 8 * 1024 * 1024)
+MAX_UPLOAD_SIZE = getattr(settings, 'UPLOAD_MAX_SIZE', 1024 * 1024 * 1024)
+READ_BLOCK = 64 * 1024
+LEASE_SECONDS = 120
+
+MEDIA_PREFIXES = {
+    'evidence_video': 'video/',
+    'evidence_audio': 'audio/',
+}
+
+
+class UploadError(Exception):
+    """A rejected upload request; `status` is the HTTP status to answer with"""
+
+    def __init__(self, message, status=400, offset=None):
+        super().__init__(message)
+        self.status = status
+        self.offset = offset
+
+
+class StagedFile(File):
+    """
+    Exposes the staging path the way TemporaryUploadedFile does, so
+    FileSystemStorage moves the finished upload into place instead of
+    copying it.
+    """
+
+    def temporary_file_path(self):
+        return self.file.name
+
+
+def staging_path(session):
+    return STAGING_DIR / f"{session.pk}.part"
+
+
+def describe(session):
+    return {
+        'upload_id': str(session.pk),
+        'field': session.field,
+        'size': session.size,
+        'offset': session.received,
+        'status': session.status,
+        'chunk_size': CHUNK_SIZE,
+    }
+
+
+# ===================== Upload Lifecycle =====================
+def start_upload(user, field, filename, size, content_type=''):
+    if field not in MEDIA_PREFIXES:
+        raise UploadError("Unsupported evidence field")
+    if content_type and not content_type.startswith(MEDIA_PREFIXES[field]):
+        raise UploadError(f"Expected a {MEDIA_PREFIXES[field].rstrip('/')} file")
+    if not filename:
+        raise UploadError("Missing filename")
+    if not 0 < size <= MAX_UPLOAD_SIZE:
+        raise UploadError(f"Size must be between 1 and {MAX_UPLOAD_SIZE} bytes")
+
+    session = UploadSession.objects.create(
+        user=user,
+        field=field,
+        filename=os.path.basename(filename)[:255],
+        content_type=content_type[:100],
+        size=size,
+    )
+    STAGING_DIR.mkdir(parents=True, exist_ok=True)
+    staging_path(session).touch()
+    return session
+
+
+def _claim(session, offset):
+    """Takes the session's write lease if offset is where the upload stands"""
+    now = timezone.now()
+    claimed = UploadSession.objects.filter(
+        Q(lease_until__isnull=True) | Q(lease_until__lt=now),
+        pk=session.pk, status='uploading', received=offset,
+    ).update(lease_until=now + timedelta(seconds=LEASE_SECONDS), updated_at=now)
+    if not claimed:
+        session.refresh_from_db()
+        if session.status != 'uploading':
+            raise UploadError(f"Upload is {session.status}", status=409, offset=session.received)
+        if session.received != offset:
+            raise UploadError("Offset does not match the upload", status=409, offset=session.received)
+        raise UploadError("Another chunk is being written", status=409, offset=session.received)
+
+
+def write_chunk(session, offset, length, stream, checksum):
+    """
+    Appends one chunk at `offset`, reading it from `stream` in small blocks
+    so memory stays bounded no matter the chunk size. `checksum` is the
+    chunk's hex SHA-256. On any failure the staged file is cut back to the
+    last good offset. Returns the new offset.
+    """
+    if not 0 < length <= MAX_CHUNK_SIZE:
+        raise UploadError(f"Chunk length must be between 1 and {MAX_CHUNK_SIZE} bytes")
+    if offset + length > session.size:
+        raise UploadError("Chunk runs past the declared size", offset=session.received)
+    if not checksum:
+        raise UploadError("Missing chunk checksum")
+
+    _claim(session, offset)
+    digest = hashlib.sha256()
+    written = 0
+    try:
+        with open(staging_path(session), 'r+b') as f:
+            f.seek(offset)
+            while written < length:
+                block = stream.read(min(READ_BLOCK, length - written))
+                if not block:
+                    break
+                digest.update(block)
+                f.write(block)
+                written += len(block)
+            if written != length or digest.hexdigest() != checksum.lower():
+                f.truncate(offset)
+                raise UploadError(
+                    "Chunk was incomplete" if written != length else "Chunk checksum mismatch",
+                    status=422, offset=offset,
+                )
+            f.truncate(offset + length)
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        UploadSession.objects.filter(pk=session.pk).update(lease_until=None)
+        raise
+
+    # update() skips auto_now; updated_at is what purge_stale_uploads goes by
+    UploadSession.objects.filter(pk=session.pk).update(
+        received=offset + length, lease_until=None, updated_at=timezone.now()
+    )
+    session.received = offset + length
+    return session.received
+
+
+def complete_upload(session, checksum=None):
+    """Marks a fully received upload complete, optionally checking the whole file's SHA-256"""
+    if session.status != 'uploading':
+        raise UploadError(f"Upload is {session.status}", status=409, offset=session.received)
+    if session.received != session.size:
+        raise UploadError("Upload is not finished", status=409, offset=session.received)
+    if checksum:
+        digest = hashlib.sha256()
+        with open(staging_path(session), 'rb') as f:
+            for block in iter(lambda: f.read(READ_BLOCK), b''):
+                digest.update(block)
+        if digest.hexdigest() != checksum.lower():
+            raise UploadError("File checksum mismatch", status=422, offset=session.received)
+    UploadSession.objects.filter(pk=session.pk).update(status='complete', updated_at=timezone.now())
+    session.status = 'complete'
+
+
+def attach_upload(session, report):
+    """Moves a completed upload into the report's evidence field"""
+    if session.status != 'complete':
+        raise UploadError(f"Upload is {session.status}", status=409)
+    field = report._meta.get_field(session.field)
+    name = field.generate_filename(report, session.filename)
+    with open(staging_path(session), 'rb') as f:
+        name = field.storage.save(name, StagedFile(f, name=session.filename), max_length=field.max_length)
+    staging_path(session).unlink(missing_ok=True)
+    setattr(report, session.field, name)
+    report.save(update_fields=[session.field, 'date_updated'])
+    UploadSession.objects.filter(pk=session.pk).update(status='attached', report=report, updated_at=timezone.now())
+    session.status = 'attached'
+    session.report = report
+
+
+def abort_upload(session):
+    UploadSession.objects.filter(pk=session.pk).update(status='aborted', lease_until=None, updated_at=timezone.now())
+    session.status = 'aborted'
+    staging_path(session).unlink(missing_ok=True)
+
+
+def attach_form_uploads(request, report):
+    """
+    Attaches uploads whose ids the report form posted as
+    `<field>_upload` (e.g. evidence_video_upload). Returns how many were attached.
+    """
+    attached = 0
+    for field in MEDIA_PREFIXES:
+        upload_id = request.POST.get(f'{field}_upload')
+        if not upload_id:
+            continue
+        try:
+            session = UploadSession.objects.get(pk=upload_id, user=request.user, field=field, status='complete')
+        except (UploadSession.DoesNotExist, ValidationError):
+            continue
+        attach_upload(session, report)
+        attached += 1
+    return attached
+
+
+def purge_stale_uploads(older_than=timedelta(days=2)):
+    """Deletes staging files of uploads abandoned for longer than `older_than`"""
+    now = timezone.now()
+    stale = UploadSession.objects.filter(
+        Q(lease_until__isnull=True) | Q(lease_until__lt=now),
+        status__in=['uploading', 'complete'], updated_at__lt=now - older_than,
+    )
+    purged = 0
+    for session in stale.iterator():
+        abort_upload(session)
+        purged += 1
+    return purged
@@ -17,6 +17,11 @@ urlpatterns = [
     path('notifications/', views.citizen_notifications, name='citizen_notifications'),
     path('mark-notification-read/<int:notification_id>/', views.mark_notification_read, name='mark_notification_read'),
     path('mark-all-notifications-read/', views.mark_all_notifications_read, name='mark_all_notifications_read'),
+    path('notifications/stream/', views.notification_stream, name='notification-stream'),
+    path('uploads/', views.upload_start, name='upload-start'),
+    path('uploads/<uuid:upload_id>/', views.upload_detail, name='upload-detail'),
+    path('uploads/<uuid:upload_id>/complete/', views.upload_complete, name='upload-complete'),
+    path('evidence/<int:pk>/<str:kind>', views.evidence_file, name='evidence-file'),
     
     
 
@@ -26,10 +31,15 @@ urlpatterns = [
     path("department" , views.department_list, name="department"),
     path('officer-list', views.officer_list, name='officer-list'),
     path ('reported-crime', views.reported_crime, name="reported-crime"),
+    path('export/reports.<str:fmt>', views.export_reports, name='export-reports'),
+    path('import/reports', views.import_reports, name='import-reports'),
+    path('analytics/summary', views.analytics_summary, name='analytics-summary'),
+    path('analytics/sla', views.sla_report, name='sla-report'),
     path('crime-detail/<int:pk>', views.crime_detail, name="crime-detail"),
     path('crime-detail/<int:pk>/', views.crime_detail, name='crime-detail'),
     path('update-report-status/<int:pk>/', views.update_report_status, name='update-report-status'),
     path('search-crime', views.search_crime, name="search-crime"),
+    path('heatmap/<int:zoom>/<int:x>/<int:y>.<str:fmt>', views.heatmap_tile, name='heatmap-tile'),
 
 
     # ========= officer ========
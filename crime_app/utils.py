@@ -1,10 +1,93 @@
+import base64
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
 from . models import *
+from .inbox import officers_notified
+
+FANOUT_BATCH_SIZE = 500
+
+
+def notify_department_officers(department, message, exclude=None, on_duty_only=False):
+    """
+    Sends a notification to all officers in a department with a single
+    bulk INSERT. `exclude` skips one officer (usually the one acting) and
+    `on_duty_only` skips officers who are off duty. Returns how many
+    officers were notified.
+    """
+    if not department:
+        return 0
+
+    officers = Officer.objects.filter(department=department)
+    if on_duty_only:
+        officers = officers.filter(on_duty=True)
+    if exclude is not None:
+        officers = officers.exclude(pk=getattr(exclude, 'pk', exclude))
+
+    now = timezone.now()
+    officer_ids = list(officers.values_list('pk', flat=True))
+    notifications = [
+        Notification(officer_id=officer_id, message=message, created_at=now)
+        for officer_id in officer_ids
+    ]
+    with transaction.atomic():
+        Notification.objects.bulk_create(notifications, batch_size=FANOUT_BATCH_SIZE)
+        officers_notified(officer_ids, message)
+    return len(notifications)
 
-def notify_department_officers(department, message):
+
+# ===================== Keyset Pagination =====================
+def encode_cursor(report):
     """
-    Sends a notification to all officers in a department.
+    Encodes a report's (date_reported, id) position as an opaque URL-safe cursor.
     """
-    if department:
-        for officer in department.officers.all():
-            Notification.objects.create(officer=officer, message=message, created_at=timezone.now())
+    raw = f"{report.date_reported.isoformat()}|{report.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    Decodes a cursor back to (date_reported, id). Returns None if it is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        stamp, pk = raw.split('|')
+        return datetime.fromisoformat(stamp), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def keyset_paginate(queryset, after=None, before=None, per_page=25):
+    """
+    Returns one page of reports, newest first, plus cursors for the
+    neighbouring pages. Seeks on the (date_reported, id) index instead of
+    using OFFSET, so every page costs the same no matter how deep it is.
+    """
+    after = decode_cursor(after) if after else None
+    before = decode_cursor(before) if before else None
+
+    if before:
+        stamp, pk = before
+        rows = list(
+            queryset.filter(Q(date_reported__gt=stamp) | Q(date_reported=stamp, id__gt=pk))
+            .order_by('date_reported', 'id')[:per_page + 1]
+        )
+        has_prev = len(rows) > per_page
+        rows = rows[:per_page][::-1]
+        has_next = True
+    else:
+        if after:
+            stamp, pk = after
+            queryset = queryset.filter(Q(date_reported__lt=stamp) | Q(date_reported=stamp, id__lt=pk))
+        rows = list(queryset.order_by('-date_reported', '-id')[:per_page + 1])
+        has_next = len(rows) > per_page
+        rows = rows[:per_page]
+        has_prev = after is not None
+
+    return {
+        'items': rows,
+        'next_cursor': encode_cursor(rows[-1]) if rows and has_next else None,
+        'prev_cursor': encode_cursor(rows[0]) if rows and has_prev else None,
+    }
@@ -1,12 +1,54 @@
 from django.shortcuts import render, HttpResponse, redirect, get_object_or_404
-from django.contrib.auth import authenticate, login, logout, get_user_model
+from django.contrib.auth import login, logout, get_user_model
 from django.contrib import messages
 from django.db.models import Count, Q
-from django.http import JsonResponse
+from django.conf import settings
+from django.core.exceptions import RequestDataTooBig
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from asgiref.sync import sync_to_async
 from django.views.decorators.csrf import csrf_exempt
+from django.db import transaction
+from django.utils import timezone
+from collections import Counter
+from datetime import timedelta
+import os
 
 from .models import *
 from .forms import *
+from .utils import keyset_paginate
+from .outbox import queue_citizen_notification, queue_officer_notification
+from .inbox import (
+    mark_all_citizen_notifications_read,
+    mark_citizen_notification_read,
+    mark_officer_notifications_read,
+    read_at,
+    with_read_state,
+)
+from .live import citizen_channel, event_stream, officer_channel
+from .middleware import load_principal
+from .routers import read_replica
+from .writequeue import coalesced
+from .search import search_reports
+from .archive import archived_counts, find_report, reports_for
+from .counters import active_department_count, report_counts
+from .export import FORMATS, aiter_lines, export_querysets, export_rows
+from .ingest import CHUNK_SIZE as IMPORT_CHUNK_SIZE, MAX_API_ROWS, Importer, ImportResult, read_body
+from . import analytics
+from .history import resolution_stats, time_in_status
+from .uploads import (
+    UploadError,
+    abort_upload,
+    attach_form_uploads,
+    attach_upload,
+    complete_upload,
+    describe,
+    start_upload,
+    write_chunk,
+)
+from .evidence import FIELDS as EVIDENCE_FIELDS, serve_evidence
+from .thumbnails import SIZES as THUMBNAIL_SIZES, derivative_name
+from .heatmap import ALL_DEPARTMENTS, ALL_TYPES, MAX_ZOOM, WINDOWS, get_tile, tile_json, tile_png
 
 User = get_user_model()
 
@@ -17,28 +59,17 @@ def index(request):
 
 # ===================== AUTHENTICATION =====================
 def my_login(request):
-    form = LoginForm(request.POST or None)
+    form = LoginForm(request.POST or None, request=request)
     if request.method == "POST" and form.is_valid():
-        email = form.cleaned_data['email']
-        password = form.cleaned_data['password']
-        
-        # Find user by email
-        try:
-            user_obj = User.objects.get(email=email)
-            user = authenticate(request, username=user_obj.username, password=password)
-        except User.DoesNotExist:
-            user = None
-
-        if user is not None:
-            login(request, user)
-            if user.is_superuser or getattr(user, 'role', None) == 'admin':
-                return redirect('dashboard')
-            elif getattr(user, 'role', None) == 'officer':
-                return redirect('officer-board')
-            else:
-                return redirect('user-board')
+        # The form already authenticated the user
+        user = form.cleaned_data['user']
+        login(request, user)
+        if user.is_superuser or getattr(user, 'role', None) == 'admin':
+            return redirect('dashboard')
+        elif getattr(user, 'role', None) == 'officer':
+            return redirect('officer-board')
         else:
-            form.add_error(None, 'Invalid email or password')
+            return redirect('user-board')
 
     return render(request, 'crime_app/homePage/my-login.html', {'form': form})
 
@@ -65,15 +96,17 @@ def my_logout(request):
 
 # ===================== ADMIN DASHBOARD =====================
 
+@read_replica
 def dashboard(request):
     # Check if user is admin
-    if not request.user.is_authenticated or (not request.user.is_superuser and getattr(request.user, 'role', None) != 'admin'):
+    if not request.principal.is_admin:
         messages.error(request, "Access denied. Admin privileges required.")
         return redirect('my-login')
     
-    total_reports = CrimeReport.objects.count()
-    resolved_cases = CrimeReport.objects.filter(status='Resolved').count()
-    pending_reports = CrimeReport.objects.filter(status='Pending').count()
+    counts = report_counts()
+    total_reports = counts['total']
+    resolved_cases = counts['Resolved']
+    pending_reports = counts['Pending']
     total_departments = Department.objects.count()
     recent_reports = CrimeReport.objects.select_related('reporter').order_by('-date_reported')[:5]
 
@@ -89,7 +122,7 @@ def dashboard(request):
 
 def officer_list(request):
     # Check if user is admin
-    if not request.user.is_authenticated or (not request.user.is_superuser and getattr(request.user, 'role', None) != 'admin'):
+    if not request.principal.is_admin:
         messages.error(request, "Access denied. Admin privileges required.")
         return redirect('my-login')
         
@@ -108,7 +141,7 @@ def officer_list(request):
 
 def department_list(request):
     # Check if user is admin
-    if not request.user.is_authenticated or (not request.user.is_superuser and getattr(request.user, 'role', None) != 'admin'):
+    if not request.principal.is_admin:
         messages.error(request, "Access denied. Admin privileges required.")
         return redirect('my-login')
         
@@ -128,19 +161,143 @@ def department_list(request):
     })
 
 
+@read_replica
 def reported_crime(request):
     # Check if user is admin
-    if not request.user.is_authenticated or (not request.user.is_superuser and getattr(request.user, 'role', None) != 'admin'):
+    if not request.principal.is_admin:
         messages.error(request, "Access denied. Admin privileges required.")
         return redirect('my-login')
         
-    reports = CrimeReport.objects.all().order_by('-date_reported' , '-date_updated')
-    return render(request, 'crime_app/adminPage/reported-crime.html', {'reports': reports})
+    page = keyset_paginate(
+        CrimeReport.objects.for_listing(),
+        after=request.GET.get('after'),
+        before=request.GET.get('before'),
+    )
+    counts = report_counts()
+    stats = {
+        'total': counts['total'],
+        'pending': counts['Pending'],
+        'resolved': counts['Resolved'],
+        'investigating': counts['Investigating'],
+        'active_departments': active_department_count(),
+    }
+    return render(request, 'crime_app/adminPage/reported-crime.html', {
+        'reports': page['items'],
+        'next_cursor': page['next_cursor'],
+        'prev_cursor': page['prev_cursor'],
+        'stats': stats,
+    })
+
+
+def export_reports(request, fmt):
+    """
+    Streams every matching report as CSV or NDJSON without holding the
+    result set in memory. Filters: date_from, date_to, status, department;
+    archived=1 adds archived reports after the live ones.
+    """
+    if not request.principal.is_admin:
+        return JsonResponse({"status": "error", "message": "Access denied"}, status=403)
+    if fmt not in FORMATS:
+        return JsonResponse({"status": "error", "message": "Unsupported format"}, status=400)
+    try:
+        querysets = export_querysets(
+            date_from=request.GET.get('date_from'),
+            date_to=request.GET.get('date_to'),
+            status=request.GET.get('status'),
+            department=request.GET.get('department'),
+            include_archived=bool(request.GET.get('archived')),
+        )
+    except ValueError as e:
+        return JsonResponse({"status": "error", "message": str(e)}, status=400)
+
+    lines, content_type = FORMATS[fmt]
+    if isinstance(request, ASGIRequest):
+        # A sync generator would be buffered whole before the first byte
+        content = aiter_lines(lines, querysets)
+    else:
+        content = lines(export_rows(querysets))
+    response = StreamingHttpResponse(content, content_type=content_type)
+    filename = f"crime-reports-{timezone.localdate():%Y%m%d}.{fmt}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def import_reports(request):
+    """
+    Imports one batch of reports for legacy loads and partner agencies.
+    POST a JSON list (or {"reports": [...]}), CSV (text/csv) or NDJSON
+    (application/x-ndjson) with the columns export_reports writes, up to
+    MAX_API_ROWS rows and DATA_UPLOAD_MAX_MEMORY_SIZE bytes. Rows whose
+    report_id is already on file are skipped, so a batch can be resent
+    after a failure. ?dry_run=1 only validates.
+    """
+    if not request.principal.is_admin:
+        return JsonResponse({"status": "error", "message": "Access denied"}, status=403)
+    if request.method != 'POST':
+        return JsonResponse({"status": "error", "message": "Invalid request"}, status=405)
+    try:
+        rows = read_body(request.body, request.content_type)
+    except RequestDataTooBig:
+        return JsonResponse({
+            "status": "error",
+            "message": f"Body is larger than {settings.DATA_UPLOAD_MAX_MEMORY_SIZE} bytes; send smaller batches",
+        }, status=413)
+    except (ValueError, UnicodeDecodeError) as e:
+        return JsonResponse({"status": "error", "message": f"Malformed body: {e}"}, status=400)
+    if len(rows) > MAX_API_ROWS:
+        return JsonResponse(
+            {"status": "error", "message": f"At most {MAX_API_ROWS} reports per request"}, status=413
+        )
+
+    importer = Importer(dry_run=bool(request.GET.get('dry_run')))
+    result = ImportResult()
+    for offset in range(0, len(rows), IMPORT_CHUNK_SIZE):
+        result.add(importer.import_chunk(rows[offset:offset + IMPORT_CHUNK_SIZE], first_row=offset + 1))
+    return JsonResponse({
+        "status": "success",
+        "imported": result.imported,
+        "skipped": result.skipped,
+        "failed": result.failed,
+        "errors": [{"row": row, "message": message} for row, message in result.errors],
+    })
+
+
+def analytics_summary(request):
+    """Trend figures for dashboards, read from the columnar snapshot instead of the database"""
+    if not request.principal.is_admin:
+        return JsonResponse({"status": "error", "message": "Access denied"}, status=403)
+    try:
+        days = min(max(int(request.GET.get('days', 30)), 1), 366)
+    except ValueError:
+        return JsonResponse({"status": "error", "message": "Invalid days"}, status=400)
+    data = analytics.summary(days=days)
+    if data is None:
+        return JsonResponse({"status": "error", "message": "No analytics snapshot yet; run build_snapshot"}, status=503)
+    return JsonResponse(data)
+
+
+def sla_report(request):
+    """
+    Time-to-resolution (per department and incident type) and time-in-status
+    figures from the status history. Optional filters: days, department.
+    """
+    if not request.principal.is_admin:
+        return JsonResponse({"status": "error", "message": "Access denied"}, status=403)
+    try:
+        days = int(request.GET['days']) if request.GET.get('days') else None
+        department = int(request.GET['department']) if request.GET.get('department') else None
+    except ValueError:
+        return JsonResponse({"status": "error", "message": "Invalid filter"}, status=400)
+    since = timezone.now() - timedelta(days=days) if days else None
+    return JsonResponse({
+        'resolution': resolution_stats(since=since, department=department),
+        'time_in_status': time_in_status(since=since, department=department),
+    })
 
 
 def crime_detail(request, pk):
     # Check if user is admin
-    if not request.user.is_authenticated or (not request.user.is_superuser and getattr(request.user, 'role', None) != 'admin'):
+    if not request.principal.is_admin:
         messages.error(request, "Access denied. Admin privileges required.")
         return redirect('my-login')
         
@@ -148,13 +305,14 @@ def crime_detail(request, pk):
     departments = Department.objects.all()
     return render(request, 'crime_app/adminPage/crime-detail.html', {
         'report': report,
-        'departments': departments
+        'departments': departments,
+        'nearby_reports': report.get_nearby_reports(),
     })
 
 
 def update_report_status(request, pk):
     # Check if user is admin
-    if not request.user.is_authenticated or (not request.user.is_superuser and getattr(request.user, 'role', None) != 'admin'):
+    if not request.principal.is_admin:
         messages.error(request, "Access denied. Admin privileges required.")
         return redirect('my-login')
         
@@ -169,81 +327,112 @@ def update_report_status(request, pk):
             report.department_id = dept_id
 
         report.status = new_status
-        report.save()
-
-        # ✅ CREATE CITIZEN NOTIFICATION FOR STATUS CHANGE
-        if old_status != new_status:
-            CitizenNotification.objects.create(
-                user=report.reporter,
-                notification_type='status_update',
-                title='Report Status Updated',
-                message=f'Your report "{report.title}" status has been changed from {old_status} to {new_status} by Administrator.',
-                related_report=report
-            )
+        report._status_changed_by = request.user
 
-        # ✅ CREATE CITIZEN NOTIFICATION FOR DEPARTMENT REASSIGNMENT
-        if dept_id and str(old_dept.id) != str(dept_id):
-            new_department = Department.objects.get(id=dept_id)
-            CitizenNotification.objects.create(
-                user=report.reporter,
-                notification_type='assignment',
-                title='Report Reassigned',
-                message=f'Your report "{report.title}" has been reassigned from {old_dept.name} to {new_department.name}.',
-                related_report=report
-            )
+        # Notifications are queued in the outbox and delivered by the run_outbox worker
+        with transaction.atomic():
+            report.save()
+
+            # ✅ CREATE CITIZEN NOTIFICATION FOR STATUS CHANGE
+            if old_status != new_status:
+                queue_citizen_notification(
+                    report.reporter,
+                    notification_type='status_update',
+                    title='Report Status Updated',
+                    message=f'Your report "{report.title}" status has been changed from {old_status} to {new_status} by Administrator.',
+                    related_report=report
+                )
+
+            # ✅ CREATE CITIZEN NOTIFICATION FOR DEPARTMENT REASSIGNMENT
+            if dept_id and str(old_dept.id) != str(dept_id):
+                new_department = Department.objects.get(id=dept_id)
+                queue_citizen_notification(
+                    report.reporter,
+                    notification_type='assignment',
+                    title='Report Reassigned',
+                    message=f'Your report "{report.title}" has been reassigned from {old_dept.name} to {new_department.name}.',
+                    related_report=report
+                )
 
-        # Notify new department officers if reassigned
-        if dept_id and str(old_dept.id) != str(dept_id):
-            officers = Officer.objects.filter(department_id=dept_id)
-            for officer in officers:
-                Notification.objects.create(
-                    officer=officer,
-                    message=f"📢 New case '{report.title}' has been assigned to your department."
+                # Notify new department officers
+                queue_officer_notification(
+                    dept_id,
+                    f"📢 New case '{report.title}' has been assigned to your department."
                 )
 
         messages.success(request, "Report updated successfully!")
         return redirect('crime-detail', pk=report.id)
 
+# ===================== HEATMAP =====================
+def heatmap_tile(request, zoom, x, y, fmt):
+    """
+    One slippy-map tile of binned report counts, as sparse JSON or a PNG
+    overlay. Filters: ?window=24h|7d|30d|all and ?type=<incident type>|all.
+    Officers only see their own department's reports.
+    """
+    principal = request.principal
+    if principal.is_admin:
+        department = ALL_DEPARTMENTS
+    elif principal.is_officer and principal.department_id:
+        department = principal.department_id
+    else:
+        return JsonResponse({"status": "error", "message": "Access denied"}, status=403)
+
+    window = request.GET.get('window', '7d')
+    incident_type = request.GET.get('type', ALL_TYPES)
+    valid_types = {ALL_TYPES, *(code for code, _ in CrimeReport.INCIDENT_TYPES)}
+    if window not in WINDOWS or incident_type not in valid_types:
+        return JsonResponse({"status": "error", "message": "Invalid window or type"}, status=400)
+    if fmt not in ('json', 'png') or zoom > MAX_ZOOM or x >= 2 ** zoom or y >= 2 ** zoom:
+        return JsonResponse({"status": "error", "message": "Invalid tile"}, status=400)
+
+    counts = get_tile(window, incident_type, department, zoom, x, y)
+    if fmt == 'png':
+        response = HttpResponse(tile_png(counts), content_type='image/png')
+    else:
+        response = JsonResponse({'z': zoom, 'x': x, 'y': y, 'window': window, 'type': incident_type, **tile_json(counts)})
+    response['Cache-Control'] = 'private, max-age=60'
+    return response
+
+
 # ===================== SEARCH CRIME =====================
+@read_replica
 def search_crime(request):
     # Check if user is admin
-    if not request.user.is_authenticated or (not request.user.is_superuser and getattr(request.user, 'role', None) != 'admin'):
+    if not request.principal.is_admin:
         messages.error(request, "Access denied. Admin privileges required.")
         return redirect('my-login')
         
     query = request.GET.get('q', '')
+    include_archived = bool(request.GET.get('archived'))
     results = []
 
     if query:
-        results = CrimeReport.objects.filter(
-            Q(pk__icontains=query) |
-            Q(location__icontains=query) |
-            Q(status__icontains=query) |
-            Q(incident_type__icontains=query)
-        )
+        results = search_reports(query, include_archived=include_archived)
 
     context = {
         'results': results,
-        'query': query
+        'query': query,
+        'include_archived': include_archived,
     }
     return render(request, 'crime_app/adminPage/search-crime.html', context)
 
 
 # ===================== OFFICER DASHBOARD =====================
 def officer_board(request):
-    if not hasattr(request.user, 'officer'):
+    if not request.principal.is_officer:
         messages.error(request, "Only officers can access this page.")
         return redirect('my-login')
 
-    officer = request.user.officer
-    officer_dept = officer.department   
+    officer_dept = request.principal.department
     reports = CrimeReport.objects.filter(department=officer_dept)
+    counts = report_counts(department=officer_dept)
 
     context = {
-        'total_reports': reports.count(),
-        'resolved_cases': reports.filter(status='Resolved').count(),
-        'pending_cases': reports.filter(status='Pending').count(),
-        'dismissed_cases': reports.filter(status='Dismissed').count(),
+        'total_reports': counts['total'],
+        'resolved_cases': counts['Resolved'],
+        'pending_cases': counts['Pending'],
+        'dismissed_cases': counts['Dismissed'],
         'recent_reports': reports.order_by('-date_reported')[:4],
         'new_reports': reports.order_by('-date_reported')[:3],
     }
@@ -251,7 +440,7 @@ def officer_board(request):
 
 
 def add_report(request):
-    if not hasattr(request.user, 'officer'):
+    if not request.principal.is_officer:
         messages.error(request, "Only officers can access this page.")
         return redirect('my-login')
 
@@ -262,83 +451,92 @@ def add_report(request):
             report.evidence_image = request.FILES.get('photo_file') or request.FILES.get('evidence_image')
             report.evidence_audio = request.FILES.get('audio_file') or request.FILES.get('evidence_audio')
             report.evidence_video = request.FILES.get('video_file') or request.FILES.get('evidence_video')
-            if request.user.is_authenticated:
-                report.reporter = request.user
-            if hasattr(request.user, 'officer'):
-                report.department = request.user.officer.department
-            report.save()
-
-            # Notify officers
-            if report.department:
-                officers = Officer.objects.filter(department=report.department)
-                for officer in officers:
-                    Notification.objects.create(
-                        officer=officer,
-                        message=f"🚨 New crime reported in your department: {report.title}"
+            report.reporter = request.user
+            report.department = request.principal.department
+            # Notify officers (delivered by the run_outbox worker), once per duplicate cluster
+            with transaction.atomic():
+                report.save()
+                attach_form_uploads(request, report)
+                if report.duplicate_of_id is None:
+                    queue_officer_notification(
+                        report.department,
+                        f"🚨 New crime reported in your department: {report.title}",
+                        exclude=request.principal.officer,
                     )
 
+            if report.duplicate_of_id:
+                messages.info(request, f"This looks like a duplicate of {report.duplicate_of.report_id} and was linked to it.")
             messages.success(request, "Crime report submitted successfully!")
             return redirect('officer-board')
     else:
         form = CrimeReportForm()
 
-    reports = CrimeReport.objects.filter(department=request.user.officer.department).order_by('-date_reported')
+    reports = CrimeReport.objects.filter(department=request.principal.department).order_by('-date_reported')
     return render(request, 'crime_app/officerPage/add-report.html', {'form': form, 'reports': reports})
 
 
 def report_detail(request, pk):
-    if not hasattr(request.user, 'officer'):
+    if not request.principal.is_officer:
         messages.error(request, "Only officers can access this page.")
         return redirect('my-login')
 
     crime = get_object_or_404(CrimeReport, id=pk)
     
     # Check if officer has access to this report
-    if crime.department != request.user.officer.department:
+    if crime.department_id != request.principal.department_id:
         messages.error(request, "You can only access reports from your department.")
         return redirect('officer-board')
         
-    return render(request, 'crime_app/officerPage/report-detail.html', {'crime': crime})
+    # Officers only see nearby incidents they could open themselves
+    nearby_reports = crime.get_nearby_reports(
+        queryset=CrimeReport.objects.filter(department_id=crime.department_id)
+    )
+    return render(request, 'crime_app/officerPage/report-detail.html', {
+        'crime': crime,
+        'nearby_reports': nearby_reports,
+    })
 
 
 def update_status(request, pk):
-    if not hasattr(request.user, 'officer'):
+    if not request.principal.is_officer:
         messages.error(request, "Only officers can access this page.")
         return redirect('my-login')
 
     report = get_object_or_404(CrimeReport, id=pk)
 
-    if hasattr(request.user, 'officer'):
-        officer = request.user.officer
-        if report.department != officer.department:
-            messages.error(request, "You can only update reports within your department.")
-            return redirect('report-detail', pk=report.id)
+    if report.department_id != request.principal.department_id:
+        messages.error(request, "You can only update reports within your department.")
+        return redirect('report-detail', pk=report.id)
 
     if request.method == 'POST':
         old_status = report.status  # Store old status for comparison
         new_status = request.POST.get('status')
         if new_status:
             report.status = new_status
-            report.save()
-            
-            # ✅ CREATE CITIZEN NOTIFICATION FOR STATUS CHANGE
-            if old_status != new_status:
-                CitizenNotification.objects.create(
-                    user=report.reporter,
-                    notification_type='status_update',
-                    title='Report Status Updated',
-                    message=f'Your report "{report.title}" status has been updated from {old_status} to {new_status} by Officer {request.user.get_full_name()} from {report.department.name}.',
-                    related_report=report
-                )
-            
-            # Notify other officers in department
-            officers = Officer.objects.filter(department=report.department)
-            for o in officers:
-                if o != request.user.officer:  # Don't notify the officer who made the change
-                    Notification.objects.create(
-                        officer=o,
-                        message=f"⚙️ The status of case '{report.title}' has been updated to {new_status} by {request.user.get_full_name()}."
+            report._status_changed_by = request.user
+
+            # Notifications are queued in the outbox and delivered by the run_outbox worker
+            with transaction.atomic():
+                report.save()
+
+                # ✅ CREATE CITIZEN NOTIFICATION FOR STATUS CHANGE
+                if old_status != new_status:
+                    queue_citizen_notification(
+                        report.reporter,
+                        notification_type='status_update',
+                        title='Report Status Updated',
+                        message=f'Your report "{report.title}" status has been updated from {old_status} to {new_status} by Officer {request.user.get_full_name()} from {report.department.name}.',
+                        related_report=report
                     )
+
+                # Notify other on-duty officers in department (not the officer who made the change);
+                # new reports and reassignments still reach everyone
+                queue_officer_notification(
+                    report.department,
+                    f"⚙️ The status of case '{report.title}' has been updated to {new_status} by {request.user.get_full_name()}.",
+                    exclude=request.principal.officer,
+                    on_duty_only=True,
+                )
             
             messages.success(request, f"Report status updated to {new_status}.")
         else:
@@ -349,25 +547,17 @@ def update_status(request, pk):
 
 # ===================== SEARCH CRIME (OFFICER) =====================
 def search_report(request):
-    if not hasattr(request.user, 'officer'):
+    if not request.principal.is_officer:
         messages.error(request, "Only officers can access this page.")
         return redirect('my-login')
 
-    officer = request.user.officer
-    officer_dept = officer.department
+    officer_dept = request.principal.department
 
     query = request.GET.get('q', '')
     results = []
 
     if query:
-        results = CrimeReport.objects.filter(
-            Q(department=officer_dept) & (
-                Q(report_id__icontains=query) |
-                Q(location__icontains=query) |
-                Q(status__icontains=query) |
-                Q(incident_type__icontains=query)
-            )
-        )
+        results = search_reports(query, department=officer_dept)
     else:
         # Optional: show all reports for this officer if no query
         results = CrimeReport.objects.filter(department=officer_dept)
@@ -387,23 +577,24 @@ def user_board(request):
         return redirect('my-login')
     
     # Check if user is citizen
-    if hasattr(request.user, 'officer') or (request.user.is_superuser or getattr(request.user, 'role', None) == 'admin'):
+    if not request.principal.is_citizen:
         messages.error(request, "This page is for citizens only.")
-        return redirect('dashboard' if request.user.is_superuser or getattr(request.user, 'role', None) == 'admin' else 'officer-board')
+        return redirect('dashboard' if request.principal.is_admin else 'officer-board')
     
     # Get all user reports first
     user_reports = CrimeReport.objects.filter(reporter=request.user).order_by('-date_reported')
     
-    # Calculate counts from the original queryset (before slicing)
-    total_reports = user_reports.count()
-    resolved_reports = user_reports.filter(status='Resolved').count()
-    pending_reports = user_reports.filter(status='Pending').count()
+    # Counts come from the materialized counters rather than the reports table
+    counts = report_counts(reporter=request.user)
+    total_reports = counts['total']
+    resolved_reports = counts['Resolved']
+    pending_reports = counts['Pending']
     
     # Get recent reports (slice after all filtering is done)
     recent_reports = user_reports[:4]
     
-    # ✅ GET UNREAD NOTIFICATION COUNT
-    unread_count = CitizenNotification.objects.filter(user=request.user, is_read=False).count()
+    # ✅ GET UNREAD NOTIFICATION COUNT (denormalized on the user)
+    unread_count = request.user.unread_notifications
     
     context = {
         'total_reports': total_reports,
@@ -420,9 +611,9 @@ def user_report(request):
         return redirect('my-login')
     
     # Check if user is citizen
-    if hasattr(request.user, 'officer') or (request.user.is_superuser or getattr(request.user, 'role', None) == 'admin'):
+    if not request.principal.is_citizen:
         messages.error(request, "Officers and admins cannot submit citizen reports.")
-        return redirect('dashboard' if request.user.is_superuser or getattr(request.user, 'role', None) == 'admin' else 'officer-board')
+        return redirect('dashboard' if request.principal.is_admin else 'officer-board')
     
     if request.method == 'POST':
         print("=== FORM SUBMISSION DEBUG ===")
@@ -473,22 +664,23 @@ def user_report(request):
                 print("No audio evidence provided")
             
             try:
-                report.save()
+                # Officers are notified by the run_outbox worker, not inside this request.
+                # Likely duplicates join an existing report's cluster, which officers already know about.
+                with transaction.atomic():
+                    report.save()
+                    # Large video/audio may arrive through the chunked upload API instead of this POST
+                    attach_form_uploads(request, report)
+                    if report.duplicate_of_id is None:
+                        queue_officer_notification(
+                            report.department,
+                            f"🚨 New crime reported in your department: {report.title} (Report ID: {report.id})"
+                        )
                 print("✅ Report saved successfully! ID:", report.id)
                 
-                # ✅ FIXED: Notify officers in the selected department (remove 'report' parameter)
-                if report.department:
-                    officers = Officer.objects.filter(department=report.department)
-                    notification_count = 0
-                    for officer in officers:
-                        Notification.objects.create(
-                            officer=officer,
-                            message=f"🚨 New crime reported in your department: {report.title} (Report ID: {report.id})"
-                            # Remove the 'report' parameter as Notification model doesn't have this field
-                        )
-                        notification_count += 1
-                    
-                    messages.success(request, f"Crime report submitted successfully to {report.department.name}! {notification_count} officers notified.")
+                if report.duplicate_of_id:
+                    messages.success(request, "Crime report submitted successfully! It matches a report already being handled, so it was added to that case.")
+                elif report.department:
+                    messages.success(request, f"Crime report submitted successfully to {report.department.name}! Officers in the department will be notified.")
                 else:
                     messages.success(request, "Crime report submitted successfully!")
 
@@ -518,17 +710,22 @@ def report_history(request):
         return redirect('my-login')
     
     # Check if user is citizen
-    if hasattr(request.user, 'officer') or (request.user.is_superuser or getattr(request.user, 'role', None) == 'admin'):
+    if not request.principal.is_citizen:
         messages.error(request, "This page is for citizens only.")
-        return redirect('dashboard' if request.user.is_superuser or getattr(request.user, 'role', None) == 'admin' else 'officer-board')
+        return redirect('dashboard' if request.principal.is_admin else 'officer-board')
     
-    user_reports = CrimeReport.objects.filter(reporter=request.user).order_by('-date_reported')
+    # Closed reports moved to the archive are listed only when asked for
+    include_archived = bool(request.GET.get('archived'))
+    user_reports = reports_for(include_archived, reporter=request.user)
     
     # Calculate stats for the template
-    total_reports = user_reports.count()
-    pending_reports = user_reports.filter(status='Pending').count()
-    resolved_reports = user_reports.filter(status='Resolved').count()
-    dismissed_reports = user_reports.filter(status='Dismissed').count()
+    counts = report_counts(reporter=request.user)
+    if include_archived:
+        counts = Counter(counts) + archived_counts(reporter=request.user)
+    total_reports = counts['total']
+    pending_reports = counts['Pending']
+    resolved_reports = counts['Resolved']
+    dismissed_reports = counts['Dismissed']
     
     context = {
         'reports': user_reports,
@@ -536,6 +733,7 @@ def report_history(request):
         'pending_reports': pending_reports,
         'resolved_reports': resolved_reports,
         'dismissed_reports': dismissed_reports,
+        'include_archived': include_archived,
     }
     return render(request, 'crime_app/citizenPage/report-history.html', context)
 
@@ -545,17 +743,16 @@ def c_report_detail(request, pk):
         messages.error(request, "Please login to view report details.")
         return redirect('my-login')
     
-    try:
-        report = CrimeReport.objects.get(id=pk)
-        
-        # Check if the user owns this report or is an officer/admin
-        if report.reporter != request.user and not (hasattr(request.user, 'officer') or request.user.is_superuser):
-            messages.error(request, "You don't have permission to view this report.")
-            return redirect('user-board')
-            
-    except CrimeReport.DoesNotExist:
+    # Links from the report history may point at archived reports
+    report = find_report(pk)
+    if report is None:
         messages.error(request, "Report not found.")
         return redirect('user-board')
+
+    # Check if the user owns this report or is an officer/admin
+    if report.reporter_id != request.user.pk and not (request.principal.is_officer or request.principal.is_admin):
+        messages.error(request, "You don't have permission to view this report.")
+        return redirect('user-board')
     
     context = {
         'report': report,
@@ -569,8 +766,11 @@ def citizen_notifications(request):
         messages.error(request, "Please login to view notifications.")
         return redirect('my-login')
     
-    notifications = CitizenNotification.objects.filter(user=request.user).order_by('-created_at')
-    unread_count = notifications.filter(is_read=False).count()
+    notifications = with_read_state(
+        CitizenNotification.objects.filter(user=request.user).order_by('-created_at'),
+        read_at(request.user, 'citizen'),
+    )
+    unread_count = request.user.unread_notifications
     
     context = {
         'notifications': notifications,
@@ -581,19 +781,15 @@ def citizen_notifications(request):
 @csrf_exempt
 def mark_notification_read(request, notification_id):
     if request.method == "POST" and request.user.is_authenticated:
-        try:
-            notification = CitizenNotification.objects.get(id=notification_id, user=request.user)
-            notification.is_read = True
-            notification.save()
+        if coalesced(mark_citizen_notification_read, request.user, notification_id):
             return JsonResponse({'status': 'success'})
-        except CitizenNotification.DoesNotExist:
-            return JsonResponse({'status': 'error', 'message': 'Notification not found'})
+        return JsonResponse({'status': 'error', 'message': 'Notification not found'})
     return JsonResponse({'status': 'error', 'message': 'Invalid request'})
 
 @csrf_exempt
 def mark_all_notifications_read(request):
     if request.method == "POST" and request.user.is_authenticated:
-        CitizenNotification.objects.filter(user=request.user, is_read=False).update(is_read=True)
+        coalesced(mark_all_citizen_notifications_read, request.user)
         return JsonResponse({'status': 'success'})
     return JsonResponse({'status': 'error', 'message': 'Invalid request'})
 
@@ -604,10 +800,176 @@ def mark_all_notifications_read(request):
 @csrf_exempt
 def mark_notifications_read(request):
     if request.method == "POST":
-        if hasattr(request.user, "officer"):
-            Notification.objects.filter(officer=request.user.officer, is_read=False).update(is_read=True)
+        if request.principal.is_officer:
+            coalesced(mark_officer_notifications_read, request.principal.officer)
             return JsonResponse({"status": "success"})
         else:
             return JsonResponse({"status": "error", "message": "User is not an officer"}, status=403)
 
-    return JsonResponse({"status": "error", "message": "Invalid request"}, status=400)
\ No newline at end of file
+    return JsonResponse({"status": "error", "message": "Invalid request"}, status=400)
+
+
+# ===================== CHUNKED EVIDENCE UPLOADS =====================
+def _upload_error(error):
+    data = {"status": "error", "message": str(error)}
+    if error.offset is not None:
+        data['offset'] = error.offset
+    return JsonResponse(data, status=error.status)
+
+
+def upload_start(request):
+    """Opens a resumable upload. POST: field, filename, size, content_type."""
+    if not request.user.is_authenticated:
+        return JsonResponse({"status": "error", "message": "Authentication required"}, status=403)
+    if request.method != 'POST':
+        return JsonResponse({"status": "error", "message": "Invalid request"}, status=405)
+    try:
+        size = int(request.POST.get('size', ''))
+    except ValueError:
+        return JsonResponse({"status": "error", "message": "Invalid size"}, status=400)
+    try:
+        session = start_upload(
+            request.user,
+            request.POST.get('field', ''),
+            request.POST.get('filename', ''),
+            size,
+            request.POST.get('content_type', ''),
+        )
+    except UploadError as e:
+        return _upload_error(e)
+    return JsonResponse(describe(session), status=201)
+
+
+def upload_detail(request, upload_id):
+    """
+    GET reports the offset to resume from. PUT appends the raw request body
+    as one chunk at the Upload-Offset header, verified against the
+    Upload-Checksum header (hex SHA-256). DELETE abandons the upload.
+    """
+    if not request.user.is_authenticated:
+        return JsonResponse({"status": "error", "message": "Authentication required"}, status=403)
+    session = get_object_or_404(UploadSession, pk=upload_id, user=request.user)
+
+    if request.method == 'GET':
+        return JsonResponse(describe(session))
+    if request.method == 'DELETE':
+        abort_upload(session)
+        return JsonResponse(describe(session))
+    if request.method != 'PUT':
+        return JsonResponse({"status": "error", "message": "Invalid request"}, status=405)
+
+    try:
+        offset = int(request.headers.get('Upload-Offset', ''))
+        length = int(request.headers.get('Content-Length', ''))
+    except ValueError:
+        return JsonResponse({"status": "error", "message": "Upload-Offset and Content-Length are required"}, status=400)
+    try:
+        # Read straight from the request stream; request.body would buffer the chunk
+        write_chunk(session, offset, length, request, request.headers.get('Upload-Checksum', ''))
+    except UploadError as e:
+        return _upload_error(e)
+    return JsonResponse(describe(session))
+
+
+def upload_complete(request, upload_id):
+    """
+    Finishes an upload. Optional POST fields: checksum (whole-file SHA-256)
+    and report (id of a report to attach the file to right away).
+    """
+    if not request.user.is_authenticated:
+        return JsonResponse({"status": "error", "message": "Authentication required"}, status=403)
+    if request.method != 'POST':
+        return JsonResponse({"status": "error", "message": "Invalid request"}, status=405)
+    session = get_object_or_404(UploadSession, pk=upload_id, user=request.user)
+    try:
+        complete_upload(session, request.POST.get('checksum'))
+        report_id = request.POST.get('report')
+        if report_id:
+            report = get_object_or_404(CrimeReport, pk=report_id)
+            principal = request.principal
+            allowed = (
+                principal.is_admin
+                or report.reporter_id == request.user.pk
+                or (principal.is_officer and report.department_id == principal.department_id)
+            )
+            if not allowed:
+                return JsonResponse({"status": "error", "message": "Access denied"}, status=403)
+            attach_upload(session, report)
+    except UploadError as e:
+        return _upload_error(e)
+    return JsonResponse(describe(session))
+
+
+# ===================== EVIDENCE FILES =====================
+def evidence_file(request, pk, kind):
+    """
+    Serves a report's image, video or audio evidence to users allowed to
+    see the report, with Range support so players can seek. Add
+    ?download=1 to get it as an attachment, or ?size=<thumbnails.SIZES key>
+    for an image's derivative (the original until it has been rendered).
+    """
+    if not request.user.is_authenticated:
+        return JsonResponse({"status": "error", "message": "Authentication required"}, status=403)
+    if request.method not in ('GET', 'HEAD'):
+        return JsonResponse({"status": "error", "message": "Invalid request"}, status=405)
+    if kind not in EVIDENCE_FIELDS:
+        raise Http404("Unknown evidence type")
+    report = find_report(pk)
+    if report is None:
+        raise Http404("No such report")
+    if not report.can_be_accessed_by(request.user):
+        return JsonResponse({"status": "error", "message": "Access denied"}, status=403)
+
+    fieldfile = getattr(report, EVIDENCE_FIELDS[kind])
+    if not fieldfile:
+        raise Http404("No evidence of this type")
+    size = request.GET.get('size')
+    if size:
+        if kind != 'image' or size not in THUMBNAIL_SIZES:
+            raise Http404("Unknown size")
+        derivative = derivative_name(fieldfile.name, size)
+        if fieldfile.storage.exists(derivative):
+            fieldfile = type(fieldfile)(report, fieldfile.field, derivative)
+    extension = os.path.splitext(fieldfile.name)[1]
+    response = serve_evidence(
+        request, fieldfile, f"{report.report_id}-{kind}{extension}",
+        as_attachment=bool(request.GET.get('download')),
+    )
+    if response is None:
+        raise Http404("Evidence file is missing")
+    return response
+
+
+# ===================== LIVE NOTIFICATIONS (SSE) =====================
+def _stream_subscription(request):
+    """(channel, unread count) for the signed-in officer or citizen, or None"""
+    principal = load_principal(request)
+    if principal.is_officer and principal.officer is not None:
+        return officer_channel(principal.officer_id), principal.officer.unread_notifications
+    if principal.is_authenticated:
+        return citizen_channel(principal.user_id), principal.user.unread_notifications
+    return None
+
+
+async def notification_stream(request):
+    """
+    Pushes new notifications and unread counts to the signed-in officer or
+    citizen. Needs an ASGI server (see online_crime_report/asgi.py) so that
+    idle connections do not each hold a worker thread. Under WSGI Django
+    would try to read the endless stream into memory and never answer, so
+    the view answers 204, which tells EventSource not to reconnect.
+    """
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+    subscription = await sync_to_async(_stream_subscription)(request)
+    if subscription is None:
+        return JsonResponse({"status": "error", "message": "Authentication required"}, status=403)
+    channel, unread = subscription
+
+    response = StreamingHttpResponse(
+        event_stream(channel, initial_events=[{'type': 'unread', 'count': unread}]),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
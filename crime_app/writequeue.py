@@ -0,0 +1,108 @@
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+ENABLED = getattr(settings, 'WRITE_COALESCING', True)
+# How long the writer waits for more writes to join a batch, and the most it takes
+WINDOW_SECONDS = getattr(settings, 'WRITE_COALESCING_WINDOW', 0.005)
+MAX_BATCH = getattr(settings, 'WRITE_COALESCING_MAX_BATCH', 64)
+RESULT_TIMEOUT = 30
+
+
+class WriteCoalescer:
+    """
+    Runs small writes from many request threads on one writer thread, many
+    to a transaction. SQLite allows a single writer at a time, so fifty
+    requests each committing a one-row UPDATE queue fifty times for the
+    lock; coalesced they take it once. Each write runs in its own savepoint,
+    so one failing write doesn't undo the others in its batch, and callers
+    only get their result after the batch has committed.
+    """
+
+    def __init__(self, window=WINDOW_SECONDS, max_batch=MAX_BATCH, using=DEFAULT_DB_ALIAS):
+        self.window = window
+        self.max_batch = max_batch
+        self.using = using
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, func, *args, **kwargs):
+        future = Future()
+        self._ensure_started()
+        self._queue.put((future, func, args, kwargs))
+        return future
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='write-coalescer', daemon=True)
+                self._thread.start()
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self._queue.get(timeout=self.window))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                self._write(batch)
+            except Exception as exc:
+                # The commit itself failed: nothing in the batch was written
+                logger.exception("Coalesced write batch of %s failed", len(batch))
+                for future, *_ in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+            finally:
+                connections[self.using].close_if_unusable_or_obsolete()
+
+    def _write(self, batch):
+        outcomes = []
+        with transaction.atomic(using=self.using):
+            for future, func, args, kwargs in batch:
+                try:
+                    with transaction.atomic(using=self.using):
+                        outcomes.append((future, True, func(*args, **kwargs)))
+                except Exception as exc:
+                    outcomes.append((future, False, exc))
+        for future, ok, value in outcomes:
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+
+_coalescer = None
+_coalescer_lock = threading.Lock()
+
+
+def get_coalescer():
+    global _coalescer
+    with _coalescer_lock:
+        if _coalescer is None:
+            _coalescer = WriteCoalescer()
+        return _coalescer
+
+
+def coalesced(func, *args, **kwargs):
+    """
+    Runs a small write through the shared writer thread and returns its
+    result. Runs inline when coalescing is off or the caller is already in
+    a transaction: the write must belong to that transaction, and waiting
+    on another thread while holding SQLite's write lock would deadlock.
+    """
+    if not ENABLED or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+        return func(*args, **kwargs)
+    return get_coalescer().submit(func, *args, **kwargs).result(timeout=RESULT_TIMEOUT)
@@ -5,6 +5,11 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+Serve the project through this module (e.g. ``uvicorn online_crime_report.asgi:application``)
+to get the live notification stream at /notifications/stream/: under ASGI each
+idle Server-Sent Events connection is a suspended coroutine rather than a
+blocked worker thread.
 """
 
 import os
@@ -41,6 +41,8 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'crime_app.middleware.PrincipalMiddleware',
+    'crime_app.routers.ReplicaStickinessMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -57,6 +59,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'crime_app.context_processors.principal',
                 'crime_app.context_processors.officer_notifications',
             ],
         },
@@ -69,13 +72,61 @@ WSGI_APPLICATION = 'online_crime_report.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# SQLite tuned for concurrent writers, applied to every new connection.
+# WAL lets reads carry on while a write commits. `timeout` is SQLite's
+# busy_timeout: a writer waits up to 20s for the lock instead of failing.
+# IMMEDIATE transactions take the write lock when they start, because a
+# transaction that upgrades from read to write can't wait and fails with
+# "database is locked" straight away. synchronous=NORMAL is safe with WAL.
+SQLITE_OPTIONS = {
+    'timeout': 20,
+    'transaction_mode': 'IMMEDIATE',
+    'init_command': (
+        'PRAGMA journal_mode=WAL;'
+        'PRAGMA synchronous=NORMAL;'
+        'PRAGMA temp_store=MEMORY;'
+        'PRAGMA cache_size=-16000'
+    ),
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': SQLITE_OPTIONS,
+        # A file, not the default in-memory database: that one runs in
+        # shared-cache mode, where concurrent writers fail with "database
+        # table is locked" instead of waiting, so tests couldn't exercise
+        # the locking above
+        'TEST': {'NAME': BASE_DIR / 'test-db.sqlite3'},
     }
 }
 
+# Views decorated with @read_replica read from this alias when it exists.
+# Locally a second SQLite file can stand in, refreshed with
+# `manage.py sync_replica`:
+# DATABASES['replica'] = {
+#     'ENGINE': 'django.db.backends.sqlite3',
+#     'NAME': BASE_DIR / 'db-replica.sqlite3',
+#     'TEST': {'MIRROR': 'default'},
+# }
+DATABASE_ROUTERS = ['crime_app.routers.ReplicaRouter']
+REPLICA_DATABASE = 'replica'
+# Seconds a session keeps reading from the primary after it writes
+REPLICA_STICKY_SECONDS = 10
+
+# Small writes (mark-read updates) from concurrent requests share one
+# transaction on a writer thread; see crime_app/writequeue.py
+WRITE_COALESCING = True
+
+# Resolved and Dismissed reports untouched this many days are moved to the
+# archive tables by `manage.py archive_reports`; see crime_app/archive.py
+ARCHIVE_AFTER_DAYS = 180
+
+# Column files of the analytics snapshot, rebuilt by `manage.py build_snapshot`;
+# see crime_app/snapshot.py. Generated data, ignored by git.
+ANALYTICS_SNAPSHOT_DIR = BASE_DIR / 'analytics'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -116,6 +167,41 @@ MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
 
+# Sessions
+# 'cached_db' reads sessions from the cache and only touches django_session
+# on a miss or a write; 'signed_cookies' keeps them in the signed cookie and
+# never touches the database; 'db' is Django's default. Run
+# `manage.py prune_sessions` periodically for the database-backed modes.
+SESSION_MODE = 'cached_db'
+SESSION_ENGINE = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}[SESSION_MODE]
+SESSION_CACHE_ALIAS = 'sessions'
+# Seconds a session trusts its cached role and department id (see crime_app/middleware.py)
+PRINCIPAL_SESSION_TTL = 300
+
+CACHES = {
+    # Cached notification lists and heatmap tiles are invalidated by whichever
+    # process does the write (a web worker, run_outbox, import_reports), so the
+    # cache must be shared between processes: local disk here, or point this
+    # at Redis/Memcached when workers span hosts
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'default',
+        'OPTIONS': {'MAX_ENTRIES': 50000},
+    },
+    # On local disk rather than in process memory, so every worker on the
+    # host sees a logout at once
+    'sessions': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'sessions',
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    },
+}
+
+
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field